@@ -0,0 +1,229 @@
+import asyncio
+import json
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from partA import util
+
+
+class AsyncClient:
+    """asyncio counterpart of the helpers in util.py.
+
+    The methods take the same arguments, return the same values and raise the
+    same exceptions as their util.py namesakes. One pooled ``aiohttp`` session
+    is shared by all calls, and at most ``max_in_flight`` requests are
+    outstanding at once; bulk helpers run on that many worker coroutines
+    rather than one task per item. Use as ``async with AsyncClient() as client: ...``,
+    or through ``run``. Every request is reported to the util.py request
+    listeners like a ``util.session`` call, with the ``request_tags`` of the
+    thread running the event loop.
+    """
+
+    def __init__(self, base_url=None, max_in_flight=100, connections=100, timeout=60):
+        self.base_url = base_url or util.BASE_URL
+        self.max_in_flight = max_in_flight
+        self.connections = connections
+        self.timeout = timeout
+        self.session = None
+        self._in_flight = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        if aiohttp is None:
+            raise ImportError("AsyncClient needs aiohttp (see requirements.txt)")
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def map(self, function, items):
+        """Await ``function(item)`` for each of ``items`` and return the results in order.
+
+        At most ``max_in_flight`` calls are pending at a time, so ``items`` can
+        be arbitrarily long without creating a task per item.
+        """
+        items = enumerate(items)
+        results = {}
+
+        async def worker():
+            for index, item in items:
+                results[index] = await function(item)
+
+        await asyncio.gather(*(worker() for _ in range(self.max_in_flight)))
+        return [results[index] for index in range(len(results))]
+
+    async def _request(self, method, path, body=None):
+        """Send one request and return ``(status, text)``."""
+        data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode()
+        headers = util.JSON_HEADERS if data is not None else None
+        async with self._in_flight:
+            sent = time.time()
+            start = time.perf_counter()
+            async with self.session.request(
+                method, f"{self.base_url}{path}", data=data, headers=headers
+            ) as response:
+                content = await response.read()
+                latency = time.perf_counter() - start
+                if util.has_request_listeners():
+                    util.notify_listeners({
+                        "endpoint": util.endpoint_template(method, path),
+                        "status": response.status,
+                        "latency": latency,
+                        "request_bytes": len(data or b""),
+                        "response_bytes": len(content),
+                        "method": method,
+                        "path": path,
+                        "start": sent,
+                        "headers": headers or {},
+                        "body": data,
+                        "response_body": content,
+                    })
+                return response.status, content.decode(response.charset or "utf-8")
+
+    async def create_todo(self, title=None, doneStatus=False, description=None):
+        if title is None and description is None and not doneStatus:
+            body = util.payload_body("todo")
+        else:
+            body = {
+                "title": "Test TODO" if title is None else title,
+                "doneStatus": doneStatus,
+                "description": "" if description is None else description,
+            }
+        status, text = await self._request("POST", "/todos", body)
+        if status != 201:
+            raise Exception(f"Failed to create todo. Status: {status}, Response: {text}")
+        return json.loads(text)["id"]
+
+    async def delete_todo(self, todo_id):
+        status, text = await self._request("DELETE", f"/todos/{todo_id}")
+        if status != 200:
+            raise Exception(
+                f"Failed to delete todo {todo_id}. Status: {status}, Response: {text}"
+            )
+
+    async def post_on_todos_id(self, todo_id, project_ids):
+        failures = await self.link_bulk(
+            [(todo_id, project_id) for project_id in project_ids[:len(project_ids)//2]],
+            "todo_project",
+        )
+        if failures:
+            raise Exception(
+                f"Failed to connect todo {todo_id} with project {failures[0].target}. {failures[0].error}"
+            )
+
+    async def create_project(self, title=None, completed=False, active=True, description=None):
+        if title is None and description is None and not completed and active:
+            body = util.payload_body("project")
+        else:
+            body = {
+                "title": "Test Project" if title is None else title,
+                "completed": completed,
+                "active": active,
+                "description": "" if description is None else description,
+            }
+        status, text = await self._request("POST", "/projects", body)
+        if status != 201:
+            raise Exception(f"Failed to create project. Status: {status}, Response: {text}")
+        return json.loads(text)["id"]
+
+    async def delete_project(self, project_id):
+        status, text = await self._request("DELETE", f"/projects/{project_id}")
+        if status != 200:
+            raise Exception(
+                f"Failed to delete project {project_id}. Status: {status}, Response: {text}"
+            )
+
+    async def post_on_projects_id(self, project_id, todo_ids):
+        failures = await self.link_bulk(
+            [(project_id, todo_id) for todo_id in todo_ids[:len(todo_ids)//2]],
+            "project_todo",
+        )
+        if failures:
+            raise Exception(
+                f"Failed to connect project {project_id} with todo {failures[0].target}. {failures[0].error}"
+            )
+
+    async def create_category(self, title="Test Category", description=""):
+        status, text = await self._request(
+            "POST", "/categories", {"title": title, "description": description}
+        )
+        if status != 201:
+            raise Exception(f"Failed to create category. Status: {status}, Response: {text}")
+        return json.loads(text)["id"]
+
+    async def delete_category(self, category_id):
+        status, text = await self._request("DELETE", f"/categories/{category_id}")
+        if status != 200:
+            raise Exception(
+                f"Failed to delete category {category_id}. Status: {status}, Response: {text}"
+            )
+
+    async def link_bulk(self, pairs, relationship="todo_project"):
+        """Async util.link_bulk: failing pairs are returned as util.LinkFailure tuples."""
+        path = util.RELATIONSHIPS[relationship]
+
+        async def link(pair):
+            source, target = pair
+            try:
+                status, text = await self._request(
+                    "POST", f"/{path.format(source)}", {"id": target}
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return util.LinkFailure(source, target, str(e) or type(e).__name__)
+            if status != 201:
+                return util.LinkFailure(source, target, f"Status: {status}, Response: {text}")
+            return None
+
+        return [failure for failure in await self.map(link, pairs) if failure]
+
+    async def create_many(self, kind, count):
+        """Create ``count`` todos or projects with the payload profile's bodies and return their ids."""
+        create = self.create_todo if kind == "todo" else self.create_project
+        return await self.map(lambda _: create(), range(count))
+
+    async def seed_graph(self, todo_count, project_count, links_per_todo=0):
+        """Create todos and projects concurrently and link each todo to some projects.
+
+        Returns ``(todo_ids, project_ids)``. Raises if any relationship fails.
+        """
+        todo_ids = await self.create_many("todo", todo_count)
+        project_ids = await self.create_many("project", project_count)
+        pairs = [
+            (todo_id, project_ids[(i + k) % project_count])
+            for i, todo_id in enumerate(todo_ids)
+            for k in range(min(links_per_todo, project_count))
+        ]
+        failures = await self.link_bulk(pairs, "todo_project")
+        if failures:
+            raise Exception(
+                f"Failed to seed {len(failures)} relationships, e.g. todo {failures[0].source} with project {failures[0].target}. {failures[0].error}"
+            )
+        return todo_ids, project_ids
+
+
+def run(operation, **client_kwargs):
+    """Run ``operation(client)`` with a new AsyncClient on a new event loop and return its result.
+
+    For synchronous callers; ``client_kwargs`` go to AsyncClient.
+    """
+    async def main():
+        async with AsyncClient(**client_kwargs) as client:
+            return await operation(client)
+
+    return asyncio.run(main())
@@ -0,0 +1,254 @@
+import os
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import requests
+
+JAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runTodoManagerRestAPI-1.5.5.jar")
+
+
+def port_in_use(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex(("localhost", port)) == 0
+
+
+def default_warmup(base_url, iterations=200):
+    """Exercise the create/link/read/delete endpoints ``iterations`` times.
+
+    Leaves the server with the objects it had before, so measurements that
+    follow start from the same state as on a cold server, but with the JIT warm.
+    """
+    with requests.Session() as session:
+        for _ in range(iterations):
+            todo = session.post(f"{base_url}/todos", json={"title": "warm-up"}).json()["id"]
+            project = session.post(f"{base_url}/projects", json={"title": "warm-up"}).json()["id"]
+            session.post(f"{base_url}/todos/{todo}/tasksof", json={"id": project})
+            session.get(f"{base_url}/projects/{project}/tasks")
+            session.delete(f"{base_url}/todos/{todo}")
+            session.delete(f"{base_url}/projects/{project}")
+
+
+class TodoServer:
+    """A runTodoManagerRestAPI process listening on ``port``."""
+
+    def __init__(self, jar_path=JAR_PATH, port=4567, jvm_args=()):
+        self.jar_path = jar_path
+        self.port = port
+        self.jvm_args = list(jvm_args)
+        self.process = None
+        self.startup_time = None
+        self.warmup_time = None
+        self.shutdown_time = None
+
+    @property
+    def base_url(self):
+        return f"http://localhost:{self.port}"
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def port_in_use(self):
+        return port_in_use(self.port)
+
+    def start(self, timeout=60):
+        if self.port_in_use():
+            raise Exception(f"Port {self.port} is already in use, is a previous server still running?")
+        start = time.perf_counter()
+        self.process = subprocess.Popen(
+            ["java", *self.jvm_args, "-jar", self.jar_path, f"-port={self.port}"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.wait_until_ready(timeout)
+        self.startup_time = time.perf_counter() - start
+        self.warmup_time = None
+        self.shutdown_time = None
+        return self
+
+    def warm_up(self, workload=default_warmup, **kwargs):
+        """Run ``workload(base_url, **kwargs)`` and record how long it took."""
+        start = time.perf_counter()
+        workload(self.base_url, **kwargs)
+        self.warmup_time = time.perf_counter() - start
+        return self
+
+    def timings(self):
+        return {
+            "port": self.port,
+            "startup_time": self.startup_time,
+            "warmup_time": self.warmup_time,
+            "shutdown_time": self.shutdown_time,
+        }
+
+    def wait_until_ready(self, timeout=60):
+        """Poll GET /todos until it answers 200, backing off between attempts."""
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            if self.process.poll() is not None:
+                raise Exception(f"Server exited with code {self.process.returncode} during startup")
+            try:
+                if requests.get(f"{self.base_url}/todos", timeout=delay * 4).status_code == 200:
+                    return
+            except requests.exceptions.RequestException:
+                pass
+            if time.monotonic() + delay > deadline:
+                raise Exception("Server failed to start within timeout period")
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    def stop(self, timeout=10):
+        """Stop the server and its child processes and return how long it took.
+
+        The API is asked to exit through GET /shutdown first. Processes still
+        alive after ``timeout / 2`` are terminated, then killed. Raises if the
+        port is still accepting connections afterwards.
+        """
+        if self.process is None or self.process.poll() is not None:
+            return self.shutdown_time or 0.0
+        start = time.perf_counter()
+        try:
+            root = psutil.Process(self.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            processes = []
+
+        try:
+            requests.get(f"{self.base_url}/shutdown", timeout=1)
+        except requests.exceptions.RequestException:
+            pass
+        _, alive = psutil.wait_procs(processes, timeout=timeout / 2)
+        for signal in ("terminate", "kill"):
+            for process in alive:
+                try:
+                    getattr(process, signal)()
+                except psutil.NoSuchProcess:
+                    pass
+            _, alive = psutil.wait_procs(alive, timeout=timeout / 4)
+        self.process.wait()
+
+        self.wait_until_port_free(timeout)
+        self.shutdown_time = time.perf_counter() - start
+        return self.shutdown_time
+
+    def wait_until_port_free(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        while self.port_in_use():
+            if time.monotonic() > deadline:
+                raise Exception(f"Port {self.port} still in use {timeout}s after stopping the server")
+            time.sleep(0.05)
+
+    def restart(self, timeout=60):
+        self.stop()
+        return self.start(timeout)
+
+
+class ServerPool:
+    """Keeps up to ``size`` started and warmed-up servers ready for use.
+
+    Servers are not reused after ``release()``, since their data is no
+    longer the default. ``release()`` starts a replacement in the
+    background instead, so the next run doesn't wait for JVM startup and
+    warm-up, and no replacement competes with a server while it is being
+    measured. ``fill()`` does the same on demand. ``runs`` is
+    how many servers will be acquired in total, None for no limit; no more
+    servers are started than that. Ports are taken from ``base_port``
+    upwards. With ``size=0`` every ``acquire()`` starts a server
+    synchronously. ``server_factory(port)`` builds the servers, a
+    TodoServer running ``jar_path`` by default.
+    """
+
+    def __init__(self, size=1, jar_path=JAR_PATH, base_port=4567, jvm_args=(),
+                 warmup=default_warmup, warmup_kwargs=None, timeout=60, server_factory=None, runs=None):
+        self.jar_path = jar_path
+        self.jvm_args = list(jvm_args)
+        self.server_factory = server_factory or (lambda port: TodoServer(self.jar_path, port, self.jvm_args))
+        self.warmup = warmup
+        self.warmup_kwargs = warmup_kwargs or {}
+        self.timeout = timeout
+        self.base_port = base_port
+        self.size = size
+        self._remaining = runs
+        self._in_use = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(size, 1))
+        self._ready = []
+        self._closed = False
+        self.fill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _next_port(self):
+        with self._lock:
+            port = self.base_port
+            while port in self._in_use or port_in_use(port):
+                port += 1
+            self._in_use.add(port)
+            return port
+
+    def _launch(self):
+        server = self.server_factory(self._next_port())
+        try:
+            server.start(self.timeout)
+            if self.warmup is not None:
+                server.warm_up(self.warmup, **self.warmup_kwargs)
+        except Exception:
+            self._stop(server)
+            raise
+        return server
+
+    def _stop(self, server):
+        try:
+            return server.stop()
+        finally:
+            with self._lock:
+                self._in_use.discard(server.port)
+
+    def fill(self):
+        """Start servers in the background until ``size`` are ready or warming up."""
+        with self._lock:
+            if self._closed:
+                return
+            wanted = self.size if self._remaining is None else min(self.size, self._remaining)
+            while len(self._ready) < wanted:
+                self._ready.append(self._executor.submit(self._launch))
+
+    def acquire(self):
+        """Return a ready server, waiting for one if none has finished warming up."""
+        with self._lock:
+            if self._remaining is not None:
+                self._remaining -= 1
+            future = self._ready.pop(0) if self._ready else None
+        if future is None:
+            return self._launch()
+        return future.result()
+
+    def release(self, server):
+        """Stop ``server``, start its replacement and return the shutdown time."""
+        try:
+            return self._stop(server)
+        finally:
+            self.fill()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            ready, self._ready = self._ready, []
+        for future in ready:
+            future.cancel()
+        for future in ready:
+            if not future.cancelled():
+                try:
+                    self._stop(future.result())
+                except Exception:
+                    pass
+        self._executor.shutdown()
@@ -0,0 +1,119 @@
+"""Iterate over the entities of a list response as its body arrives.
+
+A list such as ``GET /todos`` is read in CHUNK_SIZE pieces and each entity
+is handed out as soon as it is complete, so only one entity and one chunk
+are held at a time instead of the whole body and its parsed tree. The
+response must have been requested with ``stream=True``; it is closed when
+the iterator is exhausted or discarded.
+
+JSON is parsed with ``ijson`` when it is installed and with an incremental
+``json.JSONDecoder.raw_decode`` loop otherwise. XML uses
+``xml.etree.ElementTree.XMLPullParser``.
+"""
+import codecs
+import json
+import re
+import xml.etree.ElementTree as ET
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CHUNK_SIZE = 64 * 1024
+
+_LIST_START = re.compile(r'\s*\{\s*"(?P<key>[^"]*)"\s*:\s*\[')
+_SEPARATORS = " \t\r\n,"
+
+
+def iter_json_items(response, key):
+    """Yield the dicts of the ``key`` list of a ``{"<key>": [...]}`` JSON body.
+
+    A body without that list, e.g. ``{}``, yields nothing.
+    """
+    try:
+        if ijson is not None:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, f"{key}.item", use_float=True)
+        else:
+            yield from _iter_json_list(response.iter_content(CHUNK_SIZE), key)
+    finally:
+        response.close()
+
+
+def _iter_json_list(chunks, key):
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+
+    # Read up to the opening bracket of the list
+    while "[" not in buffer:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += text.decode(chunk)
+    match = _LIST_START.match(buffer)
+    if match is None or match["key"] != key:
+        # Not a list body, so it is small enough to parse whole
+        buffer += "".join(text.decode(chunk) for chunk in chunks) + text.decode(b"", final=True)
+        yield from (json.loads(buffer) if buffer.strip() else {}).get(key, [])
+        return
+
+    pos = match.end()
+    count = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # The next entity is incomplete; drop what was consumed and read on until
+            # the pending text doubles, so a large entity is not re-parsed per chunk
+            pending = [buffer[pos:]]
+            wanted = max(2 * len(pending[0]), 1)
+            received = 0
+            for chunk in chunks:
+                pending.append(text.decode(chunk))
+                received += len(pending[-1])
+                if received >= wanted:
+                    break
+            if not received:
+                raise Exception(f"Truncated JSON list '{key}' after {count} entities")
+            buffer = "".join(pending)
+            pos = 0
+            continue
+        count += 1
+        yield item
+
+
+def iter_xml_elements(response, tag, root_tag=None):
+    """Yield the ``tag`` children of the root of an XML body, e.g. ``todo`` of ``<todos>``.
+
+    Each element is detached from the root before it is yielded, so it stays
+    complete but the tree does not grow. With ``root_tag``, a body whose root
+    is another element raises ValueError instead of yielding nothing.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+    try:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = element
+                        if root_tag is not None and root.tag != root_tag:
+                            raise ValueError(f"Expected a <{root_tag}> list, got <{root.tag}>")
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 1 and element.tag == tag:
+                    root.remove(element)
+                    yield element
+        parser.close()
+    finally:
+        response.close()
@@ -0,0 +1,640 @@
+"""In-process stand-in for the runTodoManagerRestAPI server.
+
+Serves /todos, /projects and /categories with their relationship
+sub-resources (tasksof, tasks, categories, todos, projects) from indexed
+in-memory storage, in JSON or XML, answering with the same status codes and
+error messages as the jar, including its documented bugs. Handler time is
+recorded per endpoint and returned in an ``X-Service-Time`` header, so
+client-side overhead can be measured against a server that costs next to
+nothing. No Java is needed.
+
+From another process, e.g. for the partA suite:
+
+    python partA/stub_server.py [--port 4567] [--no-defaults]
+
+GET /shutdown stops it, like the jar. GET /_stub/latency returns the
+per-endpoint latency summary and DELETE /_stub/latency clears it.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from partA.server import default_warmup, port_in_use
+
+# Fields of each collection and their defaults; None marks a mandatory field
+FIELDS = {
+    "todos": {"title": None, "doneStatus": False, "description": ""},
+    "projects": {"title": "", "completed": False, "active": False, "description": ""},
+    "categories": {"title": None, "description": ""},
+}
+SINGULAR = {"todos": "todo", "projects": "project", "categories": "category"}
+
+# (collection, relationship) -> (target collection, reverse relationship or None)
+RELATIONSHIPS = {
+    ("todos", "tasksof"): ("projects", "tasks"),
+    ("todos", "categories"): ("categories", None),
+    ("projects", "tasks"): ("todos", "tasksof"),
+    ("projects", "categories"): ("categories", None),
+    ("categories", "todos"): ("todos", None),
+    ("categories", "projects"): ("projects", None),
+}
+
+LATENCY_SAMPLES = 10000
+
+
+class ApiError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _render_value(value):
+    return str(value).lower() if isinstance(value, bool) else value
+
+
+class TodoStore:
+    """The entities and relationships of one server, indexed for the API's lookups.
+
+    Every field value is indexed, so ``?title=...`` filters are dict lookups,
+    and every relationship keeps the links pointing at each entity, so a
+    delete only touches the entity's own links. Ids are per collection and
+    start at 1, like the jar's. All methods take the store lock.
+    """
+
+    def __init__(self, defaults=True):
+        self.lock = threading.RLock()
+        self.entities = {kind: {} for kind in FIELDS}
+        self.index = {kind: {field: {} for field in fields} for kind, fields in FIELDS.items()}
+        self.links = {key: {} for key in RELATIONSHIPS}
+        # entity -> {(source collection, relationship, source id)} linking to it
+        self.linked_from = {kind: {} for kind in FIELDS}
+        self.next_id = {kind: 1 for kind in FIELDS}
+        if defaults:
+            self.create_defaults()
+
+    def create_defaults(self):
+        """Create the jar's startup data: two todos, one project and two categories."""
+        scan = self.create("todos", {"title": "scan paperwork"})["id"]
+        file = self.create("todos", {"title": "file paperwork"})["id"]
+        project = self.create("projects", {"title": "Office Work"})["id"]
+        office = self.create("categories", {"title": "Office"})["id"]
+        self.create("categories", {"title": "Home"})
+        self.link("todos", scan, "tasksof", project)
+        self.link("todos", file, "tasksof", project)
+        self.link("todos", scan, "categories", office)
+
+    def render(self, kind, entity_id):
+        entity = {"id": entity_id}
+        for field, value in self.entities[kind][entity_id].items():
+            entity[field] = _render_value(value)
+        for (source, relationship), links in self.links.items():
+            if source == kind and links.get(entity_id):
+                entity[relationship] = [{"id": target} for target in links[entity_id]]
+        return entity
+
+    def get(self, kind, entity_id):
+        with self.lock:
+            if entity_id not in self.entities[kind]:
+                raise ApiError(404, f"Could not find an instance with {kind}/{entity_id}")
+            return self.render(kind, entity_id)
+
+    def find(self, kind, filters):
+        """Return the entities of ``kind`` whose rendered fields equal all ``filters``."""
+        with self.lock:
+            ids = None
+            for field, value in filters.items():
+                if field == "id":
+                    matches = {value} if value in self.entities[kind] else set()
+                elif field in self.index[kind]:
+                    matches = set(self.index[kind][field].get(value, ()))
+                else:
+                    matches = set()
+                ids = matches if ids is None else ids & matches
+            ids = self.entities[kind] if ids is None else sorted(ids, key=int)
+            return [self.render(kind, entity_id) for entity_id in ids]
+
+    def _validate(self, kind, body):
+        values = {}
+        for field, value in body.items():
+            if field in FIELDS[kind]:
+                default = FIELDS[kind][field]
+                if isinstance(default, bool):
+                    if isinstance(value, str) and value.lower() in ("true", "false"):
+                        value = value.lower() == "true"
+                    if not isinstance(value, bool):
+                        raise ApiError(400, f"Failed Validation: {field} should be BOOLEAN")
+                elif value is None:
+                    value = ""
+                else:
+                    value = str(value)
+                values[field] = value
+            elif field != "id" and (kind, field) not in RELATIONSHIPS:
+                raise ApiError(400, f"Could not find field: {field}")
+        return values
+
+    def _relationships(self, kind, body):
+        for field, value in body.items():
+            if (kind, field) in RELATIONSHIPS:
+                for reference in value if isinstance(value, list) else [value]:
+                    if not isinstance(reference, dict) or "id" not in reference:
+                        raise ApiError(400, f"Failed Validation: {field} should be a list of ids")
+                    yield field, str(reference["id"])
+
+    def _set_fields(self, kind, entity_id, values):
+        entity = self.entities[kind][entity_id]
+        for field, value in values.items():
+            index = self.index[kind][field]
+            if field in entity:
+                index[_render_value(entity[field])].pop(entity_id, None)
+            entity[field] = value
+            index.setdefault(_render_value(value), {})[entity_id] = None
+
+    def create(self, kind, body):
+        with self.lock:
+            if "id" in body:
+                raise ApiError(400, "Invalid Creation: Failed Validation: Not allowed to create with id")
+            values = self._validate(kind, body)
+            for field, default in FIELDS[kind].items():
+                if default is None and field not in values:
+                    raise ApiError(400, f"{field} : field is mandatory")
+                if default is None and not values[field]:
+                    raise ApiError(400, f"Failed Validation: {field} : can not be empty")
+            references = list(self._relationships(kind, body))
+            for relationship, target in references:
+                if target not in self.entities[RELATIONSHIPS[kind, relationship][0]]:
+                    raise ApiError(404, "Could not find thing matching value for id")
+
+            entity_id = str(self.next_id[kind])
+            self.next_id[kind] += 1
+            self.entities[kind][entity_id] = {}
+            self.linked_from[kind][entity_id] = set()
+            self._set_fields(kind, entity_id, {
+                field: values.get(field, default) for field, default in FIELDS[kind].items()
+            })
+            for relationship, target in references:
+                self.link(kind, entity_id, relationship, target)
+            return self.render(kind, entity_id)
+
+    def update(self, kind, entity_id, body, replace=False):
+        """Amend the entity (POST) or, with ``replace``, reset unspecified fields to defaults (PUT)."""
+        with self.lock:
+            if entity_id not in self.entities[kind]:
+                raise ApiError(404, f"Invalid GUID for {entity_id} entity {SINGULAR[kind]}")
+            if "id" in body and str(body["id"]) != entity_id:
+                raise ApiError(400, "Failed Validation: id should be ID")
+            values = self._validate(kind, body)
+            if replace:
+                for field, default in FIELDS[kind].items():
+                    if default is None and field not in values:
+                        raise ApiError(400, f"{field} : field is mandatory")
+                    values.setdefault(field, default)
+            references = list(self._relationships(kind, body))
+            for relationship, target in references:
+                if target not in self.entities[RELATIONSHIPS[kind, relationship][0]]:
+                    raise ApiError(404, "Could not find thing matching value for id")
+            self._set_fields(kind, entity_id, values)
+            for relationship, target in references:
+                self.link(kind, entity_id, relationship, target)
+            return self.render(kind, entity_id)
+
+    def delete(self, kind, entity_id):
+        with self.lock:
+            if entity_id not in self.entities[kind]:
+                raise ApiError(404, f"Could not find any instances with {kind}/{entity_id}")
+            for (source, relationship), links in self.links.items():
+                if source == kind:
+                    for target in list(links.pop(entity_id, ())):
+                        self._unlink(kind, entity_id, relationship, target)
+            for source, relationship, source_id in list(self.linked_from[kind][entity_id]):
+                self._unlink(source, source_id, relationship, entity_id)
+            for field, value in self.entities[kind].pop(entity_id).items():
+                self.index[kind][field][_render_value(value)].pop(entity_id, None)
+            del self.linked_from[kind][entity_id]
+
+    def related(self, kind, entity_id, relationship):
+        # The jar answers 404 for a missing source, but an empty list when the id is not even a number
+        target_kind = RELATIONSHIPS[kind, relationship][0]
+        with self.lock:
+            if entity_id not in self.entities[kind] and entity_id.isdigit():
+                raise ApiError(404, f"Could not find an instance with {kind}/{entity_id}")
+            targets = self.links[kind, relationship].get(entity_id, ())
+            return target_kind, [self.render(target_kind, target) for target in targets]
+
+    def link(self, kind, entity_id, relationship, target):
+        """Link ``target`` to the entity, and the entity back to it if the relationship is two-way."""
+        target_kind, reverse = RELATIONSHIPS[kind, relationship]
+        with self.lock:
+            if entity_id not in self.entities[kind]:
+                raise ApiError(404, f"Could not find parent thing for relationship {kind}/{entity_id}/{relationship}")
+            if target not in self.entities[target_kind]:
+                raise ApiError(404, "Could not find thing matching value for id")
+            self.links[kind, relationship].setdefault(entity_id, {})[target] = None
+            self.linked_from[target_kind][target].add((kind, relationship, entity_id))
+            if reverse is not None:
+                self.links[target_kind, reverse].setdefault(target, {})[entity_id] = None
+                self.linked_from[kind][entity_id].add((target_kind, reverse, target))
+
+    def unlink(self, kind, entity_id, relationship, target):
+        with self.lock:
+            if target not in self.links[kind, relationship].get(entity_id, ()):
+                raise ApiError(404, f"Could not find any instances with {kind}/{entity_id}/{relationship}/{target}")
+            self._unlink(kind, entity_id, relationship, target)
+            target_kind, reverse = RELATIONSHIPS[kind, relationship]
+            if reverse is not None:
+                self._unlink(target_kind, target, reverse, entity_id)
+
+    def _unlink(self, kind, entity_id, relationship, target):
+        target_kind = RELATIONSHIPS[kind, relationship][0]
+        self.links[kind, relationship].get(entity_id, {}).pop(target, None)
+        self.linked_from[target_kind].get(target, set()).discard((kind, relationship, entity_id))
+
+    def counts(self):
+        with self.lock:
+            return {kind: len(entities) for kind, entities in self.entities.items()}
+
+
+class LatencyStats:
+    """Handler time per endpoint: count, total and max, plus the last ``samples`` for percentiles."""
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    "count": 0, "total": 0.0, "max": 0.0, "recent": deque(maxlen=self.samples),
+                }
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["recent"].append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def summary(self):
+        """Return ``{endpoint: {"count", "mean", "p50", "p99", "max"}}`` in seconds."""
+        with self._lock:
+            endpoints = {name: dict(stats, recent=sorted(stats["recent"])) for name, stats in self._endpoints.items()}
+        summary = {}
+        for name, stats in sorted(endpoints.items()):
+            recent = stats["recent"]
+            summary[name] = {
+                "count": stats["count"],
+                "mean": stats["total"] / stats["count"],
+                "p50": recent[(len(recent) - 1) // 2],
+                "p99": recent[(len(recent) - 1) * 99 // 100],
+                "max": stats["max"],
+            }
+        return summary
+
+
+def _parse_body(raw, content_type):
+    if not raw.strip():
+        return {}
+    text = raw.decode("utf-8", errors="replace")
+    if "xml" in content_type:
+        try:
+            root = ET.fromstring(text)
+        except ET.ParseError as error:
+            raise ApiError(400, f"Malformed XML: {error}")
+        return {child.tag: child.text or "" for child in root}
+    try:
+        body = json.loads(text)
+    except json.JSONDecodeError as error:
+        if error.pos >= len(text.rstrip()):
+            raise ApiError(400, f"java.io.EOFException: End of input at line {error.lineno} column {error.colno}")
+        raise ApiError(400, f"Malformed JSON: {error}")
+    if not isinstance(body, dict):
+        raise ApiError(400, "Malformed JSON: expected an object")
+    return body
+
+
+def _xml_element(tag, entity):
+    element = ET.Element(tag)
+    for field, value in entity.items():
+        child = ET.SubElement(element, field)
+        if isinstance(value, list):
+            for reference in value:
+                ET.SubElement(child, "id").text = reference["id"]
+        else:
+            child.text = value
+    return element
+
+
+def _to_xml(body, root=None):
+    """Render a response body the way the jar does: ``{"todos": [...]}`` as <todos><todo>..."""
+    if root is not None:
+        element = _xml_element(root, body)
+    elif "errorMessages" in body:
+        element = ET.Element("errorMessages")
+        for message in body["errorMessages"]:
+            ET.SubElement(element, "errorMessage").text = message
+    else:
+        (kind, entities), = body.items()
+        element = ET.Element(kind)
+        for entity in entities:
+            element.append(_xml_element(SINGULAR[kind], entity))
+    return ET.tostring(element)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes requests to ``self.server.store`` and times them into ``self.server.latency``."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_api("GET")
+
+    def do_HEAD(self):
+        self.handle_api("HEAD")
+
+    def do_POST(self):
+        self.handle_api("POST")
+
+    def do_PUT(self):
+        self.handle_api("PUT")
+
+    def do_DELETE(self):
+        self.handle_api("DELETE")
+
+    def do_PATCH(self):
+        self.handle_api("PATCH")
+
+    def do_OPTIONS(self):
+        self.handle_api("OPTIONS")
+
+    def handle_api(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        endpoint = self._endpoint(method, parts)
+        try:
+            status, body, root = self.dispatch(method, parts, dict(parse_qsl(url.query)), raw)
+        except ApiError as error:
+            status, body, root = error.status, {"errorMessages": [error.message]} if error.message else None, None
+
+        content_type = "application/json"
+        if body is None:
+            payload = b""
+        elif "xml" in self.headers.get("Accept", "") and parts[:1] != ["_stub"]:
+            content_type = "application/xml"
+            payload = _to_xml(body, root)
+        else:
+            payload = json.dumps(body).encode()
+        service_time = time.perf_counter() - start
+        self.server.latency.record(endpoint, service_time)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Service-Time", f"{service_time:.9f}")
+        if parts == ["shutdown"]:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(payload)
+
+    @staticmethod
+    def _endpoint(method, parts):
+        """Return e.g. ``POST /todos/{id}/tasksof``, the endpoint latency is recorded under."""
+        template = [part if i % 2 == 0 else "{id}" for i, part in enumerate(parts)]
+        if parts and parts[0] not in FIELDS:
+            template = parts[:2]
+        return f"{method} /{'/'.join(template)}"
+
+    def dispatch(self, method, parts, query, raw):
+        """Return ``(status, body, xml_root)`` for the request; ``xml_root`` names a single-entity body."""
+        store = self.server.store
+        if not parts:
+            return 200, {}, None
+        if parts == ["shutdown"] and method == "GET":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return 200, None, None
+        if parts == ["_stub", "latency"]:
+            if method == "DELETE":
+                self.server.latency.reset()
+                return 200, None, None
+            return 200, self.server.latency.summary(), None
+
+        kind = parts[0]
+        if kind not in FIELDS or len(parts) > 4:
+            raise ApiError(404)
+        if method == "OPTIONS":
+            return 200, None, None
+        body_type = self.headers.get("Content-Type", "")
+
+        if len(parts) == 1:
+            if method in ("GET", "HEAD"):
+                return 200, {kind: store.find(kind, query)}, None
+            if method == "POST":
+                return 201, store.create(kind, _parse_body(raw, body_type)), SINGULAR[kind]
+            raise ApiError(405)
+
+        entity_id = parts[1]
+        if len(parts) == 2:
+            if method in ("GET", "HEAD"):
+                return 200, {kind: [store.get(kind, entity_id)]}, None
+            if method in ("POST", "PUT"):
+                entity = store.update(kind, entity_id, _parse_body(raw, body_type), replace=method == "PUT")
+                return 200, entity, SINGULAR[kind]
+            if method == "DELETE":
+                store.delete(kind, entity_id)
+                return 200, None, None
+            raise ApiError(405)
+
+        relationship = parts[2]
+        if (kind, relationship) not in RELATIONSHIPS:
+            raise ApiError(404)
+        if len(parts) == 3:
+            if method in ("GET", "HEAD"):
+                target_kind, entities = store.related(kind, entity_id, relationship)
+                return 200, {target_kind: entities}, None
+            if method == "POST":
+                body = _parse_body(raw, body_type)
+                if "id" in body:
+                    target = str(body["id"])
+                else:
+                    # Like the jar, a body without an id creates the entity to link
+                    target = store.create(RELATIONSHIPS[kind, relationship][0], body)["id"]
+                store.link(kind, entity_id, relationship, target)
+                return 201, None, None
+            raise ApiError(405)
+
+        if method == "DELETE":
+            store.unlink(kind, entity_id, relationship, parts[3])
+            return 200, None, None
+        raise ApiError(405)
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that keeps track of its open connections.
+
+    Keep-alive connections outlive ``shutdown()``, which only stops
+    accepting new ones, so ``close_connections()`` is needed to stop their
+    handler threads from serving the old store.
+    """
+
+    daemon_threads = True
+    # Room for a connection per concurrent client, e.g. AsyncClient's 100, in the listen backlog
+    request_queue_size = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self):
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class StubServer:
+    """A StubHandler server on a thread of this process, listening on ``port``.
+
+    Has the start/stop/warm-up/timings interface of TodoServer, so it can be
+    used wherever a jar server is, e.g. ServerPool(server_factory=StubServer).
+    ``pid`` is this process: resource samples include the client as well.
+    Each start begins from fresh data.
+    """
+
+    def __init__(self, port=4567, defaults=True):
+        self.port = port
+        self.defaults = defaults
+        self.store = None
+        self.latency = LatencyStats()
+        self.startup_time = None
+        self.warmup_time = None
+        self.shutdown_time = None
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://localhost:{self.port}"
+
+    @property
+    def pid(self):
+        return os.getpid()
+
+    def port_in_use(self):
+        return port_in_use(self.port)
+
+    def start(self, timeout=60):
+        if self.port_in_use():
+            raise Exception(f"Port {self.port} is already in use, is a previous server still running?")
+        start = time.perf_counter()
+        self.store = TodoStore(self.defaults)
+        self.latency.reset()
+        self._httpd = StubHTTPServer(("localhost", self.port), StubHandler)
+        self._httpd.store = self.store
+        self._httpd.latency = self.latency
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+            name=f"stub-server-{self.port}", daemon=True,
+        )
+        self._thread.start()
+        self.startup_time = time.perf_counter() - start
+        self.warmup_time = None
+        self.shutdown_time = None
+        return self
+
+    def warm_up(self, workload=default_warmup, **kwargs):
+        """Run ``workload(base_url, **kwargs)`` and record how long it took; clears the latency stats."""
+        start = time.perf_counter()
+        workload(self.base_url, **kwargs)
+        self.warmup_time = time.perf_counter() - start
+        self.latency.reset()
+        return self
+
+    def timings(self):
+        return {
+            "port": self.port,
+            "startup_time": self.startup_time,
+            "warmup_time": self.warmup_time,
+            "shutdown_time": self.shutdown_time,
+            "latency": self.latency.summary(),
+        }
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self):
+        """Block until the server is stopped, e.g. by GET /shutdown."""
+        while self.running():
+            self._thread.join(0.5)
+
+    def stop(self, timeout=10):
+        """Stop serving, close the socket and open connections and return how long it took."""
+        if self._httpd is None:
+            return self.shutdown_time or 0.0
+        start = time.perf_counter()
+        if self.running():
+            self._httpd.shutdown()
+        self._thread.join(timeout)
+        self._httpd.close_connections()
+        self._httpd.server_close()
+        self._httpd = None
+        self.shutdown_time = time.perf_counter() - start
+        return self.shutdown_time
+
+    def restart(self, timeout=60):
+        self.stop()
+        return self.start(timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Todo Manager API server")
+    parser.add_argument("--port", type=int, default=4567)
+    parser.add_argument("--no-defaults", dest="defaults", action="store_false", help="start with no data")
+    args = parser.parse_args()
+    server = StubServer(args.port, args.defaults).start()
+    print(f"Stub Todo Manager API listening on {server.base_url}, GET /shutdown to stop")
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
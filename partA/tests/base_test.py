@@ -1,20 +1,120 @@
+import atexit
+import os
+import sys
+import threading
+import time
 import unittest
 import requests
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partA.streaming import iter_json_items, iter_xml_elements
+
+# How long a liveness result is trusted, and how often the background probe refreshes it.
+LIVENESS_TTL = 2.0
+PROBE_INTERVAL = 1.0
+PROBE_TIMEOUT = 5.0
+
+_liveness = {"status": None, "checked_at": float("-inf")}
+_liveness_lock = threading.Lock()
+_probe_pid = None
+_probe_session = requests.Session()
+
+TEARDOWN_WORKERS = 8
+
+# List key and XML element of one entity for the last path segment of a list endpoint
+LIST_KEYS = {
+    "todos": ("todos", "todo"),
+    "tasks": ("todos", "todo"),
+    "projects": ("projects", "project"),
+    "tasksof": ("projects", "project"),
+    "categories": ("categories", "category"),
+}
+
+# Suite-wide record of resources tearDown failed to delete, and where time went.
+_teardown_stats = {"deletes": 0, "leaks": [], "teardown_time": 0.0, "body_time": 0.0}
+_teardown_executor = {"pid": None, "executor": None}
+
+
+def _check_service():
+    """GET the service root and cache the status code (None if it is unreachable)."""
+    try:
+        status = _probe_session.get(BaseAPITest.BASE_URL, timeout=PROBE_TIMEOUT).status_code
+    except requests.exceptions.RequestException:
+        status = None
+    with _liveness_lock:
+        _liveness["status"] = status
+        _liveness["checked_at"] = time.monotonic()
+    return status
+
+
+def _probe_forever():
+    while True:
+        _check_service()
+        time.sleep(PROBE_INTERVAL)
+
+
+def start_liveness_probe():
+    """Start the background probe for this process if it is not running yet."""
+    global _probe_pid
+    with _liveness_lock:
+        if _probe_pid == os.getpid():
+            return
+        _probe_pid = os.getpid()
+    threading.Thread(target=_probe_forever, name="liveness-probe", daemon=True).start()
+
+
+def service_status():
+    """Return the cached status of the API root, checking again if it is older than LIVENESS_TTL."""
+    with _liveness_lock:
+        if time.monotonic() - _liveness["checked_at"] < LIVENESS_TTL:
+            return _liveness["status"]
+    return _check_service()
+
+
+def teardown_summary():
+    """Return this process's teardown statistics."""
+    return dict(_teardown_stats, leaks=list(_teardown_stats["leaks"]))
+
+
+def report_teardown_summary(summary):
+    print(
+        f"Teardown: {summary['deletes']} deletes in {summary['teardown_time']:.2f}s, "
+        f"test bodies {summary['body_time']:.2f}s, {len(summary['leaks'])} leaked"
+    )
+    for leak in summary["leaks"]:
+        print(f"  leaked {leak['kind']}/{leak['id']} from {leak['test']} (status {leak['status']})")
+
+
+def _report_at_exit():
+    if _teardown_stats["deletes"]:
+        report_teardown_summary(teardown_summary())
+
+
+atexit.register(_report_at_exit)
+
+
+def _executor():
+    """Return the teardown thread pool of this process, creating it after a fork."""
+    if _teardown_executor["pid"] != os.getpid():
+        _teardown_executor["pid"] = os.getpid()
+        _teardown_executor["executor"] = ThreadPoolExecutor(max_workers=TEARDOWN_WORKERS)
+    return _teardown_executor["executor"]
+
 
 def require_service_running(func):
     """Decorator to skip tests if the API service is not running."""
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            response = BaseAPITest.session.get(BaseAPITest.BASE_URL)
-            if response.status_code != 200:
-                raise Exception("API service is not running.")
-        except requests.exceptions.ConnectionError:
+        status = service_status()
+        if status is None:
             raise unittest.SkipTest("API service is not running.")
+        if status != 200:
+            raise Exception("API service is not running.")
         return func(*args, **kwargs)
 
     return wrapper
@@ -25,15 +125,24 @@ class BaseAPITest(unittest.TestCase):
     HEADERS_JSON = {"Content-Type": "application/json", "Accept": "application/json"}
     HEADERS_XML = {"Content-Type": "application/xml", "Accept": "application/xml"}
     session = requests.Session()
+    worker_id = None
+
+    @classmethod
+    def use_worker_session(cls, worker_id):
+        """Give worker ``worker_id`` its own session.
+
+        Only the connection pool is separate; the server cannot tell workers
+        apart. Workers stay out of each other's way because tearDown only
+        deletes the ids in the test's own ``created_*`` lists.
+        """
+        cls.worker_id = worker_id
+        cls.session = requests.Session()
 
     @classmethod
     def setUpClass(cls):
         """Ensure the API service is running before any tests are executed."""
-        try:
-            response = cls.session.get(cls.BASE_URL)
-            if response.status_code != 200:
-                raise Exception("API service is not running.")
-        except requests.exceptions.ConnectionError:
+        start_liveness_probe()
+        if service_status() != 200:
             raise Exception("API service is not running.")
 
     def setUp(self):
@@ -42,26 +151,39 @@ class BaseAPITest(unittest.TestCase):
         self.created_todos = []
         self.created_projects = []
         self.created_categories = []
+        self._body_start = time.perf_counter()
 
     def tearDown(self):
         """Clean up after each test method."""
-        # Delete any created todos
-        for todo_id in self.created_todos:
-            self.session.delete(
-                f"{self.BASE_URL}/todos/{todo_id}", headers=self.HEADERS_JSON
-            )
+        teardown_start = time.perf_counter()
+        _teardown_stats["body_time"] += teardown_start - self._body_start
 
-        # Delete any created projects
-        for project_id in self.created_projects:
-            self.session.delete(
-                f"{self.BASE_URL}/projects/{project_id}", headers=self.HEADERS_JSON
-            )
+        # Delete every created todo, project and category concurrently
+        resources = (
+            [("todos", todo_id) for todo_id in self.created_todos]
+            + [("projects", project_id) for project_id in self.created_projects]
+            + [("categories", category_id) for category_id in self.created_categories]
+        )
+        statuses = list(_executor().map(self._delete_resource, resources))
+
+        # A 404 means the test already removed it; anything else is a leak
+        for (kind, resource_id), status in zip(resources, statuses):
+            if status not in (200, 404):
+                _teardown_stats["leaks"].append(
+                    {"test": self.id(), "kind": kind, "id": resource_id, "status": status}
+                )
+        _teardown_stats["deletes"] += len(resources)
+        _teardown_stats["teardown_time"] += time.perf_counter() - teardown_start
 
-        # Delete any created categories
-        for category_id in self.created_categories:
-            self.session.delete(
-                f"{self.BASE_URL}/categories/{category_id}", headers=self.HEADERS_JSON
+    def _delete_resource(self, resource):
+        kind, resource_id = resource
+        try:
+            response = self.session.delete(
+                f"{self.BASE_URL}/{kind}/{resource_id}", headers=self.HEADERS_JSON
             )
+        except requests.exceptions.RequestException as e:
+            return type(e).__name__
+        return response.status_code
 
     def create_todo(self, title="Test TODO", doneStatus=False, description=""):
         """Utility method to create a TODO."""
@@ -127,6 +249,31 @@ class BaseAPITest(unittest.TestCase):
         except ET.ParseError:
             self.fail("Malformed XML received.")
 
+    def iter_list(self, endpoint, fmt="json"):
+        """Utility method to iterate over the entities of a list endpoint such as ``/todos/1/tasksof``.
+
+        The body is parsed as it arrives: JSON yields dicts, XML yields the
+        child elements of the root, so large collections are never held whole.
+        A non-200 status, malformed XML or another root element fails the test.
+        """
+        headers = self.HEADERS_JSON if fmt == "json" else self.HEADERS_XML
+        response = self.session.get(f"{self.BASE_URL}{endpoint}", headers=headers, stream=True)
+        if response.status_code != 200:
+            response.close()
+            self.fail(f"Failed to list {endpoint}: {response.status_code}")
+        key, tag = LIST_KEYS[endpoint.split("?")[0].rstrip("/").split("/")[-1]]
+        if fmt == "json":
+            return iter_json_items(response, key)
+        return self._iter_xml_list(response, tag, key)
+
+    def _iter_xml_list(self, response, tag, root_tag):
+        try:
+            yield from iter_xml_elements(response, tag, root_tag)
+        except ET.ParseError:
+            self.fail("Malformed XML received.")
+        except ValueError as e:
+            self.fail(str(e))
+
     def send_xml_post(self, endpoint, xml_payload):
         """Utility method to send POST request with XML payload."""
         response = self.session.post(
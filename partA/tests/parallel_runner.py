@@ -0,0 +1,93 @@
+"""Run the shuffled partA suite across several worker processes.
+
+Usage, from partA/tests:
+
+    python parallel_runner.py --workers 4 [--seed N]
+
+The tests are shuffled exactly as in test_random_order (same TEST_SEED), then
+dealt round-robin to the workers. Every worker has its own requests.Session,
+and tearDown only deletes the ids its own tests tracked.
+"""
+import argparse
+import io
+import multiprocessing
+import sys
+import time
+import unittest
+
+from base_test import BaseAPITest, report_teardown_summary, teardown_summary
+from test_random_order import shuffle_seed, shuffled_tests
+
+
+def run_shard(worker_id, test_ids):
+    """Run ``test_ids`` in order in this process and return a picklable summary."""
+    BaseAPITest.use_worker_session(worker_id)
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(loader.loadTestsFromName(test_id) for test_id in test_ids)
+    stream = io.StringIO()
+    start = time.time()
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return {
+        "worker": worker_id,
+        "run": result.testsRun,
+        "failures": [(test.id(), trace) for test, trace in result.failures],
+        "errors": [(test.id(), trace) for test, trace in result.errors],
+        "skipped": len(result.skipped),
+        "duration": time.time() - start,
+        "teardown": teardown_summary(),
+        "output": stream.getvalue(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the partA suite in parallel")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, help="shuffle seed (defaults to TEST_SEED or random)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each worker's output")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else shuffle_seed()
+    test_ids = [test.id() for test in shuffled_tests(unittest.TestLoader(), seed)]
+    shards = [(worker_id, test_ids[worker_id::args.workers]) for worker_id in range(args.workers)]
+    print(f"Running {len(test_ids)} tests on {args.workers} workers (seed {seed})")
+
+    start = time.time()
+    with multiprocessing.Pool(args.workers) as pool:
+        summaries = pool.starmap(run_shard, [shard for shard in shards if shard[1]])
+    duration = time.time() - start
+
+    failures = [f for s in summaries for f in s["failures"]]
+    errors = [e for s in summaries for e in s["errors"]]
+    for summary in summaries:
+        print(
+            f"Worker {summary['worker']}: {summary['run']} tests in {summary['duration']:.2f}s, "
+            f"{len(summary['failures'])} failures, {len(summary['errors'])} errors, "
+            f"{summary['skipped']} skipped"
+        )
+        if args.verbose:
+            print(summary["output"])
+    for label, problems in (("FAIL", failures), ("ERROR", errors)):
+        for test_id, trace in problems:
+            print(f"\n{'=' * 70}\n{label}: {test_id}\n{'-' * 70}\n{trace}")
+
+    teardown = {
+        "deletes": sum(s["teardown"]["deletes"] for s in summaries),
+        "leaks": [leak for s in summaries for leak in s["teardown"]["leaks"]],
+        "teardown_time": sum(s["teardown"]["teardown_time"] for s in summaries),
+        "body_time": sum(s["teardown"]["body_time"] for s in summaries),
+    }
+    print()
+    report_teardown_summary(teardown)
+
+    total = sum(s["run"] for s in summaries)
+    print(f"\nRan {total} tests in {duration:.2f}s on {args.workers} workers")
+    print(f"Shuffle seed: {seed} (reproduce with --seed {seed} or TEST_SEED={seed})")
+    if failures or errors:
+        print(f"FAILED (failures={len(failures)}, errors={len(errors)})")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import os
 import unittest
 import random
 from test_todos_documented import TestTodosDocumented
@@ -9,34 +10,56 @@ from test_malformed_payloads import TestMalformedPayloads
 from test_invalid_operations import TestInvalidOperations
 
 
-def load_tests(loader, standard_tests, pattern):
-    """Load tests and shuffle them to run in random order."""
-    test_classes = [
-        TestTodosDocumented,
-        TestTodosUndocumented,
-        TestProjectsDocumented,
-        TestProjectsUndocumented,
-        TestBugs,
-        TestMalformedPayloads,
-        TestInvalidOperations,
-    ]
+TEST_CLASSES = [
+    TestTodosDocumented,
+    TestTodosUndocumented,
+    TestProjectsDocumented,
+    TestProjectsUndocumented,
+    TestBugs,
+    TestMalformedPayloads,
+    TestInvalidOperations,
+]
+
 
+def shuffle_seed():
+    """Return the seed from the TEST_SEED environment variable, or a new random one."""
+    seed = os.environ.get("TEST_SEED")
+    return int(seed) if seed else random.randrange(2**32)
+
+
+def collect_tests(loader):
+    """Return every test of TEST_CLASSES in definition order."""
     all_tests = []
-    for test_class in test_classes:
+    for test_class in TEST_CLASSES:
         tests = loader.loadTestsFromTestCase(test_class)
         all_tests.extend(tests)
+    return all_tests
+
+
+def shuffled_tests(loader, seed):
+    """Return every test of TEST_CLASSES in the order produced by ``seed``."""
+    all_tests = collect_tests(loader)
+    random.Random(seed).shuffle(all_tests)
+    return all_tests
+
+
+def load_tests(loader, standard_tests, pattern):
+    """Load tests and shuffle them to run in random order."""
+    all_tests = collect_tests(loader)
 
     # Print the list of tests before shuffling in a more readable format
     print("========== Tests before shuffling ==========")
     for i, test in enumerate(all_tests, 1):
         print(f"{i}. {test}")
 
-    random.shuffle(all_tests)
+    seed = shuffle_seed()
+    random.Random(seed).shuffle(all_tests)
 
     # Print the list of tests after shuffling
-    print("\n========== Tests after shuffling ==========")
+    print(f"\n========== Tests after shuffling (seed {seed}) ==========")
     for i, test in enumerate(all_tests, 1):
         print(f"{i}. {test}")
+    print(f"Re-run this order with TEST_SEED={seed}")
 
     suite = unittest.TestSuite(all_tests)
     return suite
@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partA.streaming import _iter_json_list, iter_xml_elements
+
+
+class ChunkedResponse:
+    """Stands in for a ``stream=True`` response whose body arrives as ``chunks``."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def split_at(body, *offsets):
+    bounds = [0, *offsets, len(body)]
+    return [body[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+class TestJsonList(unittest.TestCase):
+    BODY = json.dumps({
+        "todos": [
+            {"id": "1", "title": "café [1]", "doneStatus": False, "tags": [1, {"a": "}"}]},
+            {"id": "2", "title": "quote \" and \\ backslash", "description": ""},
+            {"id": "3", "title": "last", "categories": []},
+        ]
+    }, ensure_ascii=False).encode()
+
+    def test_every_chunk_boundary(self):
+        """Split anywhere, even inside a multi-byte character, the list parses like json.loads."""
+        expected = json.loads(self.BODY)["todos"]
+        for offset in range(1, len(self.BODY)):
+            with self.subTest(offset=offset):
+                self.assertEqual(list(_iter_json_list(split_at(self.BODY, offset), "todos")), expected)
+
+    def test_one_byte_chunks(self):
+        chunks = [self.BODY[i:i + 1] for i in range(len(self.BODY))]
+        self.assertEqual(list(_iter_json_list(chunks, "todos")), json.loads(self.BODY)["todos"])
+
+    def test_entity_spanning_many_chunks(self):
+        """A large entity is buffered across chunks until it is complete."""
+        body = json.dumps({"todos": [{"id": "1", "description": "x" * 5000}, {"id": "2"}]}).encode()
+        chunks = [body[i:i + 64] for i in range(0, len(body), 64)]
+        items = list(_iter_json_list(chunks, "todos"))
+        self.assertEqual([item["id"] for item in items], ["1", "2"])
+        self.assertEqual(len(items[0]["description"]), 5000)
+
+    def test_empty_list(self):
+        self.assertEqual(list(_iter_json_list([b'{"todos": [ ]}'], "todos")), [])
+
+    def test_body_without_the_list(self):
+        self.assertEqual(list(_iter_json_list([b"{}"], "todos")), [])
+        self.assertEqual(list(_iter_json_list([b""], "todos")), [])
+        errors = b'{"errorMessages": ["Could not find an instance with todos/9"]}'
+        self.assertEqual(list(_iter_json_list(split_at(errors, 5), "todos")), [])
+
+    def test_other_list_key(self):
+        self.assertEqual(list(_iter_json_list([b'{"projects": [{"id": "1"}]}'], "todos")), [])
+
+    def test_truncated_list(self):
+        body = b'{"todos": [{"id": "1"}, {"id": "2", "title": "cut'
+        items = _iter_json_list(split_at(body, 10, 20), "todos")
+        self.assertEqual(next(items), {"id": "1"})
+        with self.assertRaisesRegex(Exception, "Truncated JSON list 'todos' after 1 entities"):
+            next(items)
+
+
+class TestXmlElements(unittest.TestCase):
+    BODY = (
+        b"<todos><todo><id>1</id><title>caf\xc3\xa9</title></todo>"
+        b"<todo><id>2</id><title>b</title><tasksof><id>7</id></tasksof></todo></todos>"
+    )
+
+    def test_every_chunk_boundary(self):
+        for offset in range(1, len(self.BODY)):
+            with self.subTest(offset=offset):
+                response = ChunkedResponse(split_at(self.BODY, offset))
+                todos = list(iter_xml_elements(response, "todo", root_tag="todos"))
+                self.assertEqual([todo.findtext("id") for todo in todos], ["1", "2"])
+                self.assertEqual(todos[0].findtext("title"), "café")
+                self.assertEqual(todos[1].find("tasksof").findtext("id"), "7")
+                self.assertTrue(response.closed)
+
+    def test_only_children_of_the_root(self):
+        """Nested elements with the same tag are part of their parent, not yielded."""
+        body = b"<todos><todo><id>1</id><todo><id>9</id></todo></todo><project><id>2</id></project></todos>"
+        todos = list(iter_xml_elements(ChunkedResponse([body]), "todo"))
+        self.assertEqual([todo.findtext("id") for todo in todos], ["1"])
+        self.assertEqual(todos[0].find("todo").findtext("id"), "9")
+
+    def test_wrong_root(self):
+        response = ChunkedResponse([b"<todo><id>1</id></todo>"])
+        with self.assertRaisesRegex(ValueError, "Expected a <todos> list, got <todo>"):
+            list(iter_xml_elements(response, "todo", root_tag="todos"))
+        self.assertTrue(response.closed)
+
+    def test_closed_when_abandoned(self):
+        response = ChunkedResponse(split_at(self.BODY, 60))
+        elements = iter_xml_elements(response, "todo")
+        next(elements)
+        elements.close()
+        self.assertTrue(response.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,241 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
 import requests
 
 BASE_URL = "http://localhost:4567"
 session = requests.Session()
 
+# Worker threads used by post_on_todos_id / post_on_projects_id; 1 links serially.
+LINK_WORKERS = 1
 
-def create_todo(
-    title="Test TODO" * 50000, doneStatus=False, description="Description" * 50000
-):
-    response = session.post(
-        f"{BASE_URL}/todos",
-        json={"title": title, "doneStatus": doneStatus, "description": description},
-    )
+RELATIONSHIPS = {
+    "todo_project": "todos/{}/tasksof",
+    "project_todo": "projects/{}/tasks",
+    "todo_category": "todos/{}/categories",
+    "project_category": "projects/{}/categories",
+}
+
+LinkFailure = namedtuple("LinkFailure", ["source", "target", "error"])
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+ACCEPT_HEADERS = {
+    "json": {"Accept": "application/json"},
+    "xml": {"Accept": "application/xml"},
+}
+
+# Repeat counts of the base title/description words for one payload variant.
+# Randomized profiles draw a new pair for each of the PAYLOAD_VARIANTS bodies.
+PAYLOAD_PROFILES = {
+    "tiny": lambda rng: (1, 0),
+    "realistic": lambda rng: (rng.randint(1, 5), rng.randint(0, 40)),
+    "large": lambda rng: (50000, 50000),
+    "random": lambda rng: (rng.randint(1, 20), min(int(rng.lognormvariate(2, 2)), 100000)),
+}
+PAYLOAD_VARIANTS = 32
+payload_profile = "large"
+
+_payload_seed = 0
+_payloads = {}
+# Per-kind generators picking the variant of each request, seeded like the variant sizes
+_payload_choices = {}
+_payloads_lock = threading.Lock()
+
+_pool_size = requests.adapters.DEFAULT_POOLSIZE
+# Threads shared by every link_bulk call, sized with the session's pool by configure_pool
+_link_executor = None
+_pool_lock = threading.Lock()
+
+# Registered listeners, each mapped to whether it wants the request and response bodies
+_request_listeners = {}
+BODY_FIELDS = ("body", "response_body")
+_request_tags = threading.local()
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(method, url):
+    """Return e.g. ``POST /todos/{id}/tasksof`` for a concrete request URL."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', urlsplit(url).path)}"
+
+
+@contextmanager
+def request_tags(**tags):
+    """Attach ``tags`` to every request record made by this thread inside the block."""
+    previous = getattr(_request_tags, "tags", {})
+    _request_tags.tags = {**previous, **tags}
+    try:
+        yield
+    finally:
+        _request_tags.tags = previous
+
+
+def add_request_listener(listener, bodies=False):
+    """Call ``listener(record)`` after every HTTP call made through ``session``.
+
+    Each record holds the endpoint template, status, latency in seconds
+    (including reading the body), request/response sizes in bytes and any
+    tags set with ``request_tags``. ``method``, ``path`` (with the query),
+    ``start`` (wall-clock send time) and ``headers`` describe the exchange
+    itself; with ``bodies`` the record also has ``body`` and
+    ``response_body``, the raw bytes rather than copies.
+
+    A ``stream=True`` response is left unread: its latency is the time to
+    the headers, ``response_bytes`` comes from Content-Length and
+    ``response_body`` is None.
+    """
+    _request_listeners[listener] = bodies
+    if _record_request not in session.hooks["response"]:
+        session.hooks["response"].append(_record_request)
+
+
+def remove_request_listener(listener):
+    del _request_listeners[listener]
+
+
+def has_request_listeners():
+    """Whether any listener is registered, so other clients can skip building records."""
+    return bool(_request_listeners)
+
+
+def _record_request(response, *args, stream=False, **kwargs):
+    if not _request_listeners:
+        return
+    sent = time.time() - response.elapsed.total_seconds()
+    body_start = time.perf_counter()
+    if stream:
+        # Reading the body here would buffer it whole; the caller consumes it
+        content = None
+        response_bytes = int(response.headers.get("Content-Length", 0))
+    else:
+        content = response.content
+        response_bytes = len(content)
+    request = response.request
+    url = urlsplit(request.url)
+    record = {
+        "endpoint": endpoint_template(request.method, request.url),
+        "status": response.status_code,
+        "latency": response.elapsed.total_seconds() + time.perf_counter() - body_start,
+        "request_bytes": len(request.body or b""),
+        "response_bytes": response_bytes,
+        "method": request.method,
+        "path": f"{url.path}?{url.query}" if url.query else url.path,
+        "start": sent,
+        "headers": request.headers,
+        "body": request.body,
+        "response_body": content,
+    }
+    notify_listeners(record)
+
+
+def notify_listeners(record):
+    """Tag ``record`` like a ``session`` call and pass it to the request listeners.
+
+    For clients other than ``session``, e.g. async_util.AsyncClient, whose
+    records have the fields described in add_request_listener, bodies
+    included; listeners that did not ask for bodies get a copy without them.
+    """
+    record.update(getattr(_request_tags, "tags", {}))
+    listeners = list(_request_listeners.items())
+    without_bodies = None
+    for listener, bodies in listeners:
+        if not bodies and without_bodies is None:
+            without_bodies = {name: value for name, value in record.items() if name not in BODY_FIELDS}
+        listener(record if bodies else without_bodies)
+
+
+def configure_pool(size):
+    """Size the shared session's connection pool and link_bulk's threads for ``size`` concurrent requests.
+
+    Call it once before sending requests: the new adapters replace the
+    session's pools, dropping their open connections.
+    """
+    global _pool_size, _link_executor
+    with _pool_lock:
+        _pool_size = size
+        adapter = requests.adapters.HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        previous, _link_executor = _link_executor, ThreadPoolExecutor(size, thread_name_prefix="link")
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _link_threads():
+    global _link_executor
+    with _pool_lock:
+        if _link_executor is None:
+            _link_executor = ThreadPoolExecutor(_pool_size, thread_name_prefix="link")
+        return _link_executor
+
+
+def set_payload_profile(name, seed=0):
+    """Select the profile used by create_todo/create_project when called without fields.
+
+    ``seed`` fixes both the variant sizes and the order they are sent in.
+    """
+    global payload_profile, _payload_seed
+    if name not in PAYLOAD_PROFILES:
+        raise ValueError(f"Unknown payload profile: {name}")
+    with _payloads_lock:
+        payload_profile = name
+        _payload_seed = seed
+        _payloads.clear()
+        _payload_choices.clear()
+
+
+def _todo_body(title_repeat, description_repeat):
+    return {
+        "title": "Test TODO" * title_repeat,
+        "doneStatus": False,
+        "description": "Description" * description_repeat,
+    }
+
+
+def _project_body(title_repeat, description_repeat):
+    return {
+        "title": "Test Project" * title_repeat,
+        "completed": False,
+        "active": True,
+        "description": "Decription" * description_repeat,
+    }
+
+
+def payload_body(kind):
+    """Return one of the pre-encoded JSON bodies of the current profile for ``kind``, "todo" or "project"."""
+    with _payloads_lock:
+        if kind not in _payloads:
+            rng = random.Random(_payload_seed)
+            sizes = sorted({PAYLOAD_PROFILES[payload_profile](rng) for _ in range(PAYLOAD_VARIANTS)})
+            build = _todo_body if kind == "todo" else _project_body
+            _payloads[kind] = [json.dumps(build(*size)).encode() for size in sizes]
+            _payload_choices[kind] = random.Random(f"{_payload_seed}-{kind}")
+        return _payload_choices[kind].choice(_payloads[kind])
+
+
+def create_todo(title=None, doneStatus=False, description=None):
+    """Create a todo and return its id.
+
+    Without arguments the body is taken from the active payload profile and
+    is not re-serialized per call.
+    """
+    if title is None and description is None and not doneStatus:
+        body = payload_body("todo")
+    else:
+        body = json.dumps(
+            {
+                "title": "Test TODO" if title is None else title,
+                "doneStatus": doneStatus,
+                "description": "" if description is None else description,
+            }
+        ).encode()
+    response = session.post(f"{BASE_URL}/todos", data=body, headers=JSON_HEADERS)
     if response.status_code != 201:
         raise Exception(
             f"Failed to create todo. Status: {response.status_code}, Response: {response.text}"
@@ -26,7 +251,46 @@ def delete_todo(todo_id):
         )
 
 
+def link_bulk(pairs, relationship="todo_project", workers=16):
+    """Create one relationship per ``(source, target)`` pair, ``workers`` at a time.
+
+    ``relationship`` is a key of ``RELATIONSHIPS``. The pairs are split
+    among ``workers`` tasks on the threads shared by all calls (see
+    configure_pool). A failing pair does not stop the batch; the failures
+    are returned as ``LinkFailure`` tuples. The caller's ``request_tags``
+    apply to the workers' requests too.
+    """
+    path = RELATIONSHIPS[relationship]
+    tags = getattr(_request_tags, "tags", {})
+
+    def link(pairs):
+        failures = []
+        with request_tags(**tags):
+            for source, target in pairs:
+                try:
+                    response = session.post(f"{BASE_URL}/{path.format(source)}", json={"id": target})
+                except requests.exceptions.RequestException as e:
+                    failures.append(LinkFailure(source, target, str(e)))
+                    continue
+                if response.status_code != 201:
+                    failures.append(LinkFailure(
+                        source, target, f"Status: {response.status_code}, Response: {response.text}"
+                    ))
+        return failures
+
+    shares = [pairs[start::workers] for start in range(workers)]
+    return [failure for failures in _link_threads().map(link, shares) for failure in failures]
+
+
 def post_on_todos_id(todo_id, project_ids):
+    if LINK_WORKERS > 1:
+        pairs = [(todo_id, project_id) for project_id in project_ids[:len(project_ids)//2]]
+        failures = link_bulk(pairs, "todo_project", LINK_WORKERS)
+        if failures:
+            raise Exception(
+                f"Failed to connect todo {todo_id} with project {failures[0].target}. {failures[0].error}"
+            )
+        return
     for project_id in project_ids[:len(project_ids)//2]:
         response = session.post(
             f"{BASE_URL}/todos/{todo_id}/tasksof", json={"id": project_id}
@@ -37,21 +301,20 @@ def post_on_todos_id(todo_id, project_ids):
             )
 
 
-def create_project(
-    title="Test Project" * 50000,
-    completed=False,
-    active=True,
-    description="Decription" * 50000,
-):
-    response = session.post(
-        f"{BASE_URL}/projects",
-        json={
-            "title": title,
-            "completed": completed,
-            "active": active,
-            "description": description,
-        },
-    )
+def create_project(title=None, completed=False, active=True, description=None):
+    """Create a project and return its id; see create_todo for the default body."""
+    if title is None and description is None and not completed and active:
+        body = payload_body("project")
+    else:
+        body = json.dumps(
+            {
+                "title": "Test Project" if title is None else title,
+                "completed": completed,
+                "active": active,
+                "description": "" if description is None else description,
+            }
+        ).encode()
+    response = session.post(f"{BASE_URL}/projects", data=body, headers=JSON_HEADERS)
     if response.status_code != 201:
         raise Exception(
             f"Failed to create project. Status: {response.status_code}, Response: {response.text}"
@@ -68,6 +331,14 @@ def delete_project(project_id):
 
 
 def post_on_projects_id(project_id, todo_ids):
+    if LINK_WORKERS > 1:
+        pairs = [(project_id, todo_id) for todo_id in todo_ids[:len(todo_ids)//2]]
+        failures = link_bulk(pairs, "project_todo", LINK_WORKERS)
+        if failures:
+            raise Exception(
+                f"Failed to connect project {project_id} with todo {failures[0].target}. {failures[0].error}"
+            )
+        return
     for todo_id in todo_ids[:len(todo_ids)//2]:
         response = session.post(
             f"{BASE_URL}/projects/{project_id}/tasks", json={"id": todo_id}
@@ -76,3 +347,32 @@ def post_on_projects_id(project_id, todo_ids):
             raise Exception(
                 f"Failed to connect project {project_id} with todo {todo_id}. Status: {response.status_code}, Response: {response.text}"
             )
+
+
+def create_category(title="Test Category", description=""):
+    response = session.post(
+        f"{BASE_URL}/categories", json={"title": title, "description": description}
+    )
+    if response.status_code != 201:
+        raise Exception(
+            f"Failed to create category. Status: {response.status_code}, Response: {response.text}"
+        )
+    return response.json()["id"]
+
+
+def delete_category(category_id):
+    response = session.delete(f"{BASE_URL}/categories/{category_id}")
+    if response.status_code != 200:
+        raise Exception(
+            f"Failed to delete category {category_id}. Status: {response.status_code}, Response: {response.text}"
+        )
+
+
+def get_resource(path, params=None, fmt="json"):
+    """GET ``path`` (e.g. ``todos`` or ``projects/3/tasks``) as ``fmt`` and return the response."""
+    response = session.get(f"{BASE_URL}/{path}", params=params, headers=ACCEPT_HEADERS[fmt])
+    if response.status_code != 200:
+        raise Exception(
+            f"Failed to get {path}. Status: {response.status_code}, Response: {response.text}"
+        )
+    return response
@@ -1,13 +1,72 @@
-from features.steps.utils import reset_database_to_default
+import os
+import sys
+import time
 import random
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from features.steps.utils import BASE_URL, configure_client, reset_database_to_default
+
+from partA.server import ServerPool, TodoServer
+from partA.stub_server import StubServer
+
 def before_all(context):
     """Shuffle features before execution starts."""
-    random.shuffle(context._runner.features)
+    # -D shuffle_seed=N makes the feature and scenario order reproducible
+    shuffle_seed = context.config.userdata.get('shuffle_seed')
+    context.shuffle = random.Random(int(shuffle_seed) if shuffle_seed is not None else None)
+    context.shuffle.shuffle(context._runner.features)
+    context.reset_times = {}
+
+    # Only restart the server on large resets when behave started it itself
+    userdata = context.config.userdata
+    context.restart_threshold = int(userdata.get('reset_restart_threshold', 200))
+    # Set up here, not reassigned later: behave drops attributes set inside a feature's hooks
+    context.backend = {'pool': None, 'server': None}
+    pool = None
+    base_url = userdata.get('base_url', BASE_URL)
+    port = int(userdata.get('server_port', 4567))
+    if userdata.getbool('stub'):
+        # -D stub=true serves the API from this process, no Java needed; there is no JIT to warm up
+        pool = ServerPool(1, base_port=port, warmup=None, server_factory=StubServer)
+    elif 'server_jar' in userdata:
+        jar_path = userdata['server_jar']
+        pool = ServerPool(1, base_port=port, server_factory=lambda port: TodoServer(jar_path, port=port))
+    if pool is not None:
+        # Keep a warm spare for large resets to switch to
+        context.backend['pool'] = pool
+        context.backend['server'] = pool.acquire()
+        pool.fill()
+        base_url = context.backend['server'].base_url
+
+    # One pooled client for all steps, e.g. -D base_url=http://localhost:4568 -D timeout=5
+    context.client = configure_client(base_url, float(userdata.get('timeout', 10)))
 
 def before_feature(context, feature):
     """Shuffle scenarios within each feature."""
-    random.shuffle(feature.scenarios)
+    context.shuffle.shuffle(feature.scenarios)
+
+def switch_server(context):
+    """Replace the server with the pool's spare, which has only the default data."""
+    pool = context.backend['pool']
+    old_server = context.backend['server']
+    context.backend['server'] = pool.acquire()
+    # The steps hold on to this client, so point it at the new server rather than replacing it
+    context.client.base_url = context.backend['server'].base_url
+    pool.release(old_server)
+
+def after_feature(context, feature):
+    start = time.perf_counter()
+    restart = (lambda: switch_server(context)) if context.backend['pool'] else None
+    deleted = reset_database_to_default(restart, context.restart_threshold)
+    elapsed = time.perf_counter() - start
+    context.reset_times[feature.name] = elapsed
+    print(f"Reset after '{feature.name}': {deleted} objects removed in {elapsed:.3f}s")
 
-def after_feature(context, scenario):
-    reset_database_to_default()
+def after_all(context):
+    if context.reset_times:
+        print(f"Total reset time: {sum(context.reset_times.values()):.3f}s over {len(context.reset_times)} features")
+    context.client.close()
+    if context.backend['pool']:
+        context.backend['pool'].close()
+        context.backend['pool'].release(context.backend['server'])
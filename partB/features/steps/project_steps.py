@@ -1,27 +1,17 @@
 from behave import given, when, then
-import requests
 from features.steps.utils import get_project_by_title, get_todo_by_title
 
-BASE_URL = 'http://localhost:4567'
-
-def get_project_by_title(title):
-    response = requests.get(f'{BASE_URL}/projects', params={'title': title})
-    if response.status_code == 200:
-        projects = response.json().get('projects', [])
-        return projects[0] if projects else None
-    return None
-
 @given('a project with title "{title}" exists')
 def step_impl(context, title):
     payload = {'title': title}
-    response = requests.post(f'{BASE_URL}/projects', json=payload)
+    response = context.client.post('/projects', json=payload)
     assert response.status_code == 201, f"Failed to create project with title '{title}'"
     context.project_id = response.json()['id']
 
 @when('I create a new project with all fields "{title}" "{completed}" "{active}" "{description}"')
 def step_impl(context, title, completed, active, description):
     data = {"title": title, "completed": completed == "true", "active": active == "true", "description": description}
-    response = requests.post(f"{BASE_URL}/projects", json=data)
+    response = context.client.post("/projects", json=data)
     assert response.status_code == 201, f"Failed to create project"
     context.project_id = response.json().get('id')
 
@@ -34,14 +24,14 @@ def step_impl(context, project_title, todo_title):
     assert todo is not None, f"No todo item found with title '{todo_title}'"
     todo_id = todo['id']
     payload = {'id': project_id}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}/tasksof', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}/tasksof', json=payload)
 
 @then('the todo item "{todo_title}" should be associated with the project "{project_title}"')
 def step_impl(context, todo_title, project_title):
     todo = get_todo_by_title(todo_title)
     assert todo is not None, f"No todo item found with title '{todo_title}'"
     todo_id = todo['id']
-    response = requests.get(f'{BASE_URL}/todos/{todo_id}/tasksof')
+    response = context.client.get(f'/todos/{todo_id}/tasksof')
     assert response.status_code == 200, f"Failed to retrieve projects for todo '{todo_title}'"
     projects = response.json().get('projects', [])
     titles = [proj.get('title') for proj in projects]
@@ -50,7 +40,7 @@ def step_impl(context, todo_title, project_title):
 @when('I create a project with title "{project_title}" and associate it with the todo item "{todo_title}"')
 def step_impl(context, project_title, todo_title):
     payload = {'title': project_title}
-    response = requests.post(f'{BASE_URL}/projects', json=payload)
+    response = context.client.post('/projects', json=payload)
     assert response.status_code == 201, f"Failed to create project with title '{project_title}'"
     project = response.json()
     project_id = project['id']
@@ -58,7 +48,7 @@ def step_impl(context, project_title, todo_title):
     assert todo is not None, f"No todo item found with title '{todo_title}'"
     todo_id = todo['id']
     payload = {'id': project_id}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}/tasksof', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}/tasksof', json=payload)
 
 @when('I attempt to associate a non-existent project with id "{project_id}" with the todo item "{todo_title}"')
 def step_impl(context, project_id, todo_title):
@@ -66,7 +56,7 @@ def step_impl(context, project_id, todo_title):
     assert todo is not None, f"No todo item found with title '{todo_title}'"
     todo_id = todo['id']
     payload = {'id': project_id}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}/tasksof', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}/tasksof', json=payload)
 
 @then('I should receive an error message indicating the project does not exist')
 def step_impl(context):
@@ -76,12 +66,12 @@ def step_impl(context):
 @when('I attempt to create a new project with fake field "{fake}"')
 def step_impl(context, fake):
     data = {"fake": fake}
-    response = requests.post(f"{BASE_URL}/projects", json=data)
+    response = context.client.post("/projects", json=data)
     context.response = response.json()
 
 @then('the project should be created with all fields "{title}" "{completed}" "{active}" "{description}"')
 def step_impl(context, title, completed, active, description):    
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}")
+    response = context.client.get(f"/projects/{context.project_id}")
     assert response.status_code == 200, f"Failed to retrieve project with id '{context.project_id}'"
 
     project = response.json().get('projects')[0]
@@ -92,7 +82,7 @@ def step_impl(context, title, completed, active, description):
 
 @then('the project should be created with "{title}"')
 def step_impl(context, title):    
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}")
+    response = context.client.get(f"/projects/{context.project_id}")
     assert response.status_code == 200, f"Failed to retrieve project with id '{context.project_id}'"
 
     project = response.json().get('projects')[0]
@@ -106,23 +96,23 @@ def step_impl(context):
 def step_impl(context, old_todo_title, new_todo_title):
     # Remove old todo
     old_todo_id = context.todosDict[old_todo_title]
-    response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/tasks/{old_todo_id}")
+    response = context.client.delete(f"/projects/{context.project_id}/tasks/{old_todo_id}")
     assert response.status_code == 200, f"Failed to remove old todo from project"
     # Add new todo
     new_todo_id = context.todosDict[new_todo_title]
     data = {"id": new_todo_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/tasks", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/tasks", json=data)
     assert response.status_code == 201, f"Failed to add new todo to project"
 
 @when('I update the project\'s todos to "{new_todo1}" and "{new_todo2}"')
 def step_impl(context, new_todo1, new_todo2):
     # Remove all existing todos from the project
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get project's todos"
     todos = response.json().get('todos', [])
     for todo in todos:
         todo_id = todo.get('id')
-        delete_response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/tasks/{todo_id}")
+        delete_response = context.client.delete(f"/projects/{context.project_id}/tasks/{todo_id}")
         assert delete_response.status_code == 200, f"Failed to remove todo {todo_id}"
     # Add new todos
     for todo_title in [new_todo1, new_todo2]:
@@ -135,16 +125,16 @@ def step_impl(context, new_todo1, new_todo2):
 def step_impl(context, existing_todo_title, non_existing_todo_id):
     # Remove existing todo
     existing_todo_id = context.todosDict[existing_todo_title]
-    response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/tasks/{existing_todo_id}")
+    response = context.client.delete(f"/projects/{context.project_id}/tasks/{existing_todo_id}")
     assert response.status_code == 200, f"Failed to remove existing todo from project"
     # Attempt to add non-existing todo
     data = {"id": non_existing_todo_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/tasks", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/tasks", json=data)
     context.response = response
 
 @then('the project should contain the todo "{todo_title}"')
 def step_impl(context, todo_title):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get todos of the project"
     todos = response.json().get('todos', [])
     todo_ids = [todo.get('id') for todo in todos]
@@ -153,7 +143,7 @@ def step_impl(context, todo_title):
 
 @then('the project should not contain the todo "{todo_title}"')
 def step_impl(context, todo_title):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get todos of the project"
     todos = response.json().get('todos', [])
     todo_ids = [todo.get('id') for todo in todos]
@@ -162,7 +152,7 @@ def step_impl(context, todo_title):
 
 @then('the project should contain the todos "{todo1}" and "{todo2}"')
 def step_impl(context, todo1, todo2):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get todos of the project"
     todos = response.json().get('todos', [])
     todo_ids_in_project = [todo.get('id') for todo in todos]
@@ -172,7 +162,7 @@ def step_impl(context, todo1, todo2):
 
 @then('the project should not contain the todos "{todo1}" and "{todo2}"')
 def step_impl(context, todo1, todo2):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get todos of the project"
     todos = response.json().get('todos', [])
     todo_ids_in_project = [todo.get('id') for todo in todos]
@@ -184,19 +174,19 @@ def step_impl(context, todo1, todo2):
 @when('I add the todo to the project')
 def step_impl(context):
     data = {"id": context.todo_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/tasks", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/tasks", json=data)
     context.response = response
     assert response.status_code == 201, f"Failed to add todo to project"
 
 @when('I attempt to add a non-existing todo with id "{todo_id}" to the project')
 def step_impl(context, todo_id):
     data = {"id": todo_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/tasks", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/tasks", json=data)
     context.response = response
 
 @then('the project should contain the todo')
 def step_impl(context):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get tasks of the project"
     tasks = response.json().get('todos', [])
     todo_ids = [task.get('id') for task in tasks]
@@ -204,7 +194,7 @@ def step_impl(context):
 
 @then('the project should contain the todos')
 def step_impl(context):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/tasks")
+    response = context.client.get(f"/projects/{context.project_id}/tasks")
     assert response.status_code == 200, "Failed to get tasks of the project"
     tasks = response.json().get('todos', [])
     task_ids = [task.get('id') for task in tasks]
@@ -223,7 +213,7 @@ def step_impl(context):
 @when('I add the category to the project')
 def step_impl(context):
     data = {"id": context.category_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/categories", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/categories", json=data)
     context.response = response
     assert response.status_code == 201, f"Failed to add category to project"
 
@@ -231,18 +221,18 @@ def step_impl(context):
 def step_impl(context):
     for category_id in context.category_ids:
         data = {"id": category_id}
-        response = requests.post(f"{BASE_URL}/projects/{context.project_id}/categories", json=data)
+        response = context.client.post(f"/projects/{context.project_id}/categories", json=data)
         assert response.status_code == 201, f"Failed to add category {category_id} to project"
 
 @when('I attempt to add a non-existing category with id "{category_id}" to the project')
 def step_impl(context, category_id):
     data = {"id": category_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/categories", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/categories", json=data)
     context.response = response
 
 @then('the project should contain the category')
 def step_impl(context):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids = [category.get('id') for category in categories]
@@ -250,7 +240,7 @@ def step_impl(context):
 
 @then('the project should contain the categories')
 def step_impl(context):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids_in_project = [category.get('id') for category in categories]
@@ -272,23 +262,23 @@ def step_impl(context, category1, category2):
 def step_impl(context, old_category_title, new_category_title):
     # Remove old category
     old_category_id = context.categoryDict[old_category_title]
-    response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/categories/{old_category_id}")
+    response = context.client.delete(f"/projects/{context.project_id}/categories/{old_category_id}")
     assert response.status_code == 200, f"Failed to remove old category from project"
     # Add new category
     new_category_id = context.categoryDict[new_category_title]
     data = {"id": new_category_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/categories", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/categories", json=data)
     assert response.status_code == 201, f"Failed to add new category to project"
 
 @when('I update the project\'s categories to "{new_category1}" and "{new_category2}"')
 def step_impl(context, new_category1, new_category2):
     # Remove all existing categories from the project
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get project's categories"
     categories = response.json().get('categories', [])
     for category in categories:
         category_id = category.get('id')
-        delete_response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/categories/{category_id}")
+        delete_response = context.client.delete(f"/projects/{context.project_id}/categories/{category_id}")
         assert delete_response.status_code == 200, f"Failed to remove category {category_id}"
     # Add new categories
     for category_title in [new_category1, new_category2]:
@@ -301,16 +291,16 @@ def step_impl(context, new_category1, new_category2):
 def step_impl(context, existing_category_title, non_existing_category_id):
     # Remove existing category
     existing_category_id = context.categoryDict[existing_category_title]
-    response = requests.delete(f"{BASE_URL}/projects/{context.project_id}/categories/{existing_category_id}")
+    response = context.client.delete(f"/projects/{context.project_id}/categories/{existing_category_id}")
     assert response.status_code == 200, f"Failed to remove existing category from project"
     # Attempt to add non-existing category
     data = {"id": non_existing_category_id}
-    response = requests.post(f"{BASE_URL}/projects/{context.project_id}/categories", json=data)
+    response = context.client.post(f"/projects/{context.project_id}/categories", json=data)
     context.response = response
 
 @then('the project should contain the category "{category_title}"')
 def step_impl(context, category_title):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids = [category.get('id') for category in categories]
@@ -319,7 +309,7 @@ def step_impl(context, category_title):
 
 @then('the project should not contain the category "{category_title}"')
 def step_impl(context, category_title):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids = [category.get('id') for category in categories]
@@ -328,7 +318,7 @@ def step_impl(context, category_title):
 
 @then('the project should contain the categories "{category1}" and "{category2}"')
 def step_impl(context, category1, category2):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids_in_project = [category.get('id') for category in categories]
@@ -338,7 +328,7 @@ def step_impl(context, category1, category2):
 
 @then('the project should not contain the categories "{category1}" and "{category2}"')
 def step_impl(context, category1, category2):
-    response = requests.get(f"{BASE_URL}/projects/{context.project_id}/categories")
+    response = context.client.get(f"/projects/{context.project_id}/categories")
     assert response.status_code == 200, "Failed to get categories of the project"
     categories = response.json().get('categories', [])
     category_ids_in_project = [category.get('id') for category in categories]
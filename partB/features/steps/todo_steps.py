@@ -1,14 +1,12 @@
 from behave import given, when, then
 import requests
-from features.steps.utils import get_todo_by_title, get_all_todos, reset_database_to_default, get_all_projects, get_all_categories
-
-BASE_URL = 'http://localhost:4567'
+from features.steps.utils import get_todo_by_title, get_all_todos, reset_database_to_default, get_all_projects, get_all_categories, remember_todo, forget_todo
 
 
 @given('the todo list application is running')
 def step_impl(context):
     try:
-        response = requests.get(f'{BASE_URL}')
+        response = context.client.get('/')
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         assert False, f"Service is not running: {e}"
@@ -24,9 +22,9 @@ def step_impl(context):
 @given('a todo item with title "{title}" exists')
 def step_impl(context, title):
     payload = {'title': title}
-    response = requests.post(f'{BASE_URL}/todos', json=payload)
+    response = context.client.post('/todos', json=payload)
     assert response.status_code == 201, f"Failed to create todo item with title '{title}'"
-    todo = response.json()
+    todo = remember_todo(response.json())
     context.todo_id = todo['id']
     add_to_todos_dict(context, title, todo['id'])
 
@@ -39,7 +37,7 @@ def add_to_todos_dict(context, key, value):
 @when('I create a new todo with only title "{title}"')
 def step_impl(context, title):
     payload = {'title': title}
-    context.response = requests.post(f'{BASE_URL}/todos', json=payload)
+    context.response = context.client.post('/todos', json=payload)
 
 @then('the todo item should be created with only title "{title}"')
 def step_impl(context, title):
@@ -50,7 +48,7 @@ def step_impl(context, title):
 @when('I create a new todo with title "{title}" and description "{description}"')
 def step_impl(context, title, description):
     payload = {'title': title, 'description': description}
-    context.response = requests.post(f'{BASE_URL}/todos', json=payload)
+    context.response = context.client.post('/todos', json=payload)
 
 @then('the todo item should be created with title "{title}" and description "{description}"')
 def step_impl(context, title, description):
@@ -62,7 +60,7 @@ def step_impl(context, title, description):
 @when('I attempt to create a new todo without a title')
 def step_impl(context):
     payload = {}
-    context.response = requests.post(f'{BASE_URL}/todos', json=payload)
+    context.response = context.client.post('/todos', json=payload)
 
 @then('the todo item should not be created')
 def step_impl(context):
@@ -81,13 +79,14 @@ def step_impl(context, title, description):
     assert todo is not None, f"No todo item found with title '{title}'"
     todo_id = todo['id']
     payload = {'description': description}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}', json=payload)
+    forget_todo(todo_id)
     context.todo_id = todo_id
 
 @then('the todo item should have description "{description}"')
 def step_impl(context, description):
     todo_id = context.todo_id
-    response = requests.get(f'{BASE_URL}/todos/{todo_id}')
+    response = context.client.get(f'/todos/{todo_id}')
     assert response.status_code == 200, f"Failed to retrieve todo item with id '{todo_id}'"
     todo = response.json()['todos'][0]
     assert todo.get('description') == description, f"Expected description '{description}', got '{todo.get('description')}'"
@@ -98,13 +97,14 @@ def step_impl(context, old_title, new_title, description):
     assert todo is not None, f"No todo item found with title '{old_title}'"
     todo_id = todo['id']
     payload = {'title': new_title, 'description': description}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}', json=payload)
+    forget_todo(todo_id)
     context.todo_id = todo_id
 
 @then('the todo item should have title "{title}" and description "{description}"')
 def step_impl(context, title, description):
     todo_id = context.todo_id
-    response = requests.get(f'{BASE_URL}/todos/{todo_id}')
+    response = context.client.get(f'/todos/{todo_id}')
     assert response.status_code == 200, f"Failed to retrieve todo item with id '{todo_id}'"
     todo = response.json()['todos'][0]
     assert todo.get('title') == title, f"Expected title '{title}', got '{todo.get('title')}'"
@@ -113,7 +113,8 @@ def step_impl(context, title, description):
 @when('I attempt to update the description of a todo item with id "{todo_id}" to "{description}"')
 def step_impl(context, todo_id, description):
     payload = {'description': description}
-    context.response = requests.post(f'{BASE_URL}/todos/{todo_id}', json=payload)
+    context.response = context.client.post(f'/todos/{todo_id}', json=payload)
+    forget_todo(todo_id)
     context.todo_id = todo_id
 
 @then('I should receive an error message indicating the todo item does not exist')
@@ -126,7 +127,8 @@ def step_impl(context, title):
     todo = get_todo_by_title(title)
     assert todo is not None, f"No todo item found with title '{title}'"
     todo_id = todo['id']
-    context.response = requests.delete(f'{BASE_URL}/todos/{todo_id}')
+    context.response = context.client.delete(f'/todos/{todo_id}')
+    forget_todo(todo_id)
     context.todo_id = todo_id
 
 @then('the todo item "{title}" should no longer exist')
@@ -136,21 +138,22 @@ def step_impl(context, title):
 
 @when('I attempt to delete a todo item with id "{todo_id}"')
 def step_impl(context, todo_id):
-    context.response = requests.delete(f'{BASE_URL}/todos/{todo_id}')
+    context.response = context.client.delete(f'/todos/{todo_id}')
+    forget_todo(todo_id)
     context.todo_id = todo_id
 
 @given('the todo item with title "{todo_title}" is associated with the project "{project_title}" and category "{category_title}"')
 def step_impl(context, todo_title, project_title, category_title):
     # Create project
     payload = {'title': project_title}
-    response = requests.post(f'{BASE_URL}/projects', json=payload)
+    response = context.client.post('/projects', json=payload)
     assert response.status_code == 201, f"Failed to create project '{project_title}'"
     project = response.json()
     project_id = project['id']
 
     # Create category
     payload = {'title': category_title}
-    response = requests.post(f'{BASE_URL}/categories', json=payload)
+    response = context.client.post('/categories', json=payload)
     assert response.status_code == 201, f"Failed to create category '{category_title}'"
     category = response.json()
     category_id = category['id']
@@ -160,22 +163,22 @@ def step_impl(context, todo_title, project_title, category_title):
     assert todo is not None, f"No todo item found with title '{todo_title}'"
     todo_id = todo['id']
     payload = {'id': project_id}
-    response = requests.post(f'{BASE_URL}/todos/{todo_id}/tasksof', json=payload)
+    response = context.client.post(f'/todos/{todo_id}/tasksof', json=payload)
     assert response.status_code == 201, f"Failed to associate project with todo"
 
     # Associate category with todo
     payload = {'id': category_id}
-    response = requests.post(f'{BASE_URL}/todos/{todo_id}/categories', json=payload)
+    response = context.client.post(f'/todos/{todo_id}/categories', json=payload)
     assert response.status_code == 201, f"Failed to associate category with todo"
 
 @then('the associations should be removed')
 def step_impl(context):
     todo_id = context.todo_id
     # Check projects
-    response = requests.get(f'{BASE_URL}/todos/{todo_id}/tasksof')
+    response = context.client.get(f'/todos/{todo_id}/tasksof')
     assert response.status_code == 404, "Expected 404 since todo should be deleted"
     # Check categories
-    response = requests.get(f'{BASE_URL}/todos/{todo_id}/categories')
+    response = context.client.get(f'/todos/{todo_id}/categories')
     assert response.status_code == 404, "Expected 404 since todo should be deleted"
 
 @when('todo items with titles "{todo1}" "{todo2}" "{todo3}" exist and are associated to project')
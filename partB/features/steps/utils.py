@@ -1,118 +1,248 @@
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
-BASE_URL = 'http://localhost:4567'
-
-def reset_database_to_default():
-    # Delete all existing data
-    delete_all_todos()
-    delete_all_projects()
-    delete_all_categories()
-
-    # Re-create default data
-    # Create categories
-    office_category = create_category("Office")
-    home_category = create_category("Home")
-
-    # Create todos
-    paperwork_todo = create_todo("scan paperwork")
-    filework_todo = create_todo("file paperwork")
-
-    # Create project
-    office_work_project = create_project("Office Work")
+from partA.streaming import iter_json_items
 
-    # Associate todos with project
-    associate_todo_with_project(paperwork_todo['id'], office_work_project['id'])
-    associate_todo_with_project(filework_todo['id'], office_work_project['id'])
-
-    # Associate todo with category
-    associate_todo_with_category(paperwork_todo['id'], office_category['id'])
+BASE_URL = 'http://localhost:4567'
+COLLECTIONS = ('todos', 'projects', 'categories')
+RESET_WORKERS = 8
+
+class ApiClient:
+    """Keep-alive session for the API at ``base_url``; methods take paths like '/todos'."""
+
+    def __init__(self, base_url=BASE_URL, timeout=10, pool_size=RESET_WORKERS):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, f'{self.base_url}{path}', **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+# Shared by the helpers below; replaced by configure_client() in before_all
+client = ApiClient()
+
+def configure_client(base_url=BASE_URL, timeout=10):
+    global client
+    client.close()
+    client = ApiClient(base_url, timeout)
+    return client
+
+# Server state right after the last full reset, as {collection: {id: entity}}
+default_snapshot = {}
+
+# Todos seen in POST responses, by id and with the ids of each title, so lookups
+# don't list /todos; the reset's delete workers update them too
+todos_by_id = {}
+todo_ids_by_title = {}
+todos_lock = threading.Lock()
+
+def remember_todo(todo):
+    with todos_lock:
+        _forget_todo(todo.get('id'))
+        todos_by_id[todo.get('id')] = todo
+        todo_ids_by_title.setdefault(todo.get('title'), []).append(todo.get('id'))
+    return todo
+
+def forget_todo(todo_id):
+    with todos_lock:
+        _forget_todo(todo_id)
+
+def _forget_todo(todo_id):
+    todo = todos_by_id.pop(todo_id, None)
+    if todo is not None:
+        ids = todo_ids_by_title[todo.get('title')]
+        ids.remove(todo_id)
+        if not ids:
+            del todo_ids_by_title[todo.get('title')]
+
+def forget_all_todos():
+    with todos_lock:
+        todos_by_id.clear()
+        todo_ids_by_title.clear()
+
+def reset_database_to_default(restart_server=None, restart_threshold=200):
+    """Bring the server back to the default data and return how many objects were deleted.
+
+    Only objects created since the last reset are deleted when the defaults are
+    still intact; otherwise everything is rebuilt. If more than
+    ``restart_threshold`` objects leaked and ``restart_server`` is given, it is
+    called to get a fresh server instead of deleting them one by one; that
+    server starts with the default data, so nothing is recreated.
+    """
+    current = get_ids()
+    extras = [(kind, entity_id) for kind in COLLECTIONS for entity_id in current[kind]
+              if entity_id not in default_snapshot.get(kind, {})]
+
+    if restart_server is not None and len(extras) > restart_threshold:
+        restart_server()
+        forget_all_todos()
+        default_snapshot.clear()
+        default_snapshot.update(get_snapshot())
+        return len(extras)
+
+    if default_snapshot and all(entity_id in current[kind]
+                                for kind in COLLECTIONS for entity_id in default_snapshot[kind]):
+        delete_entities(extras)
+        if get_snapshot() == default_snapshot:
+            return len(extras)
+
+    # The defaults were modified or deleted, start from scratch
+    current = get_ids()
+    everything = [(kind, entity_id) for kind in COLLECTIONS for entity_id in current[kind]]
+    delete_entities(everything)
+    forget_all_todos()
+    create_default_data()
+    return len(everything)
+
+def create_default_data():
+    with ThreadPoolExecutor(max_workers=RESET_WORKERS) as executor:
+        # Create categories
+        office_category = executor.submit(create_category, "Office")
+        home_category = executor.submit(create_category, "Home")
+
+        # Create todos
+        paperwork_todo = executor.submit(create_todo, "scan paperwork")
+        filework_todo = executor.submit(create_todo, "file paperwork")
+
+        # Create project
+        office_work_project = executor.submit(create_project, "Office Work")
+
+        paperwork_id = paperwork_todo.result()['id']
+        project_id = office_work_project.result()['id']
+        links = [
+            # Associate todos with project
+            executor.submit(associate_todo_with_project, paperwork_id, project_id),
+            executor.submit(associate_todo_with_project, filework_todo.result()['id'], project_id),
+            # Associate todo with category
+            executor.submit(associate_todo_with_category, paperwork_id, office_category.result()['id']),
+        ]
+        home_category.result()
+        for link in links:
+            link.result()
+
+    default_snapshot.clear()
+    default_snapshot.update(get_snapshot())
+
+def get_snapshot():
+    return {
+        'todos': {todo['id']: todo for todo in get_all_todos()},
+        'projects': {project['id']: project for project in get_all_projects()},
+        'categories': {category['id']: category for category in get_all_categories()},
+    }
+
+def get_ids():
+    """Return ``{collection: set of ids}`` without keeping the entities themselves."""
+    return {kind: {entity['id'] for entity in iter_collection(kind)} for kind in COLLECTIONS}
+
+def delete_entities(entities):
+    def delete(entity):
+        kind, entity_id = entity
+        if kind == 'todos':
+            forget_todo(entity_id)
+        client.delete(f'/{kind}/{entity_id}')
+
+    with ThreadPoolExecutor(max_workers=RESET_WORKERS) as executor:
+        list(executor.map(delete, entities))
 
 def create_todo(title):
     payload = {'title': title}
-    response = requests.post(f'{BASE_URL}/todos', json=payload)
+    response = client.post('/todos', json=payload)
     response.raise_for_status()
-    return response.json()
+    return remember_todo(response.json())
 
 def create_project(title):
     payload = {'title': title}
-    response = requests.post(f'{BASE_URL}/projects', json=payload)
+    response = client.post('/projects', json=payload)
     response.raise_for_status()
     return response.json()
 
 def create_category(title):
     payload = {'title': title}
-    response = requests.post(f'{BASE_URL}/categories', json=payload)
+    response = client.post('/categories', json=payload)
     response.raise_for_status()
     return response.json()
 
 def associate_todo_with_project(todo_id, project_id):
     payload = {'id': project_id}
-    response = requests.post(f'{BASE_URL}/todos/{todo_id}/tasksof', json=payload)
+    response = client.post(f'/todos/{todo_id}/tasksof', json=payload)
     response.raise_for_status()
 
 def associate_todo_with_category(todo_id, category_id):
     payload = {'id': category_id}
-    response = requests.post(f'{BASE_URL}/todos/{todo_id}/categories', json=payload)
+    response = client.post(f'/todos/{todo_id}/categories', json=payload)
     response.raise_for_status()
 
+def iter_collection(kind, params=None):
+    """Return an iterator over the entities of ``/<kind>`` that parses the body as it arrives."""
+    response = client.get(f'/{kind}', params=params, stream=True)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    return iter_json_items(response, kind)
+
 def get_all_todos():
-    response = requests.get(f'{BASE_URL}/todos')
-    response.raise_for_status()
-    return response.json().get('todos', [])
+    return list(iter_collection('todos'))
 
 def get_all_projects():
-    response = requests.get(f'{BASE_URL}/projects')
-    response.raise_for_status()
-    return response.json().get('projects', [])
+    return list(iter_collection('projects'))
 
 def get_all_categories():
-    response = requests.get(f'{BASE_URL}/categories')
-    response.raise_for_status()
-    return response.json().get('categories', [])
+    return list(iter_collection('categories'))
 
 def get_todo_by_title(title):
-    response = requests.get(f'{BASE_URL}/todos')
+    # Only a title with a single known todo is answered from memory; the server picks among duplicates
+    with todos_lock:
+        ids = todo_ids_by_title.get(title, [])
+        if len(ids) == 1:
+            return todos_by_id[ids[0]]
+    response = client.get('/todos', params={'title': title})
     if response.status_code == 200:
         todos = response.json().get('todos', [])
-        for todo in todos:
-            if todo.get('title') == title:
-                return todo
+        return remember_todo(todos[0]) if todos else None
     return None
 
 def get_project_by_title(title):
-    response = requests.get(f'{BASE_URL}/projects', params={'title': title})
+    response = client.get('/projects', params={'title': title})
     if response.status_code == 200:
         projects = response.json().get('projects', [])
         return projects[0] if projects else None
     return None
 
 def get_category_by_title(title):
-    response = requests.get(f'{BASE_URL}/categories', params={'title': title})
+    response = client.get('/categories', params={'title': title})
     if response.status_code == 200:
         categories = response.json().get('categories', [])
         return categories[0] if categories else None
     return None
 
 def delete_all_todos():
-    response = requests.get(f'{BASE_URL}/todos')
-    if response.status_code == 200:
-        todos = response.json().get('todos', [])
-        for todo in todos:
-            todo_id = todo.get('id')
-            requests.delete(f'{BASE_URL}/todos/{todo_id}')
+    forget_all_todos()
+    delete_entities(('todos', todo['id']) for todo in iter_collection('todos'))
 
 def delete_all_projects():
-    response = requests.get(f'{BASE_URL}/projects')
-    if response.status_code == 200:
-        projects = response.json().get('projects', [])
-        for project in projects:
-            project_id = project.get('id')
-            requests.delete(f'{BASE_URL}/projects/{project_id}')
+    delete_entities(('projects', project['id']) for project in iter_collection('projects'))
 
 def delete_all_categories():
-    response = requests.get(f'{BASE_URL}/categories')
-    if response.status_code == 200:
-        categories = response.json().get('categories', [])
-        for category in categories:
-            category_id = category.get('id')
-            requests.delete(f'{BASE_URL}/categories/{category_id}')
+    delete_entities(('categories', category['id']) for category in iter_collection('categories'))
@@ -0,0 +1,159 @@
+"""Run the behave features in parallel, one Todo Manager server per worker.
+
+Usage, from partB:
+
+    python run_parallel.py --workers 4 [--seed N] [--base-port 4600] [-- extra behave args]
+
+The feature files are shuffled with ``--seed`` and dealt round-robin to the
+workers, and each worker's behave shuffles its features and scenarios with
+the same seed, so a run's order can be reproduced. Each worker starts its own runTodoManagerRestAPI jar on a distinct
+port and runs behave against it with ``-D base_url=...``, so features never
+share server state. With ``--stub`` each behave process serves the API
+itself from partA's stand-in server instead, so no Java is needed. The JSON
+reports of all workers are merged into merged.json in ``--report-dir``,
+partB/reports by default, which git ignores.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from partA.server import TodoServer
+
+JAR_PATH = os.path.join(HERE, "runTodoManagerRestAPI-1.5.5.jar")
+REPORT_DIR = os.path.join(HERE, "reports")
+
+
+def run_shard(worker_id, features, port, jar_path, behave_args, stub=False, report_dir=REPORT_DIR, seed=None):
+    """Start a server on ``port``, run ``features`` against it and return a summary.
+
+    ``seed`` fixes the order behave runs the features and their scenarios in.
+    A server that fails to start is reported as a failed shard.
+    """
+    report = os.path.join(report_dir, f"worker-{worker_id}.json")
+    # A shard that never runs behave must not be merged with a previous run's report
+    if os.path.exists(report):
+        os.remove(report)
+    server = TodoServer(jar_path, port=port)
+    server_args = ["-D", f"base_url={server.base_url}"]
+    if stub:
+        server_args = ["-D", "stub=true", "-D", f"server_port={port}"]
+    if seed is not None:
+        server_args += ["-D", f"shuffle_seed={seed}"]
+    start = time.time()
+    startup = 0.0
+    process = None
+    try:
+        if not stub:
+            server.start()
+        startup = time.time() - start
+        process = subprocess.run(
+            [sys.executable, "-m", "behave", *server_args,
+             "-f", "json", "-o", report, "-f", "progress", *behave_args, *features],
+            cwd=HERE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        output = process.stdout
+    except Exception as e:
+        output = f"Worker {worker_id} failed: {e}"
+    finally:
+        server.stop()
+    return {
+        "worker": worker_id,
+        "port": port,
+        "features": features,
+        "returncode": process.returncode if process is not None else 1,
+        "startup": startup,
+        "duration": time.time() - start,
+        "report": report,
+        "output": output,
+    }
+
+
+def load_report(path):
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def count_statuses(features):
+    counts = {"features": {}, "scenarios": {}}
+    for feature in features:
+        status = feature.get("status", "untested")
+        counts["features"][status] = counts["features"].get(status, 0) + 1
+        for element in feature.get("elements", []):
+            if element.get("type") == "background":
+                continue
+            status = element.get("status", "untested")
+            counts["scenarios"][status] = counts["scenarios"].get(status, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the behave features in parallel")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, help="feature and scenario shuffle seed (random by default)")
+    parser.add_argument("--base-port", type=int, default=4600, help="worker N listens on base port + N")
+    parser.add_argument("--jar", default=JAR_PATH)
+    parser.add_argument("--stub", action="store_true", help="use the in-process stand-in server, not the jar")
+    parser.add_argument("--report-dir", default=REPORT_DIR, help="where the worker and merged JSON reports go")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each worker's output")
+    parser.add_argument("behave_args", nargs=argparse.REMAINDER, help="extra arguments after --")
+    args = parser.parse_args()
+    behave_args = args.behave_args[1:] if args.behave_args[:1] == ["--"] else args.behave_args
+
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    features = sorted(glob.glob(os.path.join("features", "*.feature"), root_dir=HERE))
+    random.Random(seed).shuffle(features)
+    shards = [features[worker_id::args.workers] for worker_id in range(args.workers)]
+    shards = [shard for shard in shards if shard]
+    print(f"Running {len(features)} features on {len(shards)} servers (seed {seed})")
+
+    os.makedirs(args.report_dir, exist_ok=True)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        summaries = list(executor.map(
+            lambda shard: run_shard(
+                shard[0], shard[1], args.base_port + shard[0], args.jar, behave_args, args.stub,
+                args.report_dir, seed,
+            ),
+            enumerate(shards),
+        ))
+    duration = time.time() - start
+
+    merged = [feature for summary in summaries for feature in load_report(summary["report"])]
+    with open(os.path.join(args.report_dir, "merged.json"), "w") as f:
+        json.dump(merged, f, indent=2)
+
+    for summary in summaries:
+        print(
+            f"Worker {summary['worker']} (port {summary['port']}): {len(summary['features'])} features "
+            f"in {summary['duration']:.2f}s (server startup {summary['startup']:.2f}s), "
+            f"exit code {summary['returncode']}"
+        )
+        if args.verbose or summary["returncode"]:
+            print(summary["output"])
+
+    counts = count_statuses(merged)
+    for kind in ("features", "scenarios"):
+        print(f"{kind}: " + ", ".join(f"{n} {status}" for status, n in sorted(counts[kind].items())))
+    print(f"\nRan {len(features)} features in {duration:.2f}s on {len(shards)} servers")
+    print(f"Merged report: {os.path.join(args.report_dir, 'merged.json')}")
+    print(f"Shuffle seed: {seed} (reproduce with --seed {seed})")
+    return 1 if any(summary["returncode"] for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import itertools
+import json
+import os
+import numpy as np
+
+from partC.results import iter_operations
+
+ENTITIES = ("todo", "project", "category")
+NUMERIC_FIELDS = (
+    "count", "duration", "service_time", "start", "end", "concurrency",
+    "cpu", "mem", "threads", "heap_used", "heap_committed", "gc_count", "gc_time",
+    "response_bytes", "fanout",
+)
+
+
+class OperationTable:
+    """Operation records held as NumPy columns.
+
+    Numeric fields are float arrays with NaN where a record has no value.
+    ``type`` and ``entity`` are integer codes into ``types`` and ENTITIES, so
+    grouping by (entity, type) is a single integer key per row. Records
+    written before operations carried an ``entity`` get one inferred from
+    their order: those sequences alternate todo and project within each type.
+    """
+
+    def __init__(self, columns, types, type_codes, entity_codes):
+        self.columns = columns
+        self.types = types
+        self.type_codes = type_codes
+        self.entity_codes = entity_codes
+
+    @classmethod
+    def from_records(cls, records, chunk_size=100000):
+        """Build a table from operation dicts, converting ``chunk_size`` records at a time."""
+        chunks = {name: [] for name in NUMERIC_FIELDS}
+        types = []
+        entities = []
+        records = iter(records)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            for name, column in chunks.items():
+                column.append(np.array([record.get(name) for record in chunk], dtype=float))
+            types.extend(record["type"] for record in chunk)
+            entities.extend(record.get("entity") for record in chunk)
+
+        columns = {
+            name: np.concatenate(column) if column else np.zeros(0)
+            for name, column in chunks.items()
+        }
+        seen = {}
+        type_codes = np.array([seen.setdefault(t, len(seen)) for t in types], dtype=np.int64)
+        type_names = sorted(seen)
+        remap = np.array([type_names.index(t) for t in seen], dtype=np.int64)
+        entity_index = {entity: code for code, entity in enumerate(ENTITIES)}
+        entity_codes = np.array([entity_index.get(e, -1) for e in entities], dtype=np.int64)
+        table = cls(columns, type_names, remap[type_codes] if len(remap) else type_codes, entity_codes)
+        table._infer_entities()
+        return table
+
+    @classmethod
+    def load(cls, path, cache=True):
+        """Load a streamed ``.jsonl`` file, a ``performance_results.json`` dump or a saved ``.npz``.
+
+        With ``cache``, a ``.jsonl`` file is converted once and saved as
+        ``<path>.npz``, which is reused until the ``.jsonl`` file changes.
+        """
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                # Tables saved before a field was added have no column for it
+                columns = {
+                    name: data[name] if name in data else np.full(len(data["type_codes"]), np.nan)
+                    for name in NUMERIC_FIELDS
+                }
+                return cls(columns, [str(t) for t in data["types"]], data["type_codes"], data["entity_codes"])
+        if not path.endswith(".jsonl"):
+            with open(path) as f:
+                return cls.from_records(json.load(f).get("operations") or [])
+
+        cached = f"{path}.npz"
+        if cache and os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+            return cls.load(cached)
+        table = cls.from_records(iter_operations(path))
+        if cache:
+            table.save(cached)
+        return table
+
+    def save(self, path):
+        np.savez(
+            path,
+            types=np.array(self.types, dtype=str),
+            type_codes=self.type_codes,
+            entity_codes=self.entity_codes,
+            **self.columns,
+        )
+
+    def _infer_entities(self):
+        for code in range(len(self.types)):
+            missing = np.flatnonzero((self.entity_codes < 0) & (self.type_codes == code))
+            self.entity_codes[missing] = np.arange(len(missing)) % 2
+
+    def __len__(self):
+        return len(self.type_codes)
+
+    def _group_codes(self):
+        return self.entity_codes * len(self.types) + self.type_codes
+
+    def _group_key(self, code):
+        return ENTITIES[code // len(self.types)], self.types[code % len(self.types)]
+
+    def has_values(self, metric):
+        return bool(np.any(~np.isnan(self.columns[metric])))
+
+    def points(self, metric, entity, op_type, limit=None, seed=0):
+        """Return ``(count, metric)`` arrays of one group, randomly thinned to ``limit`` points."""
+        mask = (
+            (self.entity_codes == ENTITIES.index(entity))
+            & (self.type_codes == self.types.index(op_type))
+            & ~np.isnan(self.columns[metric])
+        )
+        rows = np.flatnonzero(mask)
+        if limit is not None and len(rows) > limit:
+            rows = np.sort(np.random.default_rng(seed).choice(rows, limit, replace=False))
+        return self.columns["count"][rows], self.columns[metric][rows]
+
+    def binned(self, metric, bins=50, percentiles=(10, 50, 90)):
+        """Aggregate ``metric`` over object-count bins for every (entity, type) group.
+
+        Returns ``{(entity, type): {"count", "n", "mean", "p10", ...}}`` with
+        one array entry per non-empty bin; ``count`` is the mean object count
+        of the rows in the bin and percentiles are nearest-rank.
+        """
+        values = self.columns[metric]
+        counts = self.columns["count"]
+        valid = ~np.isnan(values) & ~np.isnan(counts)
+        if not valid.any():
+            return {}
+        edges = np.linspace(counts[valid].min(), counts[valid].max(), bins + 1)
+        bin_index = np.digitize(counts, edges[1:-1])
+
+        key = (self._group_codes() * bins + bin_index)[valid]
+        values, counts = values[valid], counts[valid]
+        order = np.lexsort((values, key))
+        key, values, counts = key[order], values[order], counts[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        sizes = np.diff(np.r_[starts, len(key)])
+
+        stats = {
+            "count": np.add.reduceat(counts, starts) / sizes,
+            "n": sizes,
+            "mean": np.add.reduceat(values, starts) / sizes,
+        }
+        for q in percentiles:
+            stats[f"p{q}"] = values[starts + np.floor((sizes - 1) * q / 100).astype(np.int64)]
+
+        groups = key[starts] // bins
+        return {
+            self._group_key(code): {name: column[groups == code] for name, column in stats.items()}
+            for code in np.unique(groups)
+        }
+
+    def fit(self, metric, degree=2):
+        """Least-squares polynomial of ``metric`` against object count per (entity, type)."""
+        values = self.columns[metric]
+        counts = self.columns["count"]
+        valid = ~np.isnan(values) & ~np.isnan(counts)
+        groups = self._group_codes()
+        fits = {}
+        for code in np.unique(groups[valid]):
+            mask = valid & (groups == code)
+            if np.unique(counts[mask]).size > degree:
+                fits[self._group_key(code)] = np.poly1d(np.polyfit(counts[mask], values[mask], degree))
+        return fits
+
+    def summary(self, metric, percentiles=(50, 90, 99)):
+        """Overall ``n``, mean and percentiles of ``metric`` per (entity, type)."""
+        values = self.columns[metric]
+        groups = self._group_codes()
+        summary = {}
+        for code in np.unique(groups):
+            group_values = values[(groups == code) & ~np.isnan(values)]
+            if not group_values.size:
+                continue
+            stats = {"n": int(group_values.size), "mean": float(group_values.mean())}
+            for q, value in zip(percentiles, np.percentile(group_values, percentiles)):
+                stats[f"p{q}"] = float(value)
+            summary[self._group_key(code)] = stats
+        return summary
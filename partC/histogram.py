@@ -0,0 +1,156 @@
+import math
+import numpy as np
+
+PERCENTILES = {"p50": 50, "p90": 90, "p99": 99, "p999": 99.9}
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory.
+
+    Values between ``lowest`` and ``highest`` seconds are counted in buckets
+    whose width grows geometrically by ``ratio``, so every reported percentile
+    is within ``ratio - 1`` relative error. Histograms with the same layout can
+    be merged by adding their counts.
+    """
+
+    def __init__(self, lowest=1e-6, highest=1e3, ratio=1.02):
+        self.lowest = lowest
+        self.highest = highest
+        self.ratio = ratio
+        self._log_ratio = math.log(ratio)
+        self.counts = np.zeros(self._index(highest) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value):
+        if value <= self.lowest:
+            return 0
+        return int(math.log(value / self.lowest) / self._log_ratio)
+
+    def _same_layout(self, other):
+        return (self.lowest, self.highest, self.ratio) == (other.lowest, other.highest, other.ratio)
+
+    def record(self, value):
+        value = float(value)
+        index = min(self._index(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if not self._same_layout(other):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        value = self.lowest * self.ratio ** (index + 0.5)
+        return min(max(value, self.min), self.max)
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        summary = {"count": self.count, "mean": self.total / self.count}
+        for name, q in PERCENTILES.items():
+            summary[name] = self.percentile(q)
+        summary["max"] = self.max
+        return summary
+
+    def to_dict(self):
+        indexes = np.flatnonzero(self.counts)
+        return {
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "ratio": self.ratio,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(i): int(self.counts[i]) for i in indexes},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["lowest"], data["highest"], data["ratio"])
+        for index, count in data["buckets"].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+class HistogramSet:
+    """Latency histograms per key, e.g. an operation type, overall and per object-count bucket."""
+
+    def __init__(self, bucket_size=100):
+        self.bucket_size = bucket_size
+        self.overall = {}
+        self.by_count = {}
+
+    def bucket_start(self, count):
+        return (max(count, 1) - 1) // self.bucket_size * self.bucket_size + 1
+
+    def bucket_label(self, start):
+        return f"{start}-{start + self.bucket_size - 1}"
+
+    def record(self, op_type, count, value):
+        self.overall.setdefault(op_type, LatencyHistogram()).record(value)
+        key = (op_type, self.bucket_start(count))
+        self.by_count.setdefault(key, LatencyHistogram()).record(value)
+
+    def merge(self, other):
+        if self.bucket_size != other.bucket_size:
+            raise ValueError("Cannot merge histogram sets with different bucket sizes")
+        for op_type, histogram in other.overall.items():
+            self.overall.setdefault(op_type, LatencyHistogram()).merge(histogram)
+        for key, histogram in other.by_count.items():
+            self.by_count.setdefault(key, LatencyHistogram()).merge(histogram)
+        return self
+
+    def summary(self):
+        summary = {}
+        for op_type, histogram in self.overall.items():
+            buckets = sorted(start for (kind, start) in self.by_count if kind == op_type)
+            summary[op_type] = {
+                "all": histogram.summary(),
+                "by_count": {
+                    self.bucket_label(start): self.by_count[(op_type, start)].summary()
+                    for start in buckets
+                },
+            }
+        return summary
+
+    def to_dict(self):
+        return {
+            "bucket_size": self.bucket_size,
+            "overall": {op_type: h.to_dict() for op_type, h in self.overall.items()},
+            "by_count": [
+                {"type": op_type, "start": start, "histogram": h.to_dict()}
+                for (op_type, start), h in sorted(self.by_count.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histograms = cls(data["bucket_size"])
+        for op_type, h in data["overall"].items():
+            histograms.overall[op_type] = LatencyHistogram.from_dict(h)
+        for entry in data["by_count"]:
+            histograms.by_count[(entry["type"], entry["start"])] = LatencyHistogram.from_dict(
+                entry["histogram"]
+            )
+        return histograms
@@ -0,0 +1,253 @@
+import subprocess
+import threading
+import time
+import numpy as np
+import psutil
+
+# jstat -gc capacity/usage columns (KB) that make up the Java heap
+HEAP_CAPACITY_COLUMNS = ("S0C", "S1C", "EC", "OC")
+HEAP_USED_COLUMNS = ("S0U", "S1U", "EU", "OU")
+GC_COUNT_COLUMNS = ("YGC", "FGC", "CGC")
+
+
+class ResourceMonitor(threading.Thread):
+    """Samples CPU time and RSS of a process tree from one background thread.
+
+    Samples go into preallocated ring buffers of ``capacity`` entries, so the
+    cost per sample and the memory used stay constant over a run. Operations
+    are attributed, during or after the run, with ``attribute(starts, ends)``,
+    which interpolates the cumulative CPU time at the window edges;
+    operations shorter than ``sample_interval`` still get their share of CPU.
+    The list of child processes is refreshed every ``children_refresh``
+    seconds rather than on every sample.
+    """
+
+    def __init__(self, pid, sample_interval=0.05, capacity=1 << 17, children_refresh=2.0):
+        super().__init__(daemon=True)
+        self.root = psutil.Process(pid)
+        self.sample_interval = sample_interval
+        self.capacity = capacity
+        self.children_refresh = children_refresh
+        self.times = np.zeros(capacity)
+        self.cpu = np.zeros(capacity)  # cumulative CPU seconds of the tree since the first sample
+        self.rss = np.zeros(capacity)  # MB
+        self.threads = np.zeros(capacity)
+        self.samples = 0
+        self._processes = []
+        self._refreshed_at = -np.inf
+        self._cpu_seen = {}
+        self._cpu_total = 0.0
+        self._stopped = threading.Event()
+        # Guards the buffers, so readers never see a sample half-written
+        self._lock = threading.Lock()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.sample()
+            self._stopped.wait(self.sample_interval)
+
+    def stop(self):
+        """Stop sampling after one final sample, so windows ending now are covered."""
+        self._stopped.set()
+        self.join()
+        self.sample()
+
+    def _refresh_processes(self, now):
+        try:
+            self._processes = [self.root] + self.root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            self._processes = []
+        self._refreshed_at = now
+
+    def sample(self):
+        now = time.time()
+        if now - self._refreshed_at >= self.children_refresh:
+            self._refresh_processes(now)
+
+        rss = 0
+        threads = 0
+        for proc in self._processes:
+            try:
+                with proc.oneshot():
+                    cpu_times = proc.cpu_times()
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            # Sum per-process deltas so the total keeps growing when a child exits
+            used = cpu_times.user + cpu_times.system
+            self._cpu_total += max(0.0, used - self._cpu_seen.get(proc.pid, used))
+            self._cpu_seen[proc.pid] = used
+
+        with self._lock:
+            index = self.samples % self.capacity
+            self.times[index] = now
+            self.cpu[index] = self._cpu_total
+            self.rss[index] = rss / (1024 * 1024)
+            self.threads[index] = threads
+            self.samples += 1
+
+    def covered_until(self):
+        """Time of the latest sample; windows ending before it can be attributed."""
+        with self._lock:
+            if not self.samples:
+                return -np.inf
+            return self.times[(self.samples - 1) % self.capacity]
+
+    def series(self):
+        """Return copies of ``(times, cpu, rss, threads)`` of the samples in the buffer, oldest first."""
+        with self._lock:
+            order = ring_order(self.samples, self.capacity)
+            return self.times[order], self.cpu[order], self.rss[order], self.threads[order]
+
+    def attribute(self, starts, ends):
+        """Return ``{"cpu", "mem", "threads"}`` arrays for the ``[start, end]`` windows.
+
+        ``cpu`` is the % of all cores used, ``mem`` the RSS in MB and
+        ``threads`` the thread count of the process tree. Windows not covered
+        by the samples in the buffer get NaN. It works on a ``series()``
+        snapshot, so it can be called while sampling goes on.
+        """
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        times, cpu, rss, threads = self.series()
+        if len(times) < 2:
+            return {name: np.full(len(starts), np.nan) for name in ("cpu", "mem", "threads")}
+
+        cpu_seconds = np.interp(ends, times, cpu) - np.interp(starts, times, cpu)
+        elapsed = np.maximum(ends - starts, 1e-9)
+        middle = (starts + ends) / 2
+        covered = (starts >= times[0]) & (ends <= times[-1])
+        return {
+            "cpu": np.where(covered, cpu_seconds / elapsed * 100 / psutil.cpu_count(), np.nan),
+            "mem": np.where(covered, np.interp(middle, times, rss), np.nan),
+            "threads": np.where(covered, np.interp(middle, times, threads), np.nan),
+        }
+
+
+class JvmMonitor(threading.Thread):
+    """Streams heap and GC statistics of a JVM from ``jstat -gc -t``.
+
+    Samples are stored in ring buffers like ResourceMonitor's, timestamped
+    with the JVM's own uptime plus its start time, so output buffering in
+    jstat does not skew them. If jstat is not on the PATH or cannot attach,
+    ``available`` is False and every attributed value is NaN.
+    """
+
+    COLUMNS = ("heap_used", "heap_committed", "gc_count", "gc_time")
+
+    def __init__(self, pid, sample_interval=0.25, capacity=1 << 16):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.sample_interval = sample_interval
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.values = {name: np.zeros(capacity) for name in self.COLUMNS}
+        self.samples = 0
+        self.available = False
+        self._jvm_start = psutil.Process(pid).create_time()
+        self._process = None
+        self._first_sample = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self):
+        interval_ms = max(1, int(self.sample_interval * 1000))
+        try:
+            self._process = subprocess.Popen(
+                ["jstat", "-gc", "-t", str(self.pid), str(interval_ms)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except FileNotFoundError:
+            print("jstat not found, JVM heap and GC metrics will not be collected")
+            self._first_sample.set()
+            return
+
+        header = None
+        for line in self._process.stdout:
+            fields = line.split()
+            if not fields:
+                continue
+            if fields[0] == "Timestamp":
+                header = fields
+                continue
+            if header is None or len(fields) != len(header):
+                continue
+            self._record(dict(zip(header, (parse_jstat_value(field) for field in fields))))
+            self._first_sample.set()
+        self._first_sample.set()
+
+    def wait_until_ready(self, timeout=5):
+        """Block until jstat reported its first sample, failed, or ``timeout`` passed."""
+        return self._first_sample.wait(timeout)
+
+    def _record(self, row):
+        with self._lock:
+            index = self.samples % self.capacity
+            self.times[index] = self._jvm_start + row["Timestamp"]
+            self.values["heap_used"][index] = sum(row.get(c, 0.0) for c in HEAP_USED_COLUMNS) / 1024
+            self.values["heap_committed"][index] = sum(row.get(c, 0.0) for c in HEAP_CAPACITY_COLUMNS) / 1024
+            self.values["gc_count"][index] = sum(row.get(c, 0.0) for c in GC_COUNT_COLUMNS)
+            self.values["gc_time"][index] = row.get("GCT", 0.0)
+            self.samples += 1
+            self.available = True
+
+    def stop(self):
+        """Stop jstat once it has reported a sample covering the current time."""
+        if self._process is not None and self._process.poll() is None:
+            if self.available:
+                time.sleep(self.sample_interval * 1.5)
+            self._process.terminate()
+            self._process.wait()
+        self.join()
+
+    def covered_until(self):
+        """Time of the latest jstat sample, or infinity if jstat is unavailable."""
+        with self._lock:
+            if not self.available:
+                return np.inf if self._first_sample.is_set() else -np.inf
+            return self.times[(self.samples - 1) % self.capacity]
+
+    def series(self):
+        """Return copies of ``(times, {column: values})`` of the samples in the buffer, oldest first."""
+        with self._lock:
+            order = ring_order(self.samples, self.capacity)
+            return self.times[order], {name: values[order] for name, values in self.values.items()}
+
+    def attribute(self, starts, ends):
+        """Return heap and GC arrays for the ``[start, end]`` windows.
+
+        ``heap_used`` and ``heap_committed`` (MB) are interpolated at the middle
+        of each window; ``gc_count`` and ``gc_time`` (seconds) are the expected
+        number of collections and pause time within it, interpolated from the
+        cumulative counters. Like ResourceMonitor.attribute it works on a
+        ``series()`` snapshot.
+        """
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        times, series = self.series()
+        if len(times) < 2:
+            return {name: np.full(len(starts), np.nan) for name in self.COLUMNS}
+
+        middle = (starts + ends) / 2
+        covered = (starts >= times[0]) & (ends <= times[-1])
+        attributed = {}
+        for name in ("heap_used", "heap_committed"):
+            attributed[name] = np.interp(middle, times, series[name])
+        for name in ("gc_count", "gc_time"):
+            values = series[name]
+            attributed[name] = np.interp(ends, times, values) - np.interp(starts, times, values)
+        return {name: np.where(covered, values, np.nan) for name, values in attributed.items()}
+
+
+def ring_order(samples, capacity):
+    """Indexes of the samples still in a ring buffer, oldest first."""
+    kept = min(samples, capacity)
+    return np.arange(samples - kept, samples) % capacity
+
+
+def parse_jstat_value(field):
+    if field == "-":
+        return 0.0
+    return float(field.replace(",", "."))
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+import threading
+import time
+
+
+class OperationQueue:
+    """Holds operations back until the monitors have samples covering them.
+
+    Covered operations get their resource fields attributed and are passed
+    on in order, with any records queued after them, to ``_emit``. That
+    happens at most every ``flush_interval`` seconds, while the samples are
+    still in the monitors' ring buffers.
+    """
+
+    def __init__(self, flush_interval=1.0):
+        self.flush_interval = flush_interval
+        self.monitors = []
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def _queue(self, record):
+        with self._lock:
+            self._pending.append(record)
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.drain()
+
+    def drain(self, final=False):
+        """Pass on the pending records whose operations the monitors have covered.
+
+        With ``final`` every pending record is passed on; resource fields the
+        monitors could not cover are None.
+        """
+        with self._lock:
+            covered_until = math.inf if final else min(
+                (monitor.covered_until() for monitor in self.monitors), default=math.inf
+            )
+            ready = len(self._pending)
+            for i, record in enumerate(self._pending):
+                if _is_operation(record) and record["end"] > covered_until:
+                    ready = i
+                    break
+            records, self._pending = self._pending[:ready], self._pending[ready:]
+            operations = [record for record in records if _is_operation(record)]
+            if operations:
+                attribute(operations, self.monitors)
+            self._emit(records)
+            self._flushed_at = time.monotonic()
+
+    def _emit(self, records):
+        raise NotImplementedError
+
+
+def _is_operation(record):
+    return record.get("kind", "operation") == "operation"
+
+
+class ResultsWriter(OperationQueue):
+    """Append-only JSON Lines log of a performance run.
+
+    Every line is one record with a ``kind``: ``run`` (the parameters, once
+    per start or resume), ``operation``, ``checkpoint`` and ``summary``.
+    Operations are written once the monitors cover them (see
+    OperationQueue), in order together with the checkpoints that follow
+    them. The file is flushed every ``flush_interval`` seconds, so a crash
+    loses at most that much of the run.
+    """
+
+    def __init__(self, path, append=False, flush_interval=1.0):
+        super().__init__(flush_interval)
+        self.path = path
+        self._file = open(path, "a" if append else "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+
+    def add_operation(self, operation):
+        self._queue({"kind": "operation", **operation})
+
+    def checkpoint(self, phase, iteration):
+        """Mark ``iteration`` of ``phase`` complete once everything before it is written."""
+        self._queue({"kind": "checkpoint", "phase": phase, "iteration": iteration})
+
+    def _emit(self, records):
+        for record in records:
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self.drain(final=True)
+        self._file.close()
+
+
+class OperationList(OperationQueue):
+    """In-memory counterpart of ResultsWriter for runs without a results file.
+
+    ``operations`` holds the operations that were attributed so far, in
+    order; ``drain(final=True)`` at the end of the run adds the rest.
+    """
+
+    def __init__(self, flush_interval=1.0):
+        super().__init__(flush_interval)
+        self.operations = []
+
+    def add_operation(self, operation):
+        self._queue(operation)
+
+    def _emit(self, records):
+        self.operations.extend(records)
+
+
+def attribute(operations, monitors):
+    """Fill in the monitors' resource fields of ``operations``; uncovered values become None."""
+    starts = [op["start"] for op in operations]
+    ends = [op["end"] for op in operations]
+    for monitor in monitors:
+        for name, values in monitor.attribute(starts, ends).items():
+            for operation, value in zip(operations, values):
+                operation[name] = None if math.isnan(value) else float(value)
+
+
+def read_records(path, kind=None):
+    """Yield the records of a results file one at a time, optionally only of ``kind``.
+
+    A truncated last line, as left by a crash mid-write, is skipped.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if kind is None or record.get("kind") == kind:
+                yield record
+
+
+def iter_operations(path):
+    return read_records(path, "operation")
+
+
+def run_parameters(path):
+    """Return the ``run`` record that started the run in ``path``, or None."""
+    return next(read_records(path, "run"), None)
+
+
+def is_complete(path):
+    return any(True for _ in read_records(path, "summary"))
+
+
+def resume_point(path):
+    """Cut ``path`` back to its last checkpoint and return that checkpoint.
+
+    Operations logged after the checkpoint belong to an iteration that did
+    not finish; they are dropped so the resumed run does not log them twice.
+    Returns None, leaving the file untouched, if there is no checkpoint.
+    """
+    if not os.path.exists(path):
+        return None
+    checkpoint, end = None, 0
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            offset += len(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("kind") == "checkpoint":
+                checkpoint, end = record, offset
+    if checkpoint is not None:
+        with open(path, "r+b") as f:
+            f.truncate(end)
+    return checkpoint
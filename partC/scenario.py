@@ -0,0 +1,487 @@
+"""Declarative benchmark scenarios built from the partB step vocabulary.
+
+A scenario is a JSON file such as ``partC/scenarios/read_heavy.json``:
+
+    {
+      "name": "read-heavy",
+      "seed": {"todos": 500, "projects": 50, "categories": 10,
+               "fanout": {"todo_project": 2, "todo_category": 1}},
+      "operations": 5000,
+      "concurrency": 4,
+      "random_seed": 1,
+      "mix": {
+        "get_todo": 40,
+        "find_todo_by_title": 10,
+        "create_todo": {"weight": 5, "fanout": {"todo_project": 1}},
+        "delete_todo": 5
+      }
+    }
+
+``seed`` is the graph created before measuring; ``fanout`` gives the number
+of random targets each source is linked to, keyed like ``util.RELATIONSHIPS``.
+``mix`` maps operation names from OPERATIONS to a weight, or to a dict with a
+``weight`` and the operation's parameters. The runner draws ``operations``
+names from the weights and runs them on ``concurrency`` threads; see
+perform_scenario_sequence in script.py (``script.py --scenario FILE``).
+"""
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from partA import async_util, util
+
+SEED_WORKERS = 16
+COLLECTIONS = {"todo": "todos", "project": "projects", "category": "categories"}
+
+
+class IdPool:
+    """Ids of the live objects of one kind, with O(1) random pick and removal."""
+
+    def __init__(self):
+        self.ids = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, entity_id):
+        self._index[entity_id] = len(self.ids)
+        self.ids.append(entity_id)
+
+    def remove(self, entity_id):
+        index = self._index.pop(entity_id)
+        last = self.ids.pop()
+        if index < len(self.ids):
+            self.ids[index] = last
+            self._index[last] = index
+
+    def pick(self, rng):
+        return rng.choice(self.ids) if self.ids else None
+
+    def sort(self):
+        """Put the ids in numeric order, whatever order they were added in."""
+        self.ids.sort(key=lambda entity_id: (len(str(entity_id)), str(entity_id)))
+        self._index = {entity_id: index for index, entity_id in enumerate(self.ids)}
+
+
+class Workload:
+    """The live objects of a scenario run and the operations that act on them.
+
+    Every operation returns True if all its requests succeeded. Objects are
+    removed from their pool before they are deleted, so concurrent operations
+    rarely pick an object that is going away; when they do, the request fails
+    and the operation counts as an error rather than stopping the run.
+    """
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.pools = {entity: IdPool() for entity in COLLECTIONS}
+        self.titles = {}
+        self._created = 0
+        # First exception raised by each operation, for the run's report
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._random_seed = scenario.get("random_seed")
+        self._rng = random.Random(self._random_seed)
+        # The generator of the seed or operation running on each thread, see _use_stream
+        self._local = threading.local()
+
+    def count(self, entity):
+        return len(self.pools[entity])
+
+    def _use_stream(self, stream):
+        """Draw this thread's random choices from a generator of their own for ``stream``.
+
+        With a ``random_seed`` the generator is derived from it and
+        ``stream``, e.g. the operation's index in the schedule, so the choices
+        do not depend on which thread runs it or on what ran before. Without
+        one, or with a None ``stream``, the workload's shared generator is used.
+        """
+        use_own = stream is not None and self._random_seed is not None
+        self._local.rng = random.Random(f"{self._random_seed}-{stream}") if use_own else None
+
+    def _random(self):
+        return getattr(self._local, "rng", None) or self._rng
+
+    def _pick(self, entity, take=False):
+        with self._lock:
+            pool = self.pools[entity]
+            entity_id = pool.pick(self._random())
+            if take and entity_id is not None:
+                pool.remove(entity_id)
+                if entity == "todo":
+                    self.titles.pop(entity_id, None)
+            return entity_id
+
+    def _sample(self, entity, n):
+        with self._lock:
+            ids = self.pools[entity].ids
+            return self._random().sample(ids, min(n, len(ids)))
+
+    def _title(self, entity):
+        with self._lock:
+            self._created += 1
+            return f"{entity} {self._created}"
+
+    def _add(self, entity, entity_id, title=None):
+        with self._lock:
+            self.pools[entity].add(entity_id)
+            if title is not None:
+                self.titles[entity_id] = title
+
+    def _link(self, relationship, source, targets):
+        path = util.RELATIONSHIPS[relationship].format(source)
+        return all(
+            util.session.post(f"{util.BASE_URL}/{path}", json={"id": target}).status_code == 201
+            for target in targets
+        )
+
+    def seed(self, use_async=False):
+        """Create the ``seed`` objects and link them with the seed fan-out.
+
+        With ``use_async`` the requests are sent by an async_util.AsyncClient
+        rather than SEED_WORKERS threads. The pools are sorted before the
+        links are drawn, so with a ``random_seed`` the same graph is built and
+        the operations start from the same pools whichever thread created
+        which object.
+        """
+        seed = self.scenario.get("seed", {})
+        self._use_stream("seed")
+        if use_async:
+            async_util.run(lambda client: self._seed_async(client, seed))
+            return
+
+        creators = {"todo": self._seed_todo, "project": self._seed_project, "category": self._seed_category}
+        with ThreadPoolExecutor(max_workers=SEED_WORKERS) as executor:
+            for entity, collection in COLLECTIONS.items():
+                list(executor.map(lambda _: creators[entity](), range(seed.get(collection, 0))))
+        self._sort_pools()
+        for relationship, pairs in self._seed_links(seed):
+            self._check_seed_links(relationship, util.link_bulk(pairs, relationship, SEED_WORKERS))
+
+    async def _seed_async(self, client, seed):
+        creators = {"todo": client.create_todo, "project": client.create_project, "category": client.create_category}
+        for entity, collection in COLLECTIONS.items():
+            titles = [self._title(entity) for _ in range(seed.get(collection, 0))]
+            ids = await client.map(lambda title: creators[entity](title=title), titles)
+            for entity_id, title in zip(ids, titles):
+                self._add(entity, entity_id, title if entity == "todo" else None)
+        self._sort_pools()
+        for relationship, pairs in self._seed_links(seed):
+            self._check_seed_links(relationship, await client.link_bulk(pairs, relationship))
+
+    def _seed_links(self, seed):
+        """Yield ``(relationship, pairs)`` for each seed fan-out."""
+        for relationship, fanout in seed.get("fanout", {}).items():
+            source, target = RELATIONSHIP_ENTITIES[relationship]
+            yield relationship, [
+                (source_id, target_id)
+                for source_id in list(self.pools[source].ids)
+                for target_id in self._sample(target, fanout)
+            ]
+
+    def _sort_pools(self):
+        with self._lock:
+            for pool in self.pools.values():
+                pool.sort()
+
+    @staticmethod
+    def _check_seed_links(relationship, failures):
+        if failures:
+            raise Exception(
+                f"Failed to seed {len(failures)} {relationship} links, e.g. {failures[0].source} with {failures[0].target}. {failures[0].error}"
+            )
+
+    def _seed_todo(self):
+        title = self._title("todo")
+        self._add("todo", util.create_todo(title=title), title)
+
+    def _seed_project(self):
+        self._add("project", util.create_project(title=self._title("project")))
+
+    def _seed_category(self):
+        self._add("category", util.create_category(title=self._title("category")))
+
+    def schedule(self):
+        """Return the operation names of the run, drawn from the mix weights."""
+        names = list(self.scenario["mix"])
+        weights = [operation_params(self.scenario["mix"][name])[0] for name in names]
+        rng = random.Random(self.scenario.get("random_seed"))
+        return rng.choices(names, weights, k=self.scenario["operations"])
+
+    def run(self, name, index=None):
+        """Run operation ``name`` with its mix parameters; returns ``(ok, entity)``.
+
+        ``index``, the operation's position in the schedule, seeds its random
+        choices (see _use_stream).
+        """
+        self._use_stream(None if index is None else f"operation-{index}")
+        entity, operation = OPERATIONS[name]
+        _, params = operation_params(self.scenario["mix"][name])
+        try:
+            return bool(operation(self, **params)), entity
+        except Exception as e:
+            self.errors.setdefault(name, str(e))
+            return False, entity
+
+    # Creating, as in 'a todo item with title "..." exists' and friends
+
+    def create_todo(self, fanout=None):
+        title = self._title("todo")
+        todo_id = util.create_todo(title=title)
+        self._add("todo", todo_id, title)
+        return self._fan_out(todo_id, fanout or {})
+
+    def create_project(self, fanout=None):
+        project_id = util.create_project(title=self._title("project"))
+        self._add("project", project_id)
+        return self._fan_out(project_id, fanout or {})
+
+    def create_category(self):
+        self._add("category", util.create_category(title=self._title("category")))
+        return True
+
+    def _fan_out(self, source_id, fanout):
+        ok = True
+        for relationship, n in fanout.items():
+            target = RELATIONSHIP_ENTITIES[relationship][1]
+            ok &= self._link(relationship, source_id, self._sample(target, n))
+        return ok
+
+    # Associating, as in 'I associate the project "..." with the todo item "..."'
+
+    def _associate(self, relationship, fanout=1):
+        source, target = RELATIONSHIP_ENTITIES[relationship]
+        source_id = self._pick(source)
+        return source_id is not None and self._link(relationship, source_id, self._sample(target, fanout))
+
+    def associate_todo_with_project(self, fanout=1):
+        return self._associate("todo_project", fanout)
+
+    def associate_todo_with_category(self, fanout=1):
+        return self._associate("todo_category", fanout)
+
+    def add_todo_to_project(self, fanout=1):
+        return self._associate("project_todo", fanout)
+
+    def add_category_to_project(self, fanout=1):
+        return self._associate("project_category", fanout)
+
+    # Replacing, as in 'I replace the todo "..." with "..." in the project'
+
+    def _replace(self, relationship):
+        source, target = RELATIONSHIP_ENTITIES[relationship]
+        source_id = self._pick(source)
+        new_id = self._pick(target)
+        if source_id is None or new_id is None:
+            return False
+        path = util.RELATIONSHIPS[relationship].format(source_id)
+        response = util.session.get(f"{util.BASE_URL}/{path}")
+        if response.status_code != 200:
+            return False
+        current = response.json().get(COLLECTIONS[target], [])
+        if current:
+            old_id = current[0]["id"]
+            if util.session.delete(f"{util.BASE_URL}/{path}/{old_id}").status_code != 200:
+                return False
+        return self._link(relationship, source_id, [new_id])
+
+    def replace_todo_in_project(self):
+        return self._replace("project_todo")
+
+    def replace_category_in_project(self):
+        return self._replace("project_category")
+
+    # Updating, as in 'I update the description of the todo item with title "..."'
+
+    def update_todo_description(self):
+        todo_id = self._pick("todo")
+        if todo_id is None:
+            return False
+        response = util.session.post(
+            f"{util.BASE_URL}/todos/{todo_id}", json={"description": f"updated {self._title('description')}"}
+        )
+        return response.status_code == 200
+
+    def update_project(self):
+        project_id = self._pick("project")
+        if project_id is None:
+            return False
+        response = util.session.put(
+            f"{util.BASE_URL}/projects/{project_id}",
+            json={"title": self._title("project"), "completed": False, "active": True, "description": "updated"},
+        )
+        return response.status_code == 200
+
+    # Reading, as in 'the project should contain the todo "..."'
+
+    def _get(self, path):
+        return util.session.get(f"{util.BASE_URL}/{path}").status_code == 200
+
+    def _get_one(self, entity, suffix=""):
+        entity_id = self._pick(entity)
+        return entity_id is not None and self._get(f"{COLLECTIONS[entity]}/{entity_id}{suffix}")
+
+    def get_todo(self):
+        return self._get_one("todo")
+
+    def get_project(self):
+        return self._get_one("project")
+
+    def get_project_tasks(self):
+        return self._get_one("project", "/tasks")
+
+    def get_project_categories(self):
+        return self._get_one("project", "/categories")
+
+    def get_todo_projects(self):
+        return self._get_one("todo", "/tasksof")
+
+    def get_todo_categories(self):
+        return self._get_one("todo", "/categories")
+
+    def list_todos(self):
+        return self._get("todos")
+
+    def list_projects(self):
+        return self._get("projects")
+
+    def list_categories(self):
+        return self._get("categories")
+
+    def find_todo_by_title(self):
+        todo_id = self._pick("todo")
+        if todo_id is None:
+            return False
+        response = util.session.get(f"{util.BASE_URL}/todos", params={"title": self.titles.get(todo_id)})
+        return response.status_code == 200
+
+    # Deleting, as in 'I delete the todo item with title "..."'
+
+    def _delete(self, entity):
+        entity_id = self._pick(entity, take=True)
+        if entity_id is None:
+            return False
+        return util.session.delete(f"{util.BASE_URL}/{COLLECTIONS[entity]}/{entity_id}").status_code == 200
+
+    def delete_todo(self):
+        return self._delete("todo")
+
+    def delete_project(self):
+        return self._delete("project")
+
+    def delete_category(self):
+        return self._delete("category")
+
+
+# util.RELATIONSHIPS key -> (source entity, target entity)
+RELATIONSHIP_ENTITIES = {
+    "todo_project": ("todo", "project"),
+    "project_todo": ("project", "todo"),
+    "todo_category": ("todo", "category"),
+    "project_category": ("project", "category"),
+}
+
+# Operation name -> (entity it is recorded under, Workload method)
+OPERATIONS = {
+    "create_todo": ("todo", Workload.create_todo),
+    "create_project": ("project", Workload.create_project),
+    "create_category": ("category", Workload.create_category),
+    "associate_todo_with_project": ("todo", Workload.associate_todo_with_project),
+    "associate_todo_with_category": ("todo", Workload.associate_todo_with_category),
+    "add_todo_to_project": ("project", Workload.add_todo_to_project),
+    "add_category_to_project": ("project", Workload.add_category_to_project),
+    "replace_todo_in_project": ("project", Workload.replace_todo_in_project),
+    "replace_category_in_project": ("project", Workload.replace_category_in_project),
+    "update_todo_description": ("todo", Workload.update_todo_description),
+    "update_project": ("project", Workload.update_project),
+    "get_todo": ("todo", Workload.get_todo),
+    "get_project": ("project", Workload.get_project),
+    "get_todo_projects": ("todo", Workload.get_todo_projects),
+    "get_todo_categories": ("todo", Workload.get_todo_categories),
+    "get_project_tasks": ("project", Workload.get_project_tasks),
+    "get_project_categories": ("project", Workload.get_project_categories),
+    "list_todos": ("todo", Workload.list_todos),
+    "list_projects": ("project", Workload.list_projects),
+    "list_categories": ("category", Workload.list_categories),
+    "find_todo_by_title": ("todo", Workload.find_todo_by_title),
+    "delete_todo": ("todo", Workload.delete_todo),
+    "delete_project": ("project", Workload.delete_project),
+    "delete_category": ("category", Workload.delete_category),
+}
+
+# Parameters each operation accepts besides ``weight``
+OPERATION_PARAMS = {
+    "create_todo": {"fanout"},
+    "create_project": {"fanout"},
+    "associate_todo_with_project": {"fanout"},
+    "associate_todo_with_category": {"fanout"},
+    "add_todo_to_project": {"fanout"},
+    "add_category_to_project": {"fanout"},
+}
+
+
+def operation_params(entry):
+    """Split a mix entry into ``(weight, params)``."""
+    if isinstance(entry, dict):
+        params = dict(entry)
+        return params.pop("weight", 1), params
+    return entry, {}
+
+
+def _check_fanout(fanout, where, sources):
+    if not isinstance(fanout, dict):
+        raise Exception(f"{where}: fanout must map relationships to link counts")
+    for relationship, n in fanout.items():
+        if relationship not in RELATIONSHIP_ENTITIES:
+            raise Exception(f"{where}: unknown relationship '{relationship}', expected one of {sorted(RELATIONSHIP_ENTITIES)}")
+        if RELATIONSHIP_ENTITIES[relationship][0] not in sources:
+            raise Exception(f"{where}: '{relationship}' does not start from a {' or '.join(sources)}")
+        if not isinstance(n, int) or n < 0:
+            raise Exception(f"{where}: fanout of '{relationship}' must be a non-negative integer")
+
+
+def validate_scenario(scenario):
+    """Raise an Exception describing the first problem with ``scenario``."""
+    name = scenario.get("name", "scenario")
+    mix = scenario.get("mix")
+    if not isinstance(mix, dict) or not mix:
+        raise Exception(f"{name}: 'mix' must map operation names to weights")
+    if not isinstance(scenario.get("operations"), int) or scenario["operations"] < 1:
+        raise Exception(f"{name}: 'operations' must be a positive integer")
+    if not isinstance(scenario.get("concurrency", 1), int) or scenario.get("concurrency", 1) < 1:
+        raise Exception(f"{name}: 'concurrency' must be a positive integer")
+
+    seed = scenario.get("seed", {})
+    for key, value in seed.items():
+        if key == "fanout":
+            _check_fanout(value, f"{name} seed", set(COLLECTIONS))
+        elif key not in COLLECTIONS.values():
+            raise Exception(f"{name}: unknown seed entry '{key}'")
+        elif not isinstance(value, int) or value < 0:
+            raise Exception(f"{name}: seed count of '{key}' must be a non-negative integer")
+
+    for operation, entry in mix.items():
+        if operation not in OPERATIONS:
+            raise Exception(f"{name}: unknown operation '{operation}', expected one of {sorted(OPERATIONS)}")
+        weight, params = operation_params(entry)
+        if not isinstance(weight, (int, float)) or weight <= 0:
+            raise Exception(f"{name}: weight of '{operation}' must be a positive number")
+        unknown = set(params) - OPERATION_PARAMS.get(operation, set())
+        if unknown:
+            raise Exception(f"{name}: '{operation}' does not take {', '.join(sorted(unknown))}")
+        if "fanout" in params:
+            fanout = params["fanout"]
+            if operation.startswith("create_"):
+                _check_fanout(fanout, f"{name} {operation}", {OPERATIONS[operation][0]})
+            elif not isinstance(fanout, int) or fanout < 1:
+                raise Exception(f"{name}: fanout of '{operation}' must be a positive integer")
+    return scenario
+
+
+def load_scenario(path):
+    with open(path) as f:
+        scenario = json.load(f)
+    scenario.setdefault("name", path)
+    return validate_scenario(scenario)
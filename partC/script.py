@@ -1,154 +1,351 @@
-import requests
 import time
-import psutil
 import threading
 import sys
 import os
 import json
 import matplotlib.pyplot as plt
-import subprocess
+import argparse
+import random
+import itertools
 import numpy as np
-from queue import Queue
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, parent_dir)
 
-from partA import util
+from partA import async_util, util
+from partA.server import ServerPool, TodoServer, default_warmup
+from partA.stub_server import StubServer
+from partC.analysis import ENTITIES, OperationTable
+from partC.histogram import HistogramSet
+from partC.monitor import JvmMonitor, ResourceMonitor
+from partC.results import (
+    OperationList, ResultsWriter, is_complete, iter_operations, resume_point, run_parameters,
+)
+from partC.scenario import COLLECTIONS, OPERATIONS, SEED_WORKERS, Workload, load_scenario
+from partC.traffic import TrafficRecorder
 
-BASE_URL = "http://localhost:4567"
 JAR_PATH = r"runTodoManagerRestAPI-1.5.5.jar"
+JVM_ARGS = ["-Xmx6g"]
+COUNT_BUCKET_SIZE = 100
+RESEED_WORKERS = 16
+MAX_SCATTER_POINTS = 20000
+WARMUP_ITERATIONS = 200
+READ_FORMATS = ("json", "xml")
+READ_REPEATS = 5
+FILTER_TITLE = "Read benchmark filter target"
 
 
-def start_server():
+def start_server(pool=None):
+    """Return a started, warmed-up server and point util at it.
+
+    The server comes from ``pool`` when given, otherwise one is started and
+    warmed up now.
+    """
     print("Starting backend server...")
+    if pool is not None:
+        server = pool.acquire()
+    else:
+        server = TodoServer(JAR_PATH, jvm_args=JVM_ARGS).start()
+        server.warm_up(default_warmup, iterations=WARMUP_ITERATIONS)
+    util.BASE_URL = server.base_url
+    print(
+        f"Server is ready on port {server.port} "
+        f"(startup {server.startup_time:.2f}s, warm-up {server.warmup_time:.2f}s)"
+    )
+    return server
 
-    jvm_args = ["java", "-Xmx6g", "-jar", JAR_PATH]
-    process = subprocess.Popen(jvm_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
-    try:
-        response = requests.get(f"{BASE_URL}/todos")
-        if response.status_code == 200:
-            print("Server is ready!")
-            return process
-    except requests.exceptions.ConnectionError:
-        raise Exception("Server failed to start within timeout period")
+def stop_server(server, pool=None):
+    print("Stopping backend server...")
+    if pool is not None:
+        shutdown_time = pool.release(server)
+    else:
+        shutdown_time = server.stop()
+    print(f"Server stopped in {shutdown_time:.2f}s.")
+    return shutdown_time
 
 
-def stop_server(process):
-    print("Stopping backend server...")
-    subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)])
-    print("Server stopped.")
-
-
-class ResourceMonitor(threading.Thread):
-    def __init__(self, process, sample_interval=0.1):
-        super().__init__()
-        self.process = psutil.Process(process.pid)
-        self.sample_interval = sample_interval
-        self.cpu_samples = deque()
-        self.mem_samples = deque()
-        self.running = False
-        self.sample_queue = Queue()
-        self.last_cpu_times = {}
-        self.daemon = True
-
-    def run(self):
-        self.running = True
-        while self.running:
-            try:
-                self._collect_sample()
-                time.sleep(self.sample_interval)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                break
-
-        self._process_queue_samples()
-
-    def _collect_sample(self):
-        try:
-            processes = [self.process] + self.process.children(recursive=True)
-            cpu_total = 0
-            memory_total = 0
-
-            for proc in processes:
-                try:
-                    cpu_times = proc.cpu_times()
-                    proc_id = proc.pid
-                    
-                    if proc_id in self.last_cpu_times:
-                        last_times = self.last_cpu_times[proc_id]
-                        cpu_percent = (
-                            ((cpu_times.user - last_times.user) + 
-                             (cpu_times.system - last_times.system)) * 100 /
-                            self.sample_interval
-                        )
-                        cpu_total += cpu_percent / psutil.cpu_count()
-                    
-                    self.last_cpu_times[proc_id] = cpu_times
-                    memory_total += proc.memory_info().rss / (1024 * 1024)
-
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+def measure_operation(operation, operation_name, count=None):
+    """Run ``operation`` and return ``(result, duration, (start, end))``.
 
-            self.sample_queue.put((cpu_total, memory_total))
+    CPU and memory for the window are filled in later by attribute_resources.
+    """
+    print(f"Starting operation: {operation_name}")
+    start_time = time.time()
+    with util.request_tags(count=count):
+        result = operation()
+    end_time = time.time()
+    duration = end_time - start_time
+    print(f"Completed operation: {operation_name} in {duration:.2f} seconds")
+    return result, duration, (start_time, end_time)
 
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return
 
-    def _process_queue_samples(self):
-        while not self.sample_queue.empty():
-            cpu, mem = self.sample_queue.get()
-            self.cpu_samples.append(cpu)
-            self.mem_samples.append(mem)
+def start_monitors(server):
+    """Start sampling OS-level (CPU, RSS, threads) and JVM (heap, GC) metrics of ``server``.
 
-    def stop(self):
-        self.running = False
-        self.join()
-        self._process_queue_samples()
+    A StubServer runs in this process, so it gets no JVM metrics and its
+    resource samples include the client.
+    """
+    resources = ResourceMonitor(server.pid)
+    resources.start()
+    if not isinstance(server, TodoServer):
+        return [resources]
+    jvm = JvmMonitor(server.pid)
+    jvm.start()
+    jvm.wait_until_ready()
+    return [resources, jvm]
 
-    def get_metrics(self):
-        if not self.cpu_samples or not self.mem_samples:
-            return 0, 0
 
-        avg_cpu = self._get_filtered_mean()
-        avg_mem = sum(self.mem_samples) / len(self.mem_samples)
+def stop_monitors(monitors):
+    for monitor in monitors:
+        monitor.stop()
 
-        return avg_cpu, avg_mem
 
-    def _get_filtered_mean(self):
-        if not self.cpu_samples:
-            return 0
+def attach_monitors(results, monitors):
+    """Have the results' operation log attribute resources as ``monitors`` cover its operations.
 
-        non_zero_samples = [sample for sample in self.cpu_samples if sample > 0]
-        return sum(non_zero_samples) / len(non_zero_samples) if non_zero_samples else 0
+    Attributing while the run goes on, rather than at the end, keeps the
+    samples used within the monitors' ring buffers however long it runs.
+    """
+    for log in (results["writer"], results["operations"]):
+        if log is not None:
+            log.monitors = monitors
 
 
-def measure_operation(server_process, operation, operation_name):
-    print(f"Starting operation: {operation_name}")
-    monitor = ResourceMonitor(server_process)
-    monitor.start()
+def attribute_resources(results, monitors):
+    """Fill in the resource fields of the operations not attributed yet from the monitors' samples.
 
-    start_time = time.time()
-    result = operation()
-    duration = time.time() - start_time
+    Adds ``cpu``, ``mem`` and ``threads`` from the ResourceMonitor and
+    ``heap_used``, ``heap_committed``, ``gc_count`` and ``gc_time`` from the
+    JvmMonitor; values the monitors could not cover are None. Streamed
+    operations still waiting in the writer are attributed and written.
+    """
+    for log in (results["writer"], results["operations"]):
+        if log is not None:
+            log.drain(final=True)
 
-    monitor.stop()
-    cpu_usage, mem_usage = monitor.get_metrics()
-    print(f"Completed operation: {operation_name} in {duration:.2f} seconds")
-    return result, duration, cpu_usage, mem_usage
+
+def new_results(keep_operations=True, writer=None, **fields):
+    """Create a results dict.
+
+    Latencies always go into histograms per entity and operation type (see
+    histogram_key). Raw per-operation records are streamed to ``writer`` when
+    one is given, otherwise they are kept in memory in an OperationList when
+    ``keep_operations`` is set.
+    """
+    results = {
+        "operations": OperationList() if keep_operations and writer is None else None,
+        "writer": writer,
+        "histograms": HistogramSet(COUNT_BUCKET_SIZE),
+        "requests": HistogramSet(COUNT_BUCKET_SIZE),
+        "request_stats": {},
+        "payload_profile": util.payload_profile,
+    }
+    results.update(fields)
+    return results
+
+
+def track_requests(results):
+    """Record every HTTP call made through ``util.session`` into ``results``.
+
+    Latencies go into ``results["requests"]`` keyed by endpoint template and
+    object count, so e.g. ``POST /todos`` can be told apart from
+    ``POST /todos/{id}/tasksof``. Returns the listener for removal.
+    """
+    lock = threading.Lock()
+
+    def listener(record):
+        with lock:
+            results["requests"].record(record["endpoint"], record.get("count") or 0, record["latency"])
+            stats = results["request_stats"].setdefault(
+                record["endpoint"],
+                {"calls": 0, "errors": 0, "request_bytes": 0, "response_bytes": 0},
+            )
+            stats["calls"] += 1
+            stats["errors"] += record["status"] >= 400
+            stats["request_bytes"] += record["request_bytes"]
+            stats["response_bytes"] += record["response_bytes"]
+
+    util.add_request_listener(listener)
+    return listener
+
+
+def histogram_key(op_type, entity=None):
+    """Label the latency histograms of ``op_type`` per entity, e.g. "Todo Delete"."""
+    return f"{entity.title()} {op_type}" if entity else op_type
+
+
+def record_operation(results, op_type, count, duration, window, concurrency=1, entity=None, **fields):
+    results["histograms"].record(histogram_key(op_type, entity), count, duration)
+    writer = results["writer"]
+    if results["operations"] is None and writer is None:
+        return
+    operation = {
+        "type": op_type,
+        "entity": entity,
+        "count": count,
+        "duration": duration,
+        "start": window[0],
+        "end": window[1],
+        "cpu": None,
+        "mem": None,
+        "concurrency": concurrency,
+    }
+    operation.update(fields)
+    if writer is not None:
+        writer.add_operation(operation)
+    else:
+        results["operations"].add_operation(operation)
+
+
+def restore_histograms(results, path):
+    """Re-record the latencies of the operations already logged in ``path``."""
+    for operation in iter_operations(path):
+        results["histograms"].record(
+            histogram_key(operation["type"], operation.get("entity")), operation["count"], operation["duration"]
+        )
+
+
+def reseed_graph(created, deleted=0, use_async=False):
+    """Recreate the objects perform_test_sequence has alive at a checkpoint.
+
+    That is the todos and projects of iterations ``deleted + 1`` to
+    ``created``, related the same way as when the sequence created them. The
+    returned lists are indexed by iteration - 1, with None for deleted objects.
+    With ``use_async`` the requests are sent by an async_util.AsyncClient
+    rather than RESEED_WORKERS threads.
+    """
+    alive = range(deleted, created)
+    if use_async:
+        async def create(client):
+            return await client.create_many("todo", len(alive)), await client.create_many("project", len(alive))
+
+        created_todos, created_projects = async_util.run(create)
+    else:
+        with ThreadPoolExecutor(max_workers=RESEED_WORKERS) as executor:
+            created_todos = list(executor.map(lambda _: util.create_todo(), alive))
+            created_projects = list(executor.map(lambda _: util.create_project(), alive))
+    todos = [None] * deleted + created_todos
+    projects = [None] * deleted + created_projects
+
+    # Todo k was linked to the first k // 2 projects, project k to the first (k + 1) // 2 todos
+    for relationship, sources, targets, linked in (
+        ("todo_project", todos, projects, lambda k: k // 2),
+        ("project_todo", projects, todos, lambda k: (k + 1) // 2),
+    ):
+        pairs = [(sources[k], targets[j]) for k in alive for j in range(deleted, linked(k))]
+        if use_async:
+            failures = async_util.run(lambda client: client.link_bulk(pairs, relationship))
+        else:
+            failures = util.link_bulk(pairs, relationship, RESEED_WORKERS)
+        if failures:
+            raise Exception(
+                f"Failed to reseed {len(failures)} relationships, e.g. {failures[0].source} with {failures[0].target}. {failures[0].error}"
+            )
+    return todos, projects
+
+
+def results_to_json(results):
+    """Return a JSON-serializable copy of ``results`` with a percentile summary."""
+    data = dict(results)
+    writer = data.pop("writer", None)
+    if writer is not None:
+        data["operations_file"] = writer.path
+    if data.get("operations") is not None:
+        data["operations"] = data["operations"].operations
+    histograms = data.pop("histograms")
+    data["latency_summary"] = histograms.summary()
+    data["histograms"] = histograms.to_dict()
+    requests_histograms = data.pop("requests")
+    data["request_latency_summary"] = requests_histograms.summary()
+    data["requests"] = requests_histograms.to_dict()
+    return data
+
+
+def print_latency_summary(results):
+    summaries = list(results["histograms"].summary().items())
+    summaries += sorted(results["requests"].summary().items())
+    for op_type, summary in summaries:
+        overall = summary["all"]
+        line = ", ".join(
+            f"{name}={overall[name]:.4f}s" for name in ("p50", "p90", "p99", "p999", "max")
+        )
+        print(f"{op_type}: {line}")
+
+    # Against a StubServer, whatever the server did not spend handling a request is client-side overhead
+    client = results["requests"].summary()
+    for endpoint, server in sorted(results.get("server", {}).get("latency", {}).items()):
+        if endpoint in client:
+            overhead = client[endpoint]["all"]["p50"] - server["p50"]
+            print(
+                f"{endpoint}: server p50={server['p50'] * 1000:.3f}ms, "
+                f"client overhead p50={overhead * 1000:.3f}ms"
+            )
 
 
-def perform_test_sequence(max_objects):
+def arrival_offsets(n, rate, arrival="constant", seed=None):
+    """Offsets in seconds from the start of a phase at which each of ``n`` operations is due, ``rate`` per second."""
+    if arrival == "poisson":
+        rng = random.Random(seed)
+        return list(itertools.accumulate(rng.expovariate(rate) for _ in range(n)))
+    return [k / rate for k in range(n)]
+
+
+def run_open_loop(tasks, rate, arrival, max_in_flight, seed=None):
+    """Start each task at its scheduled arrival time, whether or not earlier ones finished.
+
+    ``rate`` paces the tasks, i.e. whole operations, not the HTTP requests
+    each one sends. Tasks are called with their intended start time so that
+    latency can be measured from when the operation was due rather than when
+    it started.
+    """
+    phase_start = time.time()
+    offsets = arrival_offsets(len(tasks), rate, arrival, seed)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        futures = []
+        for task, offset in zip(tasks, offsets):
+            intended_start = phase_start + offset
+            delay = intended_start - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(task, intended_start))
+        for future in futures:
+            future.result()
+
+
+def perform_test_sequence(max_objects, keep_operations=True, pool=None, writer=None, resume=None, async_seed=False):
+    """Create, connect and then delete ``max_objects`` todos and projects one at a time.
+
+    With a ``writer``, a checkpoint is logged after every iteration of each
+    phase. Passing the last one as ``resume`` recreates the objects that were
+    alive at that point on the new server and carries on from there; with
+    ``async_seed`` they are recreated through ``async_util.AsyncClient``.
+    """
     print(f"\nStarting test sequence with {max_objects} objects")
-    results = {"operations": []}
-    server_process = start_server()
+    results = new_results(keep_operations, writer)
+    server_process = start_server(pool)
+    monitors = start_monitors(server_process)
+    attach_monitors(results, monitors)
+    listener = None
 
     try:
         projects = []
         todos = []
+        first_iteration, deleted = 1, 0
+        if resume is not None:
+            print(f"Resuming after {resume['phase']} iteration {resume['iteration']}")
+            restore_histograms(results, writer.path)
+            if resume["phase"] == "create":
+                first_iteration = resume["iteration"] + 1
+                todos, projects = reseed_graph(resume["iteration"], use_async=async_seed)
+            else:
+                first_iteration, deleted = max_objects + 1, resume["iteration"]
+                todos, projects = reseed_graph(max_objects, deleted, use_async=async_seed)
+        listener = track_requests(results)
 
-        for i in range(1, max_objects + 1):
+        for i in range(first_iteration, max_objects + 1):
             print(f"\n=== Processing iteration {i}/{max_objects} ===")
 
             def create_and_connect_todo():
@@ -157,21 +354,13 @@ def perform_test_sequence(max_objects):
                     util.post_on_todos_id(todo_id, projects)
                 return todo_id
 
-            result, duration, cpu, mem = measure_operation(
-                server_process,
+            result, duration, window = measure_operation(
                 create_and_connect_todo,
                 f"Creating and Connecting Todo {i}",
+                i,
             )
             todos.append(result)
-            results["operations"].append(
-                {
-                    "type": "Create & Update",
-                    "count": i,
-                    "duration": duration,
-                    "cpu": cpu,
-                    "mem": mem,
-                }
-            )
+            record_operation(results, "Create & Update", i, duration, window, entity="todo")
 
             def create_and_connect_project():
                 project_id = util.create_project()
@@ -179,130 +368,771 @@ def perform_test_sequence(max_objects):
                     util.post_on_projects_id(project_id, todos)
                 return project_id
 
-            result, duration, cpu, mem = measure_operation(
-                server_process,
+            result, duration, window = measure_operation(
                 create_and_connect_project,
                 f"Creating and Connecting Project {i}",
+                i,
             )
             projects.append(result)
-            results["operations"].append(
-                {
-                    "type": "Create & Update",
-                    "count": i,
-                    "duration": duration,
-                    "cpu": cpu,
-                    "mem": mem,
-                }
-            )
+            record_operation(results, "Create & Update", i, duration, window, entity="project")
+            if writer is not None:
+                writer.checkpoint("create", i)
 
         print("\n=== Starting deletion phase ===")
         for i, (project_id, todo_id) in enumerate(list(zip(projects, todos))):
+            if i < deleted:
+                continue
+
             def delete_todo():
                 util.delete_todo(todo_id)
     
-            _, duration, cpu, mem = measure_operation(
-                server_process,
+            _, duration, window = measure_operation(
                 delete_todo,
                 f"Deleting Todo {max_objects - i + 1}",
+                max_objects - i + 1,
             )
-            results["operations"].append(
-                {
-                    "type": "Delete",
-                    "count": max_objects - i + 1,
-                    "duration": duration,
-                    "cpu": cpu,
-                    "mem": mem,
-                }
-            )
+            record_operation(results, "Delete", max_objects - i + 1, duration, window, entity="todo")
             
             def delete_project():
                 util.delete_project(project_id)
 
-            _, duration, cpu, mem = measure_operation(
-                server_process,
+            _, duration, window = measure_operation(
                 delete_project,
                 f"Deleting Project {max_objects - i + 1}",
+                max_objects - i + 1,
             )
-            results["operations"].append(
-                {
-                    "type": "Delete",
-                    "count": max_objects - i + 1,
-                    "duration": duration,
-                    "cpu": cpu,
-                    "mem": mem,
-                }
+            record_operation(results, "Delete", max_objects - i + 1, duration, window, entity="project")
+            if writer is not None:
+                writer.checkpoint("delete", i + 1)
+
+    finally:
+        stop_monitors(monitors)
+        if listener is not None:
+            util.remove_request_listener(listener)
+        stop_server(server_process, pool)
+        attribute_resources(results, monitors)
+        results["server"] = server_process.timings()
+
+    return results
+
+
+def perform_concurrent_test_sequence(max_objects, workers, keep_operations=True, pool=None, writer=None):
+    """Run the create/connect/delete workload from a pool of worker threads.
+
+    Each iteration is scheduled on the pool, so up to ``workers`` operations are
+    in flight at once. ``count`` is the number of objects of that kind alive
+    when the operation completed.
+    """
+    print(f"\nStarting concurrent test sequence with {max_objects} objects and {workers} workers")
+    results = new_results(keep_operations, writer, concurrency=workers, throughput={})
+    server_process = start_server(pool)
+    monitors = start_monitors(server_process)
+    attach_monitors(results, monitors)
+    listener = track_requests(results)
+    lock = threading.Lock()
+
+    try:
+        projects = []
+        todos = []
+
+        def create_iteration(i):
+            def create_and_connect_todo():
+                with lock:
+                    linked_projects = list(projects)
+                todo_id = util.create_todo()
+                if linked_projects:
+                    util.post_on_todos_id(todo_id, linked_projects)
+                return todo_id
+
+            result, duration, window = measure_operation(
+                create_and_connect_todo,
+                f"Creating and Connecting Todo {i}",
+                i,
+            )
+            with lock:
+                todos.append(result)
+                record_operation(results, "Create & Update", len(todos), duration, window, workers, entity="todo")
+
+            def create_and_connect_project():
+                with lock:
+                    linked_todos = list(todos)
+                project_id = util.create_project()
+                if linked_todos:
+                    util.post_on_projects_id(project_id, linked_todos)
+                return project_id
+
+            result, duration, window = measure_operation(
+                create_and_connect_project,
+                f"Creating and Connecting Project {i}",
+                i,
             )
+            with lock:
+                projects.append(result)
+                record_operation(results, "Create & Update", len(projects), duration, window, workers, entity="project")
+
+        phase_start = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(create_iteration, range(1, max_objects + 1)))
+        results["throughput"]["create"] = 2 * max_objects / (time.time() - phase_start)
+
+        print("\n=== Starting deletion phase ===")
+        remaining = {"todos": len(todos), "projects": len(projects)}
+
+        def delete_pair(pair):
+            project_id, todo_id = pair
+
+            def delete_todo():
+                util.delete_todo(todo_id)
+
+            # Objects left before each delete, claimed up front so concurrent deletes get distinct counts
+            with lock:
+                count = remaining["todos"]
+                remaining["todos"] -= 1
+            _, duration, window = measure_operation(delete_todo, f"Deleting Todo {todo_id}", count)
+            with lock:
+                record_operation(results, "Delete", count, duration, window, workers, entity="todo")
+
+            def delete_project():
+                util.delete_project(project_id)
+
+            with lock:
+                count = remaining["projects"]
+                remaining["projects"] -= 1
+            _, duration, window = measure_operation(delete_project, f"Deleting Project {project_id}", count)
+            with lock:
+                record_operation(results, "Delete", count, duration, window, workers, entity="project")
+
+        phase_start = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(delete_pair, list(zip(projects, todos))))
+        results["throughput"]["delete"] = 2 * len(todos) / (time.time() - phase_start)
+
+    finally:
+        stop_monitors(monitors)
+        util.remove_request_listener(listener)
+        stop_server(server_process, pool)
+        attribute_resources(results, monitors)
+        results["server"] = server_process.timings()
+
+    return results
+
+
+def perform_scenario_sequence(scenario, keep_operations=True, pool=None, writer=None, async_seed=False):
+    """Run a declarative scenario (see partC/scenario.py) on ``scenario["concurrency"]`` threads.
+
+    The seed graph is created first and not measured, through
+    ``async_util.AsyncClient`` with ``async_seed``. Each operation is
+    recorded under its name and entity, with ``count`` the number of live
+    objects of that entity when it completed; operations whose requests
+    failed are counted in ``results["errors"]``.
+    """
+    concurrency = scenario.get("concurrency", 1)
+    print(f"\nStarting scenario '{scenario['name']}': {scenario['operations']} operations on {concurrency} threads")
+    results = new_results(
+        keep_operations, writer, scenario=scenario, concurrency=concurrency, throughput={}, errors={}
+    )
+    server_process = start_server(pool)
+    monitors = start_monitors(server_process)
+    attach_monitors(results, monitors)
+    workload = Workload(scenario)
+    listener = None
+    lock = threading.Lock()
+
+    try:
+        start = time.time()
+        workload.seed(use_async=async_seed)
+        counts = ", ".join(f"{workload.count(entity)} {COLLECTIONS[entity]}" for entity in ENTITIES)
+        print(f"Seeded {counts} in {time.time() - start:.2f}s")
+        listener = track_requests(results)
+
+        def run(index, name):
+            entity = OPERATIONS[name][0]
+            start_time = time.time()
+            with util.request_tags(count=workload.count(entity)):
+                ok, _ = workload.run(name, index)
+            end_time = time.time()
+            with lock:
+                count = workload.count(entity)
+                record_operation(
+                    results, name, count, end_time - start_time, (start_time, end_time), concurrency, entity=entity
+                )
+                if not ok:
+                    results["errors"][name] = results["errors"].get(name, 0) + 1
+
+        schedule = workload.schedule()
+        phase_start = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run, range(len(schedule)), schedule))
+        results["throughput"]["operations"] = len(schedule) / (time.time() - phase_start)
+        print(f"Ran {len(schedule)} operations at {results['throughput']['operations']:.1f} operations/s")
+        for name, n in sorted(results["errors"].items()):
+            print(f"{name}: {n} failed, e.g. {workload.errors.get(name, 'an unexpected status')}")
+
+    finally:
+        stop_monitors(monitors)
+        if listener is not None:
+            util.remove_request_listener(listener)
+        stop_server(server_process, pool)
+        attribute_resources(results, monitors)
+        results["server"] = server_process.timings()
+
+    return results
+
+
+def perform_read_sequence(
+    max_objects, step=COUNT_BUCKET_SIZE, repeats=READ_REPEATS, keep_operations=True, pool=None, writer=None,
+):
+    """Time the read endpoints as the collections grow to ``max_objects`` todos and projects.
+
+    Every ``step`` objects the lists (``GET /todos``), a title filter
+    (``GET /projects?title=...``) matching one unlinked object, and the
+    relationships of a hub, linked to every other object of the other kind,
+    and of a leaf, linked only to the other hub, are read ``repeats`` times
+    in each of JSON and XML. Growing the collections is not measured.
+    Operations are recorded as e.g. ``List (XML)`` with ``count`` the
+    collection size, ``format``, ``response_bytes`` and, for relationship
+    reads, ``fanout``; plot_operations draws them like the write operations.
+    """
+    print(f"\nStarting read sequence up to {max_objects} objects in steps of {step}")
+    results = new_results(keep_operations, writer, formats={})
+    server_process = start_server(pool)
+    monitors = start_monitors(server_process)
+    attach_monitors(results, monitors)
+
+    def measure_reads(op_type, entity, path, size, params=None, fanout=None):
+        samples = {fmt: [] for fmt in READ_FORMATS}
+        for _ in range(repeats):
+            # Alternate the formats so neither always reads a warmer server
+            for fmt in READ_FORMATS:
+                start_time = time.time()
+                with util.request_tags(count=size):
+                    response = util.get_resource(path, params, fmt)
+                end_time = time.time()
+                response_bytes = len(response.content)
+                samples[fmt].append((end_time - start_time, response_bytes))
+                record_operation(
+                    results, f"{op_type} ({fmt.upper()})", size, end_time - start_time, (start_time, end_time),
+                    entity=entity, format=fmt, response_bytes=response_bytes, fanout=fanout,
+                )
+
+        medians = {
+            fmt: {
+                "latency": float(np.median([latency for latency, _ in values])),
+                "response_bytes": values[-1][1],
+            }
+            for fmt, values in samples.items()
+        }
+        results["formats"].setdefault(f"{entity.title()} {op_type}", {})[size] = medians
+        json_stats, xml_stats = medians["json"], medians["xml"]
+        print(
+            f"  {entity.title()} {op_type}: JSON {json_stats['latency'] * 1000:.2f}ms "
+            f"{json_stats['response_bytes'] / 1024:.1f}kB, XML {xml_stats['latency'] * 1000:.2f}ms "
+            f"{xml_stats['response_bytes'] / 1024:.1f}kB "
+            f"(x{xml_stats['latency'] / json_stats['latency']:.2f} latency, "
+            f"x{xml_stats['response_bytes'] / json_stats['response_bytes']:.2f} size)"
+        )
+
+    try:
+        # The filter targets stay unlinked so their bodies do not grow with the hubs
+        todos = [util.create_todo(title=FILTER_TITLE), util.create_todo()]
+        projects = [util.create_project(title=FILTER_TITLE), util.create_project()]
+        hub_todo, hub_project = todos[1], projects[1]
+        # Only the reads are tracked, the listener is attached around them below
+        listener = track_requests(results)
+        util.remove_request_listener(listener)
+        for size in range(step, max_objects + 1, step):
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=RESEED_WORKERS) as executor:
+                new_todos = list(executor.map(lambda _: util.create_todo(), range(len(todos), size)))
+                new_projects = list(executor.map(lambda _: util.create_project(), range(len(projects), size)))
+            # tasksof and tasks are two-way, so each hub also gains the other hub once
+            for relationship, hub, targets in (
+                ("todo_project", hub_todo, new_projects + ([hub_project] if len(projects) == 2 else [])),
+                ("project_todo", hub_project, new_todos),
+            ):
+                failures = util.link_bulk([(hub, target) for target in targets], relationship, RESEED_WORKERS)
+                if failures:
+                    raise Exception(
+                        f"Failed to link {len(failures)} objects to hub {hub}, e.g. {failures[0].target}. {failures[0].error}"
+                    )
+            todos += new_todos
+            projects += new_projects
+            print(f"Grew to {size} todos and projects in {time.time() - start:.2f}s")
+
+            util.add_request_listener(listener)
+            try:
+                for entity, collection in (("todo", "todos"), ("project", "projects")):
+                    measure_reads("List", entity, collection, size)
+                    measure_reads("Filter by title", entity, collection, size, params={"title": FILTER_TITLE})
+                measure_reads("Hub relationships", "todo", f"todos/{hub_todo}/tasksof", size, fanout=size - 1)
+                measure_reads("Hub relationships", "project", f"projects/{hub_project}/tasks", size, fanout=size - 1)
+                measure_reads("Leaf relationships", "todo", f"todos/{todos[-1]}/tasksof", size, fanout=1)
+                measure_reads("Leaf relationships", "project", f"projects/{projects[-1]}/tasks", size, fanout=1)
+            finally:
+                util.remove_request_listener(listener)
+
+    finally:
+        stop_monitors(monitors)
+        stop_server(server_process, pool)
+        attribute_resources(results, monitors)
+        results["server"] = server_process.timings()
+
+    return results
+
+
+def perform_open_loop_sequence(
+    max_objects, rate, arrival="constant", max_in_flight=64, seed=None, keep_operations=True,
+    pool=None, writer=None,
+):
+    """Run the create/connect/delete workload on a fixed arrival timeline.
+
+    ``rate`` is in operations per second: each create is one POST plus its
+    relationship POSTs, each delete one DELETE. ``duration`` is measured from
+    each operation's intended start time, so server stalls show up as latency
+    instead of silently delaying the next operation. The time spent actually
+    executing is kept as ``service_time``.
+    """
+    print(f"\nStarting open-loop test sequence with {max_objects} objects at {rate} operations/s ({arrival})")
+    results = new_results(
+        keep_operations,
+        writer,
+        concurrency=max_in_flight,
+        arrival={"mode": arrival, "rate": rate, "seed": seed},
+    )
+    server_process = start_server(pool)
+    monitors = start_monitors(server_process)
+    attach_monitors(results, monitors)
+    listener = track_requests(results)
+    lock = threading.Lock()
+
+    def timed(intended_start, operation, operation_name, count):
+        finished = {}
+
+        def run():
+            result = operation()
+            finished["at"] = time.time()
+            return result
+
+        result, service_time, window = measure_operation(run, operation_name, count)
+        return result, finished["at"] - intended_start, service_time, window
+
+    try:
+        projects = []
+        todos = []
+
+        def create_todo_task(i):
+            def task(intended_start):
+                def create_and_connect_todo():
+                    with lock:
+                        linked_projects = list(projects)
+                    todo_id = util.create_todo()
+                    if linked_projects:
+                        util.post_on_todos_id(todo_id, linked_projects)
+                    return todo_id
+
+                result, latency, service_time, window = timed(
+                    intended_start, create_and_connect_todo, f"Creating and Connecting Todo {i}", i
+                )
+                with lock:
+                    todos.append(result)
+                    record_operation(
+                        results, "Create & Update", len(todos), latency, window,
+                        max_in_flight, entity="todo", service_time=service_time,
+                    )
+
+            return task
+
+        def create_project_task(i):
+            def task(intended_start):
+                def create_and_connect_project():
+                    with lock:
+                        linked_todos = list(todos)
+                    project_id = util.create_project()
+                    if linked_todos:
+                        util.post_on_projects_id(project_id, linked_todos)
+                    return project_id
+
+                result, latency, service_time, window = timed(
+                    intended_start, create_and_connect_project, f"Creating and Connecting Project {i}", i
+                )
+                with lock:
+                    projects.append(result)
+                    record_operation(
+                        results, "Create & Update", len(projects), latency, window,
+                        max_in_flight, entity="project", service_time=service_time,
+                    )
+
+            return task
+
+        tasks = []
+        for i in range(1, max_objects + 1):
+            tasks.append(create_todo_task(i))
+            tasks.append(create_project_task(i))
+        run_open_loop(tasks, rate, arrival, max_in_flight, seed)
+
+        print("\n=== Starting deletion phase ===")
+        remaining = {"todos": len(todos), "projects": len(projects)}
+
+        def delete_task(kind, delete, object_id):
+            def task(intended_start):
+                # Objects left before this delete, claimed up front so concurrent deletes get distinct counts
+                with lock:
+                    count = remaining[kind]
+                    remaining[kind] -= 1
+                _, latency, service_time, window = timed(
+                    intended_start, lambda: delete(object_id), f"Deleting {kind} {object_id}", count,
+                )
+                with lock:
+                    record_operation(
+                        results, "Delete", count, latency, window,
+                        max_in_flight, entity=kind[:-1], service_time=service_time,
+                    )
+
+            return task
+
+        tasks = []
+        for project_id, todo_id in zip(projects, todos):
+            tasks.append(delete_task("todos", util.delete_todo, todo_id))
+            tasks.append(delete_task("projects", util.delete_project, project_id))
+        run_open_loop(tasks, rate, arrival, max_in_flight, seed)
 
     finally:
-        stop_server(server_process)
+        stop_monitors(monitors)
+        util.remove_request_listener(listener)
+        stop_server(server_process, pool)
+        attribute_resources(results, monitors)
+        results["server"] = server_process.timings()
 
     return results
 
 
 def plot_results(results):
-    todo_operations = {"Create & Update", "Delete"}
-    project_operations = {"Create & Update", "Delete"}
+    if results["operations"] is not None:
+        plot_operations(OperationTable.from_records(results["operations"].operations))
+    elif results.get("writer") is not None:
+        plot_operations(OperationTable.load(results["writer"].path))
+    plot_latency_percentiles(results["histograms"], "latency_percentiles_charts.png")
+    plot_latency_percentiles(results["requests"], "request_latency_charts.png")
+
+
+def plot_operations(table):
+    """One chart per metric with a panel per entity that has operations.
 
+    Each operation type is drawn as a thinned scatter, its p10-p90 band and
+    median over object-count bins, and a quadratic fit.
+    """
     metrics = {
         "duration": "Execution Time (seconds)",
         "cpu": "CPU Usage (%)",
         "mem": "Memory Usage (MB)",
+        "heap_used": "JVM Heap Used (MB)",
+        "gc_time": "GC Pause Time (seconds)",
+        "response_bytes": "Response Size (bytes)",
     }
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
     for metric, ylabel in metrics.items():
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
-
-        for op_type in todo_operations:
-            data = [
-                (op["count"], op[metric])
-                for op in results["operations"]
-                if op["type"] == op_type
-            ]
-            if data:
-                x, y = zip(*data)
-                ax1.scatter(x, y, label=op_type, alpha=0.5)
-
-                if len(x) > 1:
-                    z = np.polyfit(x, y, 2)
-                    p = np.poly1d(z)
-                    x_smooth = np.linspace(min(x), max(x), 100)
-                    ax1.plot(x_smooth, p(x_smooth), "-", linewidth=1)
-
-        ax1.set_xlabel("Number of Objects")
-        ax1.set_ylabel(ylabel)
-        ax1.set_title(f"Todo Operations - {ylabel} vs Number of Objects")
-        ax1.grid(True)
-        ax1.legend()
-
-        for op_type in project_operations:
-            data = [
-                (op["count"], op[metric])
-                for op in results["operations"]
-                if op["type"] == op_type
-            ]
-            if data:
-                x, y = zip(*data)
-                ax2.scatter(x, y, label=op_type, alpha=0.5)
-
-                if len(x) > 1:
-                    z = np.polyfit(x, y, 2)
-                    p = np.poly1d(z)
-                    x_smooth = np.linspace(min(x), max(x), 100)
-                    ax2.plot(x_smooth, p(x_smooth), "-", linewidth=1)
-
-        ax2.set_xlabel("Number of Objects")
-        ax2.set_ylabel(ylabel)
-        ax2.set_title(f"Project Operations - {ylabel} vs Number of Objects")
-        ax2.grid(True)
-        ax2.legend()
+        if not table.has_values(metric):
+            continue
+        bands = table.binned(metric)
+        fits = table.fit(metric)
+        entities = [entity for entity in ENTITIES if any(key[0] == entity for key in bands)]
+        fig, axes = plt.subplots(1, len(entities), figsize=(10 * len(entities), 8), squeeze=False)
+
+        for ax, entity in zip(axes[0], entities):
+            for i, op_type in enumerate(table.types):
+                key = (entity, op_type)
+                if key not in bands:
+                    continue
+                color = colors[i % len(colors)]
+                x, y = table.points(metric, entity, op_type, MAX_SCATTER_POINTS)
+                ax.scatter(x, y, color=color, alpha=0.3, s=10, label=f"{entity.title()} {op_type}")
+                band = bands[key]
+                ax.fill_between(band["count"], band["p10"], band["p90"], color=color, alpha=0.2)
+                ax.plot(band["count"], band["p50"], "-", color=color, linewidth=1)
+                if key in fits:
+                    x_smooth = np.linspace(band["count"].min(), band["count"].max(), 100)
+                    ax.plot(x_smooth, fits[key](x_smooth), "--", color=color, linewidth=1)
+
+            ax.set_xlabel("Number of Objects")
+            ax.set_ylabel(ylabel)
+            ax.set_title(f"{entity.title()} Operations - {ylabel} vs Number of Objects")
+            ax.grid(True)
+            ax.legend()
 
         plt.tight_layout()
         plt.savefig(f"{metric}_separated_charts.png")
         plt.close()
 
 
+def plot_latency_percentiles(histograms, filename):
+    summary = histograms.summary()
+    if not summary:
+        return
+
+    columns = min(len(summary), 3)
+    rows = (len(summary) + columns - 1) // columns
+    fig, axes = plt.subplots(rows, columns, figsize=(10 * columns, 8 * rows), squeeze=False)
+    for ax in axes.flat[len(summary):]:
+        ax.set_visible(False)
+    for ax, (op_type, op_summary) in zip(axes.flat, sorted(summary.items())):
+        buckets = [b for b in op_summary["by_count"].values() if b["count"]]
+        labels = [label for label, b in op_summary["by_count"].items() if b["count"]]
+        x = np.arange(len(buckets))
+        for name in ("p50", "p90", "p99", "p999", "max"):
+            ax.plot(x, [b[name] for b in buckets], marker="o", label=name)
+        ax.fill_between(x, [b["p50"] for b in buckets], [b["p99"] for b in buckets], alpha=0.2)
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+        ax.set_yscale("log")
+        ax.set_xlabel("Number of Objects")
+        ax.set_ylabel("Latency (seconds)")
+        ax.set_title(f"{op_type} - Latency Percentiles vs Number of Objects")
+        ax.grid(True)
+        ax.legend()
+
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Todo Manager API performance test")
+    parser.add_argument("--objects", type=int, default=1000, help="number of todos/projects to create")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of concurrent workers; 1 runs the serial sequence",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="operations (a create with its links, or a delete) per second; "
+        "runs the open-loop sequence on a fixed arrival timeline",
+    )
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="open-loop in-flight limit")
+    parser.add_argument("--seed", type=int, help="seed for poisson arrivals")
+    parser.add_argument(
+        "--payload-seed",
+        type=int,
+        default=0,
+        help="seed for the payload variant sizes and the order they are sent in",
+    )
+    parser.add_argument(
+        "--link-workers",
+        type=int,
+        default=1,
+        help="threads used to create each object's relationships",
+    )
+    parser.add_argument(
+        "--payload-profile",
+        choices=sorted(util.PAYLOAD_PROFILES),
+        default=util.payload_profile,
+        help="size profile of the todo/project bodies",
+    )
+    parser.add_argument(
+        "--no-raw-operations",
+        dest="keep_operations",
+        action="store_false",
+        help="only keep latency histograms, not one record per operation",
+    )
+    parser.add_argument(
+        "--results-file",
+        default="performance_results.jsonl",
+        help="JSON Lines file the operations are streamed to",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the serial sequence from the last checkpoint in --results-file",
+    )
+    parser.add_argument(
+        "--plot-only",
+        metavar="RESULTS_FILE",
+        help="redraw the operation charts from a .jsonl or .json results file and exit",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="number of runs, each on a fresh server")
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=1,
+        help="servers kept started and warmed up ahead of the next run",
+    )
+    parser.add_argument(
+        "--scenario",
+        metavar="FILE",
+        help="run a JSON benchmark scenario (see partC/scenarios) instead of the create/link/delete sequence",
+    )
+    parser.add_argument(
+        "--async-seed",
+        action="store_true",
+        help="create the --resume and --scenario seed graphs with the asyncio client (needs aiohttp)",
+    )
+    parser.add_argument(
+        "--reads",
+        action="store_true",
+        help="time the list, filter and relationship reads in JSON and XML as the collections grow to --objects",
+    )
+    parser.add_argument(
+        "--read-step",
+        type=int,
+        default=COUNT_BUCKET_SIZE,
+        help="objects added between two rounds of --reads",
+    )
+    parser.add_argument(
+        "--read-repeats",
+        type=int,
+        default=READ_REPEATS,
+        help="times each read is timed per format and round",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="FILE",
+        help="record every request of the run to FILE for replay with partC/traffic.py",
+    )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="benchmark against the in-process stand-in server instead of the jar",
+    )
+    parser.add_argument(
+        "--warmup-iterations",
+        type=int,
+        default=WARMUP_ITERATIONS,
+        help="create/link/delete cycles run on each server before measuring",
+    )
+    args = parser.parse_args()
+    if args.resume and (args.rate or args.workers > 1 or args.scenario):
+        parser.error("--resume is only supported by the serial sequence")
+    if args.scenario and (args.rate or args.workers > 1):
+        parser.error("--scenario sets its own concurrency, drop --rate and --workers")
+    if args.reads and (args.rate or args.workers > 1 or args.scenario or args.resume):
+        parser.error("--reads runs its own sequence, drop --rate, --workers, --scenario and --resume")
+    if args.resume and not args.keep_operations:
+        parser.error("--resume needs the streamed operations, drop --no-raw-operations")
+    return args
+
+
+def connection_pool_size(args, scenario=None):
+    """Return how many requests the selected mode can have in flight, for util.configure_pool.
+
+    Callers that link with more than one ``--link-workers`` wait on that many
+    link_bulk threads, and seeding links on RESEED_WORKERS or SEED_WORKERS.
+    """
+    if scenario is not None:
+        return max(scenario.get("concurrency", 1), SEED_WORKERS)
+    if args.reads:
+        return RESEED_WORKERS
+    callers = args.max_in_flight if args.rate else args.workers
+    return max(callers * args.link_workers, RESEED_WORKERS)
+
+
+def open_results_file(path, args):
+    """Return ``(writer, checkpoint)`` for a run logged to ``path``.
+
+    Without ``--resume`` the file is started afresh. With it, the file is cut
+    back to its last checkpoint and appended to; checkpoint is None when
+    there is nothing to resume from.
+    """
+    checkpoint = None
+    if args.resume:
+        parameters = run_parameters(path)
+        if parameters is not None and parameters["objects"] != args.objects:
+            raise Exception(
+                f"Cannot resume {path}: it was started with {parameters['objects']} objects, not {args.objects}"
+            )
+        checkpoint = resume_point(path)
+    writer = ResultsWriter(path, append=checkpoint is not None)
+    writer.write({
+        "kind": "run",
+        "objects": args.objects,
+        "workers": args.workers,
+        "rate": args.rate,
+        "scenario": args.scenario,
+        "reads": args.reads,
+        "payload_profile": args.payload_profile,
+        "payload_seed": args.payload_seed,
+        "resumed": checkpoint is not None,
+        "started": time.time(),
+    })
+    return writer, checkpoint
+
+
 if __name__ == "__main__":
-    results = perform_test_sequence(1000)
-    plot_results(results)
-    with open("performance_results.json", "w") as f:
-        json.dump(results, f, indent=2)
\ No newline at end of file
+    args = parse_args()
+    if args.plot_only:
+        table = OperationTable.load(args.plot_only)
+        for (entity, op_type), stats in table.summary("duration").items():
+            line = ", ".join(f"{name}={value:.4f}s" for name, value in stats.items() if name != "n")
+            print(f"{entity.title()} {op_type} ({stats['n']} operations): {line}")
+        plot_operations(table)
+        sys.exit(0)
+    scenario = load_scenario(args.scenario) if args.scenario else None
+    util.LINK_WORKERS = args.link_workers
+    util.configure_pool(connection_pool_size(args, scenario))
+    util.set_payload_profile(args.payload_profile, args.payload_seed)
+    results_stem = os.path.splitext(args.results_file)[0]
+    suffixes = [""] if args.repeat == 1 else [f"_{run}" for run in range(1, args.repeat + 1)]
+    pending = []
+    for suffix in suffixes:
+        if args.resume and is_complete(f"{results_stem}{suffix}.jsonl"):
+            print(f"{results_stem}{suffix}.jsonl is already complete, skipping")
+        else:
+            pending.append(suffix)
+    pool = ServerPool(
+        args.pool_size,
+        JAR_PATH,
+        jvm_args=JVM_ARGS,
+        warmup_kwargs={"iterations": args.warmup_iterations},
+        server_factory=StubServer if args.stub else None,
+        runs=len(pending),
+    )
+    results = None
+    with pool:
+        for suffix in pending:
+            results_file = f"{results_stem}{suffix}.jsonl"
+
+            writer, checkpoint = open_results_file(results_file, args) if args.keep_operations else (None, None)
+            recorder = None
+            if args.capture:
+                capture_stem, capture_ext = os.path.splitext(args.capture)
+                recorder = TrafficRecorder(f"{capture_stem}{suffix}{capture_ext}")
+                util.add_request_listener(recorder, bodies=True)
+            try:
+                if args.scenario:
+                    results = perform_scenario_sequence(scenario, args.keep_operations, pool, writer, args.async_seed)
+                elif args.reads:
+                    results = perform_read_sequence(
+                        args.objects, args.read_step, args.read_repeats, args.keep_operations, pool, writer
+                    )
+                elif args.rate:
+                    results = perform_open_loop_sequence(
+                        args.objects, args.rate, args.arrival, args.max_in_flight, args.seed,
+                        args.keep_operations, pool, writer,
+                    )
+                elif args.workers > 1:
+                    results = perform_concurrent_test_sequence(
+                        args.objects, args.workers, args.keep_operations, pool, writer
+                    )
+                else:
+                    results = perform_test_sequence(
+                        args.objects, args.keep_operations, pool, writer, checkpoint, args.async_seed
+                    )
+                if writer is not None:
+                    writer.write({"kind": "summary", **results_to_json(results)})
+            finally:
+                if writer is not None:
+                    writer.close()
+                if recorder is not None:
+                    util.remove_request_listener(recorder)
+                    recorder.close()
+                    print(f"Captured {recorder.requests} requests to {recorder.path}")
+
+            print_latency_summary(results)
+            with open(f"performance_results{suffix}.json", "w") as f:
+                json.dump(results_to_json(results), f, indent=2)
+    if results is not None:
+        plot_results(results)
\ No newline at end of file
@@ -0,0 +1,80 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partC.analysis import OperationTable
+
+
+def operation(entity, op_type, count, duration):
+    return {"entity": entity, "type": op_type, "count": count, "duration": duration}
+
+
+class TestBinned(unittest.TestCase):
+    def test_known_bins(self):
+        records = [operation("todo", "Create & Update", count, count * 10.0) for count in range(10, 0, -1)]
+        records.append(operation("project", "Delete", 10, 7.0))
+        records.append(operation("project", "Delete", 1, float("nan")))
+        binned = OperationTable.from_records(records).binned("duration", bins=2)
+
+        self.assertEqual(set(binned), {("todo", "Create & Update"), ("project", "Delete")})
+        todos = binned[("todo", "Create & Update")]
+        # Edges 1, 5.5, 10: counts 1-5 fall in the first bin, 6-10 in the second
+        np.testing.assert_array_equal(todos["n"], [5, 5])
+        np.testing.assert_array_equal(todos["count"], [3, 8])
+        np.testing.assert_array_equal(todos["mean"], [30, 80])
+        np.testing.assert_array_equal(todos["p10"], [10, 60])
+        np.testing.assert_array_equal(todos["p50"], [30, 80])
+        np.testing.assert_array_equal(todos["p90"], [40, 90])
+
+        # Only the bin holding a value is reported; the NaN duration is left out
+        projects = binned[("project", "Delete")]
+        np.testing.assert_array_equal(projects["n"], [1])
+        np.testing.assert_array_equal(projects["count"], [10])
+        np.testing.assert_array_equal(projects["p90"], [7])
+
+    def test_matches_per_group_computation(self):
+        rng = random.Random(5)
+        records = [
+            operation(rng.choice(("todo", "project")), rng.choice(("Create", "Delete")), rng.randint(1, 500), rng.expovariate(20))
+            for _ in range(2000)
+        ]
+        bins, percentiles = 7, (25, 50, 99)
+        binned = OperationTable.from_records(records).binned("duration", bins=bins, percentiles=percentiles)
+
+        counts = [r["count"] for r in records]
+        edges = np.linspace(min(counts), max(counts), bins + 1)
+        for group, stats in binned.items():
+            rows = [r for r in records if (r["entity"], r["type"]) == group]
+            bin_of = np.digitize([r["count"] for r in rows], edges[1:-1])
+            for i, b in enumerate(sorted(set(bin_of))):
+                values = sorted(r["duration"] for r, rb in zip(rows, bin_of) if rb == b)
+                with self.subTest(group=group, bin=b):
+                    self.assertEqual(stats["n"][i], len(values))
+                    self.assertAlmostEqual(stats["mean"][i], sum(values) / len(values))
+                    for q in percentiles:
+                        self.assertEqual(stats[f"p{q}"][i], values[math.floor((len(values) - 1) * q / 100)])
+
+    def test_no_values(self):
+        table = OperationTable.from_records([operation("todo", "Create", 1, None)])
+        self.assertEqual(table.binned("duration"), {})
+
+
+class TestEntityInference(unittest.TestCase):
+    def test_alternates_todo_and_project_per_type(self):
+        records = [{"type": op_type, "count": 1, "duration": 0.1} for op_type in ("Create", "Create", "Delete", "Create")]
+        records.append(operation("category", "Delete", 1, 0.1))
+        table = OperationTable.from_records(records, chunk_size=2)
+        self.assertEqual(
+            [table._group_key(code) for code in table._group_codes()],
+            [("todo", "Create"), ("project", "Create"), ("todo", "Delete"), ("todo", "Create"), ("category", "Delete")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
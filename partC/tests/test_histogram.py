@@ -0,0 +1,125 @@
+import json
+import math
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partC.histogram import HistogramSet, LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_relative_error(self):
+        rng = random.Random(3)
+        values = [rng.lognormvariate(-5, 1.5) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        ordered = sorted(values)
+        for q in (50, 90, 99, 99.9):
+            exact = ordered[math.ceil(len(values) * q / 100) - 1]
+            with self.subTest(q=q):
+                self.assertLessEqual(abs(histogram.percentile(q) - exact) / exact, histogram.ratio - 1)
+
+    def test_percentiles_clamped_to_min_and_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0123)
+        summary = histogram.summary()
+        for name in ("p50", "p90", "p99", "p999", "max"):
+            self.assertEqual(summary[name], 0.0123)
+        self.assertEqual(summary["count"], 1)
+        self.assertAlmostEqual(summary["mean"], 0.0123)
+
+    def test_out_of_range_values(self):
+        histogram = LatencyHistogram(lowest=1e-3, highest=1.0)
+        for value in (0.0, 1e-9, 5.0, 5000.0):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.counts[0], 2)
+        self.assertEqual(histogram.counts[-1], 2)
+        self.assertEqual(histogram.summary()["max"], 5000.0)
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        self.assertEqual(histogram.summary(), {"count": 0})
+
+    def test_merge_equals_recording_everything(self):
+        rng = random.Random(7)
+        first, second = [rng.uniform(1e-4, 2.0) for _ in range(500)], [rng.uniform(1e-3, 30.0) for _ in range(300)]
+        merged, combined = LatencyHistogram(), LatencyHistogram()
+        other = LatencyHistogram()
+        for value in first:
+            merged.record(value)
+            combined.record(value)
+        for value in second:
+            other.record(value)
+            combined.record(value)
+        merged.merge(other)
+        np.testing.assert_array_equal(merged.counts, combined.counts)
+        self.assertEqual((merged.count, merged.min, merged.max), (combined.count, combined.min, combined.max))
+        self.assertAlmostEqual(merged.total, combined.total)
+        for q in (1, 50, 90, 99, 100):
+            self.assertEqual(merged.percentile(q), combined.percentile(q))
+
+    def test_merge_into_empty(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.5)
+        merged = LatencyHistogram().merge(histogram)
+        self.assertEqual((merged.min, merged.max), (0.5, 0.5))
+
+    def test_merge_rejects_other_layout(self):
+        with self.assertRaises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(ratio=1.05))
+
+    def test_dict_round_trip(self):
+        histogram = LatencyHistogram()
+        for value in (0.001, 0.002, 0.002, 0.5):
+            histogram.record(value)
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+        np.testing.assert_array_equal(restored.counts, histogram.counts)
+        self.assertEqual(restored.summary(), histogram.summary())
+
+        empty = LatencyHistogram.from_dict(json.loads(json.dumps(LatencyHistogram().to_dict())))
+        self.assertEqual(empty.summary(), {"count": 0})
+        empty.record(0.25)
+        self.assertEqual(empty.min, 0.25)
+
+
+class TestHistogramSet(unittest.TestCase):
+    def test_count_buckets(self):
+        histograms = HistogramSet(bucket_size=100)
+        self.assertEqual([histograms.bucket_start(c) for c in (0, 1, 100, 101, 250)], [1, 1, 1, 101, 201])
+        self.assertEqual(histograms.bucket_label(101), "101-200")
+
+    def test_summary_per_key_and_bucket(self):
+        histograms = HistogramSet(bucket_size=10)
+        for count in range(1, 26):
+            histograms.record("Todo Delete", count, count / 1000)
+        histograms.record("Project Delete", 3, 0.5)
+        summary = histograms.summary()
+        self.assertEqual(set(summary), {"Todo Delete", "Project Delete"})
+        self.assertEqual(list(summary["Todo Delete"]["by_count"]), ["1-10", "11-20", "21-30"])
+        self.assertEqual([b["count"] for b in summary["Todo Delete"]["by_count"].values()], [10, 10, 5])
+        self.assertEqual(summary["Todo Delete"]["all"]["count"], 25)
+        self.assertEqual(summary["Project Delete"]["all"]["max"], 0.5)
+
+    def test_merge_and_round_trip(self):
+        first, second = HistogramSet(10), HistogramSet(10)
+        first.record("Todo Delete", 5, 0.01)
+        second.record("Todo Delete", 15, 0.02)
+        second.record("Todo Create & Update", 1, 0.03)
+        first.merge(second)
+        self.assertEqual(first.summary()["Todo Delete"]["all"]["count"], 2)
+        restored = HistogramSet.from_dict(json.loads(json.dumps(first.to_dict())))
+        self.assertEqual(restored.summary(), first.summary())
+        with self.assertRaises(ValueError):
+            first.merge(HistogramSet(20))
+
+
+if __name__ == "__main__":
+    unittest.main()
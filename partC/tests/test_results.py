@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partC.results import OperationList, ResultsWriter, iter_operations, resume_point
+
+
+class CoveringMonitor:
+    """Monitor whose samples cover everything up to ``covered``; attributes each operation's end time."""
+
+    def __init__(self, covered):
+        self.covered = covered
+
+    def covered_until(self):
+        return self.covered
+
+    def attribute(self, starts, ends):
+        return {"cpu": [end if end <= self.covered else float("nan") for end in ends]}
+
+
+class TestResumePoint(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "results.jsonl")
+
+    def write_lines(self, *lines):
+        with open(self.path, "w") as f:
+            f.write("".join(lines))
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_truncates_after_last_checkpoint(self):
+        kept = [
+            '{"kind": "run", "iterations": 3}\n',
+            '{"kind": "operation", "start": 0, "end": 1}\n',
+            '{"kind": "checkpoint", "phase": "create", "iteration": 1}\n',
+            '{"kind": "operation", "start": 1, "end": 2}\n',
+            '{"kind": "checkpoint", "phase": "create", "iteration": 2}\n',
+        ]
+        self.write_lines(*kept, '{"kind": "operation", "start": 2, "end": 3}\n', '{"kind": "operat')
+        self.assertEqual(resume_point(self.path), {"kind": "checkpoint", "phase": "create", "iteration": 2})
+        self.assertEqual(self.read(), "".join(kept))
+        self.assertEqual(len(list(iter_operations(self.path))), 2)
+
+    def test_partial_line_after_checkpoint(self):
+        """A line cut off mid-write right after the checkpoint is dropped, not left to corrupt the next append."""
+        checkpoint = '{"kind": "checkpoint", "phase": "delete", "iteration": 1}\n'
+        self.write_lines(checkpoint, '{"kind": "checkpo')
+        self.assertEqual(resume_point(self.path)["phase"], "delete")
+        self.assertEqual(self.read(), checkpoint)
+
+    def test_without_checkpoint(self):
+        lines = '{"kind": "run"}\n{"kind": "operation", "start": 0, "end": 1}\n'
+        self.write_lines(lines)
+        self.assertIsNone(resume_point(self.path))
+        self.assertEqual(self.read(), lines)
+
+    def test_missing_file(self):
+        self.assertIsNone(resume_point(self.path))
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestOperationQueue(unittest.TestCase):
+    def test_holds_back_uncovered_operations(self):
+        monitor = CoveringMonitor(covered=2.5)
+        operations = OperationList(flush_interval=3600)
+        operations.monitors = [monitor]
+        for end in (1, 2, 3, 4):
+            operations.add_operation({"start": end - 1, "end": end})
+
+        operations.drain()
+        self.assertEqual([(op["end"], op["cpu"]) for op in operations.operations], [(1, 1.0), (2, 2.0)])
+
+        monitor.covered = 3
+        operations.drain()
+        self.assertEqual([op["end"] for op in operations.operations], [1, 2, 3])
+
+        operations.drain(final=True)
+        self.assertEqual([op["end"] for op in operations.operations], [1, 2, 3, 4])
+        self.assertIsNone(operations.operations[-1]["cpu"])
+
+    def test_checkpoint_waits_for_operations_before_it(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "results.jsonl")
+        monitor = CoveringMonitor(covered=0)
+        with ResultsWriter(path, flush_interval=3600) as writer:
+            writer.monitors = [monitor]
+            writer.add_operation({"start": 0, "end": 1})
+            writer.checkpoint("create", 1)
+            writer.drain()
+            self.assertIsNone(resume_point(path))
+            monitor.covered = 1
+            writer.drain()
+            self.assertEqual(resume_point(path)["iteration"], 1)
+        with open(path) as f:
+            kinds = [json.loads(line)["kind"] for line in f]
+        self.assertEqual(kinds, ["operation", "checkpoint"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partC.scenario import IdPool, Workload
+
+
+class TestIdPool(unittest.TestCase):
+    def assertConsistent(self, pool):
+        self.assertEqual(pool._index, {entity_id: index for index, entity_id in enumerate(pool.ids)})
+
+    def test_add_and_remove(self):
+        pool = IdPool()
+        for entity_id in ("1", "2", "3", "4"):
+            pool.add(entity_id)
+        pool.remove("2")
+        self.assertEqual(pool.ids, ["1", "4", "3"])
+        self.assertConsistent(pool)
+        pool.remove("3")
+        self.assertEqual(pool.ids, ["1", "4"])
+        self.assertConsistent(pool)
+        pool.remove("1")
+        pool.remove("4")
+        self.assertEqual(len(pool), 0)
+        self.assertConsistent(pool)
+        with self.assertRaises(KeyError):
+            pool.remove("4")
+
+    def test_random_adds_and_removes(self):
+        rng = random.Random(11)
+        pool, live = IdPool(), set()
+        for entity_id in range(1000):
+            if live and rng.random() < 0.4:
+                removed = rng.choice(sorted(live))
+                pool.remove(removed)
+                live.remove(removed)
+            else:
+                pool.add(entity_id)
+                live.add(entity_id)
+        self.assertEqual(set(pool.ids), live)
+        self.assertEqual(len(pool), len(live))
+        self.assertConsistent(pool)
+
+    def test_pick(self):
+        pool = IdPool()
+        self.assertIsNone(pool.pick(random.Random(0)))
+        pool.add("7")
+        self.assertEqual(pool.pick(random.Random(0)), "7")
+
+    def test_sort_is_numeric(self):
+        pool = IdPool()
+        for entity_id in ("10", "9", "100", "2", "11"):
+            pool.add(entity_id)
+        pool.sort()
+        self.assertEqual(pool.ids, ["2", "9", "10", "11", "100"])
+        self.assertConsistent(pool)
+        pool.remove("9")
+        self.assertEqual(pool.ids, ["2", "100", "10", "11"])
+
+
+class TestWorkloadStreams(unittest.TestCase):
+    def picks(self, seed, stream):
+        workload = Workload({"random_seed": seed})
+        for entity_id in range(100):
+            workload.pools["todo"].add(str(entity_id))
+        workload._use_stream(stream)
+        return [workload._pick("todo") for _ in range(10)]
+
+    def test_stream_is_reproducible(self):
+        self.assertEqual(self.picks(1, "operation-3"), self.picks(1, "operation-3"))
+        self.assertNotEqual(self.picks(1, "operation-3"), self.picks(1, "operation-4"))
+        self.assertNotEqual(self.picks(1, "operation-3"), self.picks(2, "operation-3"))
+
+    def test_stream_independent_of_other_threads(self):
+        """Choices on one thread do not move another thread's generator."""
+        expected = self.picks(1, "operation-0")
+        workload = Workload({"random_seed": 1})
+        for entity_id in range(100):
+            workload.pools["todo"].add(str(entity_id))
+        workload._use_stream("operation-0")
+
+        def other():
+            workload._use_stream("operation-1")
+            for _ in range(50):
+                workload._pick("todo")
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        self.assertEqual([workload._pick("todo") for _ in range(10)], expected)
+
+    def test_unseeded_uses_shared_generator(self):
+        workload = Workload({})
+        workload._use_stream("operation-0")
+        self.assertIs(workload._random(), workload._rng)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import unittest
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from partC.traffic import _IdMap, _rewrite, created_collection
+
+
+def request(method, path, created=None, body=None):
+    return {"method": method, "path": path, "created": created, "body": body}
+
+
+class TestRewrite(unittest.TestCase):
+    """Captured ids 5 (todo), 3 (project) and 9 (category) were replayed as 105, 103 and 109."""
+
+    def setUp(self):
+        self.captured = [
+            request("POST", "/todos", created="5"),
+            request("POST", "/projects", created="3"),
+            request("POST", "/categories", created="9"),
+        ]
+        self.bodies = {}
+
+    def rewrite(self, record):
+        index = len(self.captured)
+        self.captured.append(record)
+        ids = _IdMap(self.captured)
+        for creator, replayed in enumerate(("105", "103", "109")):
+            ids.futures[creator] = Future()
+            ids.futures[creator].set_result(replayed)
+        return _rewrite(index, record, self.bodies, ids)
+
+    def json_body(self, body):
+        self.bodies["h"] = {"content_type": "application/json", "data": json.dumps(body)}
+        return "h"
+
+    def test_entity_path(self):
+        self.assertEqual(self.rewrite(request("GET", "/todos/5"))[0], "/todos/105")
+        self.assertEqual(self.rewrite(request("DELETE", "/projects/3"))[0], "/projects/103")
+
+    def test_relationship_path(self):
+        path, _, _ = self.rewrite(request("DELETE", "/todos/5/tasksof/3"))
+        self.assertEqual(path, "/todos/105/tasksof/103")
+        path, _, _ = self.rewrite(request("DELETE", "/projects/3/categories/9"))
+        self.assertEqual(path, "/projects/103/categories/109")
+
+    def test_query_string_kept(self):
+        self.assertEqual(self.rewrite(request("GET", "/todos/5/tasksof?doneStatus=false"))[0], "/todos/105/tasksof?doneStatus=false")
+
+    def test_uncaptured_and_collection_paths_unchanged(self):
+        self.assertEqual(self.rewrite(request("GET", "/todos/77"))[0], "/todos/77")
+        self.assertEqual(self.rewrite(request("GET", "/todos?title=5"))[0], "/todos?title=5")
+        self.assertEqual(self.rewrite(request("GET", "/shutdown"))[0], "/shutdown")
+
+    def test_id_created_later_unchanged(self):
+        """Only creates sent before a request count; a later create of the same id is a different entity."""
+        record = request("GET", "/todos/6")
+        self.captured.append(request("POST", "/todos", created="6"))
+        ids = _IdMap(self.captured + [record])
+        self.assertEqual(_rewrite(len(self.captured) - 1, record, {}, ids)[0], "/todos/6")
+
+    def test_link_body(self):
+        path, data, headers = self.rewrite(request("POST", "/todos/5/tasksof", body=self.json_body({"id": "3"})))
+        self.assertEqual(path, "/todos/105/tasksof")
+        self.assertEqual(json.loads(data), {"id": "103"})
+        self.assertEqual(headers, {"Content-Type": "application/json"})
+
+    def test_entity_body(self):
+        body = self.json_body({"id": "5", "title": "t"})
+        self.assertEqual(json.loads(self.rewrite(request("PUT", "/todos/5", body=body))[1]), {"id": "105", "title": "t"})
+
+    def test_other_bodies_sent_as_captured(self):
+        data = '{"title": "id 5"}'
+        self.bodies["h"] = {"content_type": "application/json", "data": data}
+        self.assertEqual(self.rewrite(request("POST", "/todos", body="h"))[1], data.encode())
+
+        xml = "<todo><id>5</id></todo>"
+        self.bodies["x"] = {"content_type": "application/xml", "data": xml}
+        path, sent, headers = self.rewrite(request("PUT", "/todos/5", body="x"))
+        self.assertEqual((path, sent, headers), ("/todos/105", xml.encode(), {"Content-Type": "application/xml"}))
+
+    def test_without_body(self):
+        self.assertEqual(self.rewrite(request("GET", "/todos/5")), ("/todos/105", None, {}))
+
+
+class TestCreatedCollection(unittest.TestCase):
+    def test_created_collection(self):
+        self.assertEqual(created_collection("POST", "/todos"), "todos")
+        self.assertEqual(created_collection("POST", "/categories?x=1"), "categories")
+        self.assertIsNone(created_collection("POST", "/todos/5"))
+        self.assertIsNone(created_collection("GET", "/todos"))
+        self.assertIsNone(created_collection("POST", "/todos/5/tasksof"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,375 @@
+"""Capture the HTTP traffic of a run and replay it against other servers.
+
+A capture is a JSON Lines file written by TrafficRecorder, a listener on
+``util.session``. Its records have a ``kind``: ``capture`` (once, when
+recording started), ``body`` (each distinct request body once, keyed by a
+hash) and ``request`` (method, path, endpoint template, body hash and size,
+send offset, status and latency, and the id a create returned).
+
+Replaying re-issues the requests at their original offsets, ``speed`` times
+faster, or as fast as possible, from ``concurrency`` threads. Ids the server
+hands out differ from the captured ones, so ids in paths and ``{"id": ...}``
+bodies are mapped to the ones the replayed creates returned, and a request
+waits for the create of every id it uses.
+
+Usage:
+
+    python partC/traffic.py replay CAPTURE --server URL|JAR|stub [--speed 1|N|max] [--concurrency 8]
+    python partC/traffic.py compare CAPTURE --server A --server B [...]
+
+``compare`` replays the capture against each server in turn, each started
+fresh unless it is a URL, and prints the per-endpoint latency deltas.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from partA.server import TodoServer
+from partA.stub_server import StubServer
+from partC.histogram import LatencyHistogram
+from partC.results import read_records
+
+# Collection an id in a relationship path or link body refers to
+RELATIONSHIP_TARGETS = {
+    "tasksof": "projects",
+    "tasks": "todos",
+    "categories": "categories",
+    "todos": "todos",
+    "projects": "projects",
+}
+COLLECTIONS = ("todos", "projects", "categories")
+
+
+def _path_parts(path):
+    return [part for part in path.split("?", 1)[0].split("/") if part]
+
+
+def created_collection(method, path):
+    """Return the collection a ``POST /<collection>`` creates in, else None."""
+    parts = _path_parts(path)
+    if method == "POST" and len(parts) == 1 and parts[0] in COLLECTIONS:
+        return parts[0]
+    return None
+
+
+class TrafficRecorder:
+    """Request listener writing every call made through ``util.session`` to ``path``.
+
+    Register it with ``util.add_request_listener(recorder, bodies=True)``. Bodies are
+    stored once per distinct content, so the fixed payload variants of a run
+    cost one line each however often they are sent.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.time()
+        self.requests = 0
+        self._bodies = set()
+        self._lock = threading.Lock()
+        self._file = open(path, "w")
+        self._write({"kind": "capture", "started": self.started})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def __call__(self, record):
+        body = record.get("body")
+        if isinstance(body, str):
+            body = body.encode()
+        body_hash = hashlib.blake2b(body, digest_size=8).hexdigest() if body else None
+        created = None
+        if created_collection(record["method"], record["path"]) and record["status"] == 201:
+            try:
+                created = str(json.loads(record["response_body"])["id"])
+            except (ValueError, KeyError, TypeError):
+                pass
+
+        with self._lock:
+            if body_hash is not None and body_hash not in self._bodies:
+                self._bodies.add(body_hash)
+                self._write({
+                    "kind": "body",
+                    "hash": body_hash,
+                    "content_type": record["headers"].get("Content-Type"),
+                    "data": body.decode("utf-8", errors="replace"),
+                })
+            self._write({
+                "kind": "request",
+                "offset": record["start"] - self.started,
+                "method": record["method"],
+                "path": record["path"],
+                "endpoint": record["endpoint"],
+                "body": body_hash,
+                "size": len(body or b""),
+                "status": record["status"],
+                "latency": record["latency"],
+                "created": created,
+            })
+            self.requests += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def load_capture(path):
+    """Return ``(requests, bodies)``: request records ordered by send offset and ``{hash: body record}``."""
+    requests_, bodies = [], {}
+    for record in read_records(path):
+        if record.get("kind") == "request":
+            requests_.append(record)
+        elif record.get("kind") == "body":
+            bodies[record["hash"]] = record
+    requests_.sort(key=lambda record: record["offset"])
+    return requests_, bodies
+
+
+class _IdMap:
+    """Captured ids -> ids handed out during the replay; ids never created in the capture map to themselves."""
+
+    def __init__(self, captured):
+        self._creates = {}
+        for index, record in enumerate(captured):
+            collection = created_collection(record["method"], record["path"])
+            if collection and record.get("created") is not None:
+                self._creates[(collection, record["created"])] = index
+        self.futures = {}
+
+    def creator(self, collection, entity_id):
+        return self._creates.get((collection, str(entity_id)))
+
+    def resolve(self, collection, entity_id, index):
+        """Map an id used by request ``index``; only creates sent before it count."""
+        creator = self.creator(collection, entity_id)
+        if creator is None or creator >= index:
+            return str(entity_id)
+        return self.futures[creator].result()
+
+
+def _json_body(record, bodies):
+    body = bodies.get(record["body"]) if record["body"] else None
+    if body is None or "xml" in (body.get("content_type") or ""):
+        return None
+    try:
+        return json.loads(body["data"])
+    except ValueError:
+        return None
+
+
+def _rewrite(index, record, bodies, ids):
+    """Return ``(path, data, headers)`` of the request with its ids mapped to the replayed ones."""
+    parts = record["path"].split("?", 1)
+    segments = parts[0].split("/")
+    names = [segment for segment in segments if segment]
+    if len(names) >= 2 and names[0] in COLLECTIONS:
+        segments[2] = ids.resolve(names[0], names[1], index)
+    if len(names) == 4 and names[2] in RELATIONSHIP_TARGETS:
+        segments[4] = ids.resolve(RELATIONSHIP_TARGETS[names[2]], names[3], index)
+    path = "/".join(segments) + (f"?{parts[1]}" if len(parts) > 1 else "")
+
+    body = bodies.get(record["body"]) if record["body"] else None
+    if body is None:
+        return path, None, {}
+    headers = {"Content-Type": body["content_type"]} if body.get("content_type") else {}
+    data = body["data"].encode()
+    json_body = _json_body(record, bodies)
+    if isinstance(json_body, dict) and "id" in json_body and len(names) in (2, 3):
+        collection = RELATIONSHIP_TARGETS.get(names[2]) if len(names) == 3 else names[0]
+        if collection:
+            json_body["id"] = ids.resolve(collection, json_body["id"], index)
+            data = json.dumps(json_body).encode()
+    return path, data, headers
+
+
+def replay(capture, base_url, speed=1.0, concurrency=8, timeout=30):
+    """Re-issue the requests of ``capture`` (a path or ``load_capture`` result) against ``base_url``.
+
+    ``speed`` scales the captured send offsets (2.0 replays twice as fast);
+    None replays as fast as ``concurrency`` allows. Returns one dict per
+    request with ``endpoint``, ``status``, the captured ``expected_status``,
+    ``latency`` and ``lag`` (how late it was sent, in seconds).
+    """
+    captured, bodies = load_capture(capture) if isinstance(capture, str) else capture
+    ids = _IdMap(captured)
+    results = [None] * len(captured)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def send(index, record, due):
+        # Waits for the replayed creates of the ids this request refers to
+        path, data, headers = _rewrite(index, record, bodies, ids)
+        sent = time.perf_counter()
+        try:
+            response = session.request(
+                record["method"], f"{base_url}{path}", data=data, headers=headers, timeout=timeout
+            )
+            response.content
+            status = response.status_code
+        except requests.exceptions.RequestException:
+            response, status = None, None
+        latency = time.perf_counter() - sent
+        results[index] = {
+            "endpoint": record["endpoint"],
+            "status": status,
+            "expected_status": record["status"],
+            "latency": latency,
+            "lag": max(0.0, sent - due) if due is not None else 0.0,
+        }
+        created = None
+        if record.get("created") is not None and response is not None and status == 201:
+            try:
+                created = str(response.json()["id"])
+            except (ValueError, KeyError):
+                pass
+        return record.get("created") if created is None else created
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, record in enumerate(captured):
+            due = None
+            if speed:
+                due = start + record["offset"] / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            ids.futures[index] = executor.submit(send, index, record, due)
+        for future in ids.futures.values():
+            future.result()
+    session.close()
+    return results
+
+
+def summarize(results):
+    """Return ``{endpoint: {"count", "mean", "p50", ..., "errors", "mismatches"}}`` of replay results."""
+    histograms, errors, mismatches = {}, {}, {}
+    for result in results:
+        endpoint = result["endpoint"]
+        histograms.setdefault(endpoint, LatencyHistogram()).record(result["latency"])
+        errors[endpoint] = errors.get(endpoint, 0) + (result["status"] is None or result["status"] >= 400)
+        mismatches[endpoint] = mismatches.get(endpoint, 0) + (result["status"] != result["expected_status"])
+    return {
+        endpoint: {**histogram.summary(), "errors": errors[endpoint], "mismatches": mismatches[endpoint]}
+        for endpoint, histogram in sorted(histograms.items())
+    }
+
+
+def compare(summaries, percentiles=("p50", "p90", "p99")):
+    """Latency deltas of each summary against the first, per endpoint present in both.
+
+    Returns ``{endpoint: [{"p50": (seconds, delta, ratio), ...} per summary]}``
+    where delta and ratio are relative to the first summary.
+    """
+    baseline = summaries[0]
+    deltas = {}
+    for endpoint, base in baseline.items():
+        rows = []
+        for summary in summaries:
+            stats = summary.get(endpoint)
+            if stats is None or not stats["count"]:
+                rows.append(None)
+                continue
+            rows.append({
+                q: (stats[q], stats[q] - base[q], stats[q] / base[q] if base[q] else float("nan"))
+                for q in percentiles
+            })
+        deltas[endpoint] = rows
+    return deltas
+
+
+def start_server(spec, port):
+    """Return ``(base_url, server)`` for a --server value: a URL, ``stub`` or a jar path."""
+    if spec.startswith("http://") or spec.startswith("https://"):
+        return spec.rstrip("/"), None
+    server = StubServer(port) if spec == "stub" else TodoServer(spec, port=port)
+    server.start()
+    return server.base_url, server
+
+
+def replay_on(spec, capture, speed, concurrency, port):
+    base_url, server = start_server(spec, port)
+    try:
+        start = time.perf_counter()
+        results = replay(capture, base_url, speed, concurrency)
+        duration = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.stop()
+    return results, duration
+
+
+def print_summary(name, summary, duration):
+    print(f"{name}: {sum(stats['count'] for stats in summary.values())} requests in {duration:.2f}s")
+    for endpoint, stats in summary.items():
+        line = ", ".join(f"{q}={stats[q] * 1000:.3f}ms" for q in ("p50", "p90", "p99", "max"))
+        print(f"  {endpoint}: {stats['count']} calls, {line}, {stats['errors']} errors, "
+              f"{stats['mismatches']} status mismatches")
+
+
+def print_comparison(names, deltas):
+    for endpoint, rows in deltas.items():
+        print(endpoint)
+        for name, row in zip(names[1:], rows[1:]):
+            if row is None:
+                print(f"  {name}: no calls")
+                continue
+            line = ", ".join(
+                f"{q} {value * 1000:.3f}ms ({delta * 1000:+.3f}ms, x{ratio:.2f})"
+                for q, (value, delta, ratio) in row.items()
+            )
+            print(f"  {name}: {line}")
+
+
+def parse_speed(value):
+    return None if value == "max" else float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured Todo Manager API traffic")
+    parser.add_argument("command", choices=["replay", "compare"])
+    parser.add_argument("capture", help="capture file written with script.py --capture")
+    parser.add_argument(
+        "--server",
+        action="append",
+        required=True,
+        help="base URL, jar path or 'stub'; give it twice or more for compare",
+    )
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="1 = original timing, N = N times faster, max")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=4567, help="port servers started from a jar or stub listen on")
+    args = parser.parse_args()
+    if args.command == "compare" and len(args.server) < 2:
+        parser.error("compare needs at least two --server values")
+
+    capture = load_capture(args.capture)
+    print(f"Loaded {len(capture[0])} requests and {len(capture[1])} distinct bodies from {args.capture}")
+    summaries = []
+    for spec in args.server if args.command == "compare" else args.server[:1]:
+        results, duration = replay_on(spec, capture, args.speed, args.concurrency, args.port)
+        summaries.append(summarize(results))
+        print_summary(spec, summaries[-1], duration)
+    if args.command == "compare":
+        print(f"\nLatency against {args.server[0]}:")
+        print_comparison(args.server, compare(summaries))
+
+
+if __name__ == "__main__":
+    main()